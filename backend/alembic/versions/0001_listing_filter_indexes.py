@@ -0,0 +1,45 @@
+"""Add composite indexes for listing filters and alert scans
+
+Revision ID: 0001_listing_filter_indexes
+Revises: 
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_listing_filter_indexes'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns) - keep in sync with __table_args__ on Car and Alert
+INDEXES = [
+    # get_cars: is_available is always filtered; default sort is created_at
+    ('ix_cars_available_created', 'cars', ['is_available', 'created_at']),
+    # get_cars: price range filter / price sort, and alert max_price checks
+    ('ix_cars_available_price', 'cars', ['is_available', 'price']),
+    # get_cars: year range filter / year sort
+    ('ix_cars_available_year', 'cars', ['is_available', 'year']),
+    # get_cars: mileage sort
+    ('ix_cars_available_mileage', 'cars', ['is_available', 'mileage']),
+    # get_cars: equality facets, served in default (created_at) order
+    ('ix_cars_available_fuel_created', 'cars', ['is_available', 'fuel_type', 'created_at']),
+    ('ix_cars_available_transmission_created', 'cars', ['is_available', 'transmission', 'created_at']),
+    ('ix_cars_available_condition_created', 'cars', ['is_available', 'condition', 'created_at']),
+    # alert agent: active alerts of one type
+    ('ix_alerts_type_active', 'alerts', ['alert_type', 'is_active']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,33 @@
+"""Add alert index for the set-based new-listing check
+
+Revision ID: 0002_alert_make_index
+Revises: 0001_listing_filter_indexes
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_alert_make_index'
+down_revision = '0001_listing_filter_indexes'
+branch_labels = None
+depends_on = None
+
+
+# (name, table, columns) - keep in sync with __table_args__ on Alert
+INDEXES = [
+    # alert agent: recent cars joined to the active alerts for their make
+    ('ix_alerts_type_active_make', 'alerts', ['alert_type', 'is_active', 'make']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
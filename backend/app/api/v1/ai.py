@@ -1,31 +1,61 @@
 """
 AI-powered features API endpoints
 """
+import json
 import logging
-from typing import List, Optional
+from contextlib import aclosing
+from typing import AsyncIterator, Dict, Iterable, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from app.db.database import get_db
 from app.models import Car, Review
 from app.models.user import User
-from app.core.embeddings import EmbeddingsService
-from app.core.vectordb import VectorDB
+from app.core.car_context import car_contexts
+from app.core.catalog import get_catalog_version
+from app.core.embeddings import AsyncEmbeddingsService
+from app.core.review_stats import apply_review_change, get_review_stats, review_stats_available
+from app.core.vectordb import VectorDB, car_metadata
 from app.api.v1.auth import get_current_user, get_current_active_user
+from app.api.v1.cars import CAR_RESPONSE_OPTIONS
+from app.schemas.car import CarResponse
 from pydantic import BaseModel, Field
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 # Initialize services
-embeddings_service = EmbeddingsService()
+# Routes that call OpenAI are async so slow LLM requests don't hold threadpool
+# workers; blocking DB/ChromaDB work is handed to the threadpool explicitly.
+embeddings_service = AsyncEmbeddingsService()
 vectordb = VectorDB()
 
 
+def _get_car_or_404(db: Session, car_id: int) -> Car:
+    """Load a car or raise 404"""
+    car = db.query(Car).filter(Car.id == car_id).first()
+    if not car:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Car not found"
+        )
+    return car
+
+
+def _load_cars(db: Session, car_ids: Iterable[int]) -> Dict[int, Car]:
+    """Load cars with specs and scores in one query, keyed by id"""
+    cars = db.query(Car).options(*CAR_RESPONSE_OPTIONS).filter(Car.id.in_(list(car_ids))).all()
+    return {car.id: car for car in cars}
+
+
 class SimilarCarResponse(BaseModel):
     """Response for similar car search"""
     car_id: int
     distance: Optional[float] = None
-    metadata: dict
+    metadata: dict  # Snapshot stored with the embedding; price/availability may be stale
+    car: Optional[CarResponse] = None  # Live listing data, only with expand=cars
 
 
 class SimilarCarsResponse(BaseModel):
@@ -35,7 +65,7 @@ class SimilarCarsResponse(BaseModel):
 
 
 @router.post("/cars/{car_id}/generate-embedding", status_code=status.HTTP_200_OK)
-def generate_car_embedding(
+async def generate_car_embedding(
     car_id: int,
     db: Session = Depends(get_db)
 ):
@@ -46,15 +76,10 @@ def generate_car_embedding(
     logger.info(f"[AI] Generating embedding for car {car_id}")
     
     # Get car from database
-    car = db.query(Car).filter(Car.id == car_id).first()
-    if not car:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Car not found"
-        )
+    car = await run_in_threadpool(_get_car_or_404, db, car_id)
     
     # Generate embedding
-    embedding = embeddings_service.generate_car_embedding(
+    embedding = await embeddings_service.generate_car_embedding(
         make=car.make,
         model=car.model,
         year=car.year,
@@ -69,22 +94,12 @@ def generate_car_embedding(
             detail="Failed to generate embedding. Check OpenAI API key."
         )
     
-    # Prepare metadata
-    metadata = {
-        "make": car.make,
-        "model": car.model,
-        "year": car.year,
-        "price": car.price,
-        "fuel_type": car.fuel_type,
-        "transmission": car.transmission,
-        "description": car.description or ""
-    }
-    
     # Store in vector DB
-    success = vectordb.add_car_embedding(
+    success = await run_in_threadpool(
+        vectordb.add_car_embedding,
         car_id=car.id,
         embedding=embedding,
-        metadata=metadata
+        metadata=car_metadata(car)
     )
     
     if not success:
@@ -101,31 +116,29 @@ def generate_car_embedding(
 
 
 @router.get("/cars/{car_id}/similar", response_model=SimilarCarsResponse)
-def get_similar_cars(
+async def get_similar_cars(
     car_id: int,
     n_results: int = Query(5, ge=1, le=20),
+    expand: Optional[str] = Query(None, description="cars: include each similar car's current listing data"),
     db: Session = Depends(get_db)
 ):
     """
     Find similar cars using vector similarity search
+    With expand=cars each result carries the car as served by the listings (live price
+    and availability), loaded with one query; cars deleted since they were embedded are dropped.
     """
     logger.info(f"[AI] Finding similar cars for car {car_id}")
     
     # Get car from database
-    car = db.query(Car).filter(Car.id == car_id).first()
-    if not car:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Car not found"
-        )
+    car = await run_in_threadpool(_get_car_or_404, db, car_id)
     
     # Get car embedding
-    embedding = vectordb.get_car_embedding(car_id)
+    embedding = await run_in_threadpool(vectordb.get_car_embedding, car_id)
     
     if not embedding:
         # Generate embedding if not exists
         logger.info(f"[AI] Embedding not found for car {car_id}, generating...")
-        embedding = embeddings_service.generate_car_embedding(
+        embedding = await embeddings_service.generate_car_embedding(
             make=car.make,
             model=car.model,
             year=car.year,
@@ -135,16 +148,7 @@ def get_similar_cars(
         )
         
         if embedding:
-            metadata = {
-                "make": car.make,
-                "model": car.model,
-                "year": car.year,
-                "price": car.price,
-                "fuel_type": car.fuel_type,
-                "transmission": car.transmission,
-                "description": car.description or ""
-            }
-            vectordb.add_car_embedding(car_id, embedding, metadata)
+            await run_in_threadpool(vectordb.add_car_embedding, car_id, embedding, car_metadata(car))
         else:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -152,7 +156,8 @@ def get_similar_cars(
             )
     
     # Search for similar cars (exclude the car itself)
-    similar_results = vectordb.search_similar_cars(
+    similar_results = await run_in_threadpool(
+        vectordb.search_similar_cars,
         query_embedding=embedding,
         n_results=n_results + 1  # Get one extra to exclude self
     )
@@ -164,6 +169,14 @@ def get_similar_cars(
         if result["car_id"] != car_id
     ][:n_results]
     
+    if expand == "cars":
+        cars = await run_in_threadpool(_load_cars, db, [similar.car_id for similar in similar_cars])
+        similar_cars = [
+            similar.model_copy(update={"car": CarResponse.model_validate(cars[similar.car_id])})
+            for similar in similar_cars
+            if similar.car_id in cars
+        ]
+    
     return SimilarCarsResponse(
         similar_cars=similar_cars,
         total=len(similar_cars)
@@ -171,7 +184,7 @@ def get_similar_cars(
 
 
 @router.post("/reviews/{car_id}/summarize", status_code=status.HTTP_200_OK)
-def summarize_car_reviews(
+async def summarize_car_reviews(
     car_id: int,
     db: Session = Depends(get_db)
 ):
@@ -180,16 +193,12 @@ def summarize_car_reviews(
     """
     logger.info(f"[AI] Summarizing reviews for car {car_id}")
     
-    # Check if car exists
-    car = db.query(Car).filter(Car.id == car_id).first()
-    if not car:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Car not found"
-        )
+    def load_reviews():
+        # Check if car exists, then get all reviews for the car
+        _get_car_or_404(db, car_id)
+        return db.query(Review).filter(Review.car_id == car_id).all()
     
-    # Get all reviews for the car
-    reviews = db.query(Review).filter(Review.car_id == car_id).all()
+    reviews = await run_in_threadpool(load_reviews)
     
     if not reviews:
         raise HTTPException(
@@ -204,7 +213,7 @@ def summarize_car_reviews(
     ]
     
     # Generate summary
-    summary = embeddings_service.summarize_reviews(review_texts)
+    summary = await embeddings_service.summarize_reviews(review_texts)
     
     if not summary:
         raise HTTPException(
@@ -215,9 +224,15 @@ def summarize_car_reviews(
     # Store summary in the most recent review's ai_summary field
     if reviews:
         latest_review = reviews[-1]
+        latest_review_id = latest_review.id  # read before commit expires it
         latest_review.ai_summary = summary
-        db.commit()
-        logger.info(f"[AI] Stored AI summary for car {car_id} in review {latest_review.id}")
+        
+        def save_summary():
+            apply_review_change(db, car_id)
+            db.commit()
+        
+        await run_in_threadpool(save_summary)
+        logger.info(f"[AI] Stored AI summary for car {car_id} in review {latest_review_id}")
     
     return {
         "car_id": car_id,
@@ -232,9 +247,11 @@ def get_embedding_stats():
     Get statistics about stored embeddings
     """
     count = vectordb.get_collection_count()
+    cache = embeddings_service.cache
     return {
         "total_embeddings": count,
-        "status": "active" if embeddings_service.client else "inactive (no API key)"
+        "status": "active" if embeddings_service.client else "inactive (no API key)",
+        "cache": cache.stats() if cache else None
     }
 
 
@@ -250,13 +267,62 @@ class ChatResponse(BaseModel):
     car_id: int
 
 
+def build_chat_messages(system_prompt: str, chat_data: ChatMessage) -> List[dict]:
+    """System prompt, then recent conversation history, then the user's message"""
+    conversation_messages = [{"role": "system", "content": system_prompt}]
+    
+    # Add conversation history if provided
+    if chat_data.conversation_history:
+        for msg in chat_data.conversation_history[-5:]:  # Last 5 messages for context
+            if msg.get("role") and msg.get("content"):
+                conversation_messages.append({
+                    "role": msg["role"],
+                    "content": msg["content"]
+                })
+    
+    # Add current user message
+    conversation_messages.append({
+        "role": "user",
+        "content": chat_data.message
+    })
+    
+    return conversation_messages
+
+
+def chat_event_stream(conversation_messages: List[dict], car_id: int) -> StreamingResponse:
+    """
+    Stream a chat reply as Server-Sent Events
+    Each token arrives as `data: {"delta": "..."}`; the stream ends with an
+    `event: done` (data: {"car_id": ...}) or `event: error` (data: {"detail": ...}).
+    """
+    async def events() -> AsyncIterator[str]:
+        try:
+            # Closed explicitly so an aborted stream gives back its OpenAI concurrency slot now, not at GC
+            async with aclosing(embeddings_service.chat_stream(conversation_messages)) as stream:
+                async for delta in stream:
+                    yield f"data: {json.dumps({'delta': delta})}\n\n"
+            logger.info(f"[AI Chat] Streamed response for car {car_id}")
+            yield f"event: done\ndata: {json.dumps({'car_id': car_id})}\n\n"
+        except Exception as e:
+            logger.error(f"[AI Chat] Error streaming response: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': f'Failed to generate chat response: {str(e)}'})}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/chat/general", response_model=ChatResponse, status_code=status.HTTP_200_OK)
-def chat_general(
+async def chat_general(
     chat_data: ChatMessage,
+    stream: bool = Query(False, description="Stream the reply as Server-Sent Events"),
     db: Session = Depends(get_db)
 ):
     """
     General AI Chatbot for car-related questions (not specific to a car)
+    With stream=true, tokens are forwarded as they are generated (see chat_event_stream).
     """
     logger.info(f"[AI Chat] General question: {chat_data.message[:50]}...")
     
@@ -268,11 +334,7 @@ def chat_general(
         )
     
     try:
-        # Build conversation history
-        conversation_messages = [
-            {
-                "role": "system",
-                "content": """You are a helpful AI car advisor assistant. You help users with general car-related questions, buying advice, car comparisons, and automotive knowledge.
+        system_prompt = """You are a helpful AI car advisor assistant. You help users with general car-related questions, buying advice, car comparisons, and automotive knowledge.
 
 Instructions:
 - Answer questions about cars, buying advice, features, specifications, etc.
@@ -280,33 +342,14 @@ Instructions:
 - If asked about specific cars, suggest they visit a car's detail page for detailed information
 - Provide general automotive knowledge and advice
 - Keep responses under 200 words unless more detail is specifically requested"""
-            }
-        ]
         
-        # Add conversation history if provided
-        if chat_data.conversation_history:
-            for msg in chat_data.conversation_history[-5:]:  # Last 5 messages for context
-                if msg.get("role") and msg.get("content"):
-                    conversation_messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
+        conversation_messages = build_chat_messages(system_prompt, chat_data)
         
-        # Add current user message
-        conversation_messages.append({
-            "role": "user",
-            "content": chat_data.message
-        })
+        if stream:
+            return chat_event_stream(conversation_messages, car_id=0)
         
         # Generate response using OpenAI
-        response = embeddings_service.client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=conversation_messages,
-            max_tokens=300,
-            temperature=0.7
-        )
-        
-        ai_response = response.choices[0].message.content.strip()
+        ai_response = await embeddings_service.chat(conversation_messages)
         logger.info(f"[AI Chat] Generated general response")
         
         return ChatResponse(
@@ -325,7 +368,19 @@ Instructions:
 def build_car_context(car, db: Session) -> str:
     """
     Build comprehensive context about a car for RAG
+    Served from car_contexts while the catalog version and the car's review stats
+    version are unchanged; review count/average come from the maintained aggregates.
     """
+    catalog_version = get_catalog_version(db)
+    stats = get_review_stats(db, car.id)
+    cacheable = catalog_version is not None and review_stats_available(db)
+    version = (catalog_version, stats.version if stats else 0)
+    
+    if cacheable:
+        cached = car_contexts.get(car.id, version)
+        if cached is not None:
+            return cached
+    
     context_parts = []
     
     # Basic car info
@@ -373,44 +428,56 @@ def build_car_context(car, db: Session) -> str:
             context_parts.append(f"- Crash Test Rating: {scores.crash_test_rating}")
     
     # Reviews summary
-    reviews = db.query(Review).filter(Review.car_id == car.id).all()
-    if reviews:
-        avg_rating = sum(r.rating for r in reviews) / len(reviews)
-        context_parts.append(f"\nReviews: {len(reviews)} reviews, Average Rating: {avg_rating:.1f}/5")
+    if stats is not None:
+        review_count, avg_rating = stats.review_count, stats.average_rating
+    elif not review_stats_available(db):
+        review_count, avg_rating = db.query(
+            func.count(Review.id), func.avg(Review.rating)
+        ).filter(Review.car_id == car.id).one()
+    else:
+        review_count, avg_rating = 0, None
+    
+    if review_count:
+        context_parts.append(f"\nReviews: {review_count} reviews, Average Rating: {avg_rating:.1f}/5")
         
         # Include AI summary if available
-        summary_review = next((r for r in reviews if r.ai_summary), None)
-        if summary_review and summary_review.ai_summary:
-            context_parts.append(f"Review Summary: {summary_review.ai_summary}")
-        elif len(reviews) >= 2:
+        summary = db.query(Review.ai_summary).filter(
+            Review.car_id == car.id,
+            Review.ai_summary.isnot(None)
+        ).order_by(Review.id).limit(1).scalar()
+        if summary:
+            context_parts.append(f"Review Summary: {summary}")
+        elif review_count >= 2:
             # Include a few recent reviews
-            recent_reviews = reviews[-3:]  # Last 3 reviews
+            recent_reviews = db.query(Review).filter(
+                Review.car_id == car.id
+            ).order_by(Review.id.desc()).limit(3).all()[::-1]  # Last 3 reviews
             context_parts.append("Recent Reviews:")
             for r in recent_reviews:
                 context_parts.append(f"- {r.rating}/5: {r.title or ''} {r.content[:100]}...")
     
-    return "\n".join(context_parts)
+    context = "\n".join(context_parts)
+    if cacheable:
+        car_contexts.set(car.id, version, context)
+    return context
 
 
 @router.post("/chat/{car_id}", response_model=ChatResponse, status_code=status.HTTP_200_OK)
-def chat_about_car(
+async def chat_about_car(
     car_id: int,
     chat_data: ChatMessage,
+    stream: bool = Query(False, description="Stream the reply as Server-Sent Events"),
     db: Session = Depends(get_db)
 ):
     """
     AI Chatbot for car questions using RAG (Retrieval Augmented Generation)
     Provides context-aware responses about a specific car
+    With stream=true, tokens are forwarded as they are generated (see chat_event_stream).
     """
     logger.info(f"[AI Chat] User asking about car {car_id}: {chat_data.message[:50]}...")
     
     # Check if car exists
-    car = db.query(Car).filter(Car.id == car_id).first()
-    if not car:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Car not found"
-        )
+    car = await run_in_threadpool(_get_car_or_404, db, car_id)
     
     # Check if OpenAI client is available
     if not embeddings_service.client:
@@ -421,13 +488,9 @@ def chat_about_car(
     
     try:
         # Build car context for RAG
-        car_context = build_car_context(car, db)
+        car_context = await run_in_threadpool(build_car_context, car, db)
         
-        # Build conversation history
-        conversation_messages = [
-            {
-                "role": "system",
-                "content": f"""You are a helpful AI car advisor assistant. You help users learn about cars by answering their questions.
+        system_prompt = f"""You are a helpful AI car advisor assistant. You help users learn about cars by answering their questions.
 
 You have access to the following information about a car:
 {car_context}
@@ -440,33 +503,14 @@ Instructions:
 - If asked about comparisons, use the provided specifications
 - If asked about reviews, reference the review summary and ratings provided
 - Keep responses under 200 words unless more detail is specifically requested"""
-            }
-        ]
         
-        # Add conversation history if provided
-        if chat_data.conversation_history:
-            for msg in chat_data.conversation_history[-5:]:  # Last 5 messages for context
-                if msg.get("role") and msg.get("content"):
-                    conversation_messages.append({
-                        "role": msg["role"],
-                        "content": msg["content"]
-                    })
+        conversation_messages = build_chat_messages(system_prompt, chat_data)
         
-        # Add current user message
-        conversation_messages.append({
-            "role": "user",
-            "content": chat_data.message
-        })
+        if stream:
+            return chat_event_stream(conversation_messages, car_id=car_id)
         
         # Generate response using OpenAI
-        response = embeddings_service.client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=conversation_messages,
-            max_tokens=300,
-            temperature=0.7
-        )
-        
-        ai_response = response.choices[0].message.content.strip()
+        ai_response = await embeddings_service.chat(conversation_messages)
         logger.info(f"[AI Chat] Generated response for car {car_id}")
         
         return ChatResponse(
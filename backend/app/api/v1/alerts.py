@@ -1,14 +1,22 @@
 """
 Alerts API endpoints and background agent
+
+The router is not mounted in app.main (the alert feature is disabled in the app), so
+its endpoints, GET /notifications included, are dormant. The agent and notification
+storage below are live: the scheduler and the car write paths call them.
 """
 import logging
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks
+from sqlalchemy import String, and_, func, or_, type_coerce
+from sqlalchemy.orm import Session, aliased
 from app.db.database import get_db
-from app.models import Alert, Car, User
+from app.models import Alert, Car, Notification, PriceHistory, User
 from app.api.v1.auth import get_current_active_user
+from app.core.alert_index import AlertCriteria, alert_indexes
+from app.core.alert_state import bump_alerts_version, get_alert_state
+from app.core.notifications import delete_notifications, notifications_available, store_notifications
 from pydantic import BaseModel, Field
 
 router = APIRouter()
@@ -46,6 +54,30 @@ class AlertResponse(BaseModel):
         from_attributes = True
 
 
+class NotificationResponse(BaseModel):
+    """Schema for a stored alert notification"""
+    id: int
+    alert_id: int
+    car_id: int
+    alert_type: str
+    message: str
+    price: float
+    old_price: Optional[float]
+    is_read: bool
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+
+class NotificationListResponse(BaseModel):
+    """Schema for a page of notifications"""
+    notifications: List[NotificationResponse]
+    count: int
+    total: int
+    unread_count: int
+
+
 @router.post("/", response_model=AlertResponse, status_code=status.HTTP_201_CREATED)
 def create_alert(
     alert_data: AlertCreate,
@@ -69,8 +101,10 @@ def create_alert(
     )
     
     db.add(alert)
+    alerts_version = bump_alerts_version(db)
     db.commit()
     db.refresh(alert)
+    alert_indexes.update(alerts_version, add=AlertCriteria.from_alert(alert))
     
     # For price_drop alerts with car_id, record current price in PriceHistory
     if alert.alert_type == "price_drop" and alert.car_id:
@@ -108,118 +142,80 @@ def get_alerts(
     return alerts
 
 
-@router.get("/notifications", status_code=status.HTTP_200_OK)
-def get_price_drop_notifications(
+@router.get("/notifications", response_model=NotificationListResponse)
+def get_notifications(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    unread_only: bool = Query(False, description="Only return unread notifications"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    """Get price drop notifications for current user's alerts"""
-    from app.models import PriceHistory
-    from sqlalchemy import desc
+    """
+    Get the notifications the alert agent stored for current user's alerts, newest first
+    One indexed page read plus one count, however many alerts and cars there are.
+    """
+    if not notifications_available(db):
+        return NotificationListResponse(notifications=[], count=0, total=0, unread_count=0)
     
-    # Get all active price_drop alerts for this user
-    alerts = db.query(Alert).filter(
-        Alert.user_id == current_user.id,
-        Alert.alert_type == "price_drop",
-        Alert.is_active == True
-    ).all()
+    query = db.query(Notification).filter(Notification.user_id == current_user.id)
+    if unread_only:
+        query = query.filter(Notification.is_read == False)
+    notifications = query.order_by(Notification.id.desc()).offset(skip).limit(limit).all()
     
-    notifications = []
+    total, unread = db.query(
+        func.count(Notification.id),
+        func.count(Notification.id).filter(Notification.is_read == False)
+    ).filter(Notification.user_id == current_user.id).one()
     
-    for alert in alerts:
-        if alert.car_id:
-            # Alert for specific car
-            car = db.query(Car).filter(Car.id == alert.car_id).first()
-            if not car:
-                logger.debug(f"[Notifications] Car {alert.car_id} not found for alert {alert.id}")
-                continue
-            
-            # Get price when alert was created (before alert creation)
-            price_at_alert = db.query(PriceHistory).filter(
-                PriceHistory.car_id == car.id,
-                PriceHistory.recorded_at < alert.created_at
-            ).order_by(desc(PriceHistory.recorded_at)).first()
-            
-            # If no price history before alert, we can't determine if price dropped
-            # This means alert was created but price wasn't recorded yet
-            if not price_at_alert:
-                logger.debug(f"[Notifications] No price history before alert {alert.id} creation for car {car.id}")
-                # Try to get the most recent price history (might be after alert creation)
-                recent_price = db.query(PriceHistory).filter(
-                    PriceHistory.car_id == car.id
-                ).order_by(desc(PriceHistory.recorded_at)).first()
-                
-                if recent_price:
-                    # Use the most recent price as baseline (price when alert was likely created)
-                    baseline_price = recent_price.price
-                else:
-                    # No price history at all - skip this alert
-                    logger.debug(f"[Notifications] No price history for car {car.id}, skipping alert {alert.id}")
-                    continue
-            else:
-                baseline_price = price_at_alert.price
-            
-            current_price = car.price
-            
-            logger.debug(f"[Notifications] Alert {alert.id} - Car {car.id}: Baseline=${baseline_price:,.0f}, Current=${current_price:,.0f}")
-            
-            # Check if price dropped (current price must be less than baseline)
-            if current_price < baseline_price:
-                drop_amount = baseline_price - current_price
-                drop_percent = (drop_amount / baseline_price * 100) if baseline_price > 0 else 0
-                
-                logger.info(f"[Notifications] Price drop found for alert {alert.id}: ${baseline_price:,.0f} -> ${current_price:,.0f}")
-                
-                notifications.append({
-                    "alert_id": alert.id,
-                    "car_id": car.id,
-                    "car_name": f"{car.year} {car.make} {car.model}",
-                    "old_price": baseline_price,
-                    "new_price": current_price,
-                    "drop_amount": drop_amount,
-                    "drop_percent": drop_percent,
-                    "message": f"Price dropped: {car.year} {car.make} {car.model} - ${baseline_price:,.0f} → ${current_price:,.0f} (${drop_amount:,.0f} / {drop_percent:.1f}% off)"
-                })
-        else:
-            # General alert (no car_id) - check all cars matching criteria
-            query = db.query(Car).filter(Car.is_available == True)
-            
-            if alert.make:
-                query = query.filter(Car.make == alert.make)
-            if alert.model:
-                query = query.filter(Car.model == alert.model)
-            if alert.max_price:
-                query = query.filter(Car.price <= alert.max_price)
-            
-            matching_cars = query.all()
-            
-            for car in matching_cars:
-                # Get price when alert was created
-                price_at_alert = db.query(PriceHistory).filter(
-                    PriceHistory.car_id == car.id,
-                    PriceHistory.recorded_at < alert.created_at
-                ).order_by(desc(PriceHistory.recorded_at)).first()
-                
-                if price_at_alert:
-                    baseline_price = price_at_alert.price
-                    current_price = car.price
-                    
-                    if current_price < baseline_price:
-                        drop_amount = baseline_price - current_price
-                        drop_percent = (drop_amount / baseline_price * 100) if baseline_price > 0 else 0
-                        
-                        notifications.append({
-                            "alert_id": alert.id,
-                            "car_id": car.id,
-                            "car_name": f"{car.year} {car.make} {car.model}",
-                            "old_price": baseline_price,
-                            "new_price": current_price,
-                            "drop_amount": drop_amount,
-                            "drop_percent": drop_percent,
-                            "message": f"Price dropped: {car.year} {car.make} {car.model} - ${baseline_price:,.0f} → ${current_price:,.0f} (${drop_amount:,.0f} / {drop_percent:.1f}% off)"
-                        })
-    
-    return {"notifications": notifications, "count": len(notifications)}
+    return NotificationListResponse(
+        notifications=notifications,
+        count=len(notifications),
+        total=unread if unread_only else total,
+        unread_count=unread
+    )
+
+
+@router.patch("/notifications/read", status_code=status.HTTP_200_OK)
+def mark_all_notifications_read(
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Mark all of current user's notifications as read"""
+    if not notifications_available(db):
+        return {"updated": 0}
+    
+    updated = db.query(Notification).filter(
+        Notification.user_id == current_user.id,
+        Notification.is_read == False
+    ).update({Notification.is_read: True}, synchronize_session=False)
+    db.commit()
+    return {"updated": updated}
+
+
+@router.patch("/notifications/{notification_id}/read", response_model=NotificationResponse)
+def mark_notification_read(
+    notification_id: int,
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """Mark one notification as read"""
+    notification = None
+    if notifications_available(db):
+        notification = db.query(Notification).filter(
+            Notification.id == notification_id,
+            Notification.user_id == current_user.id
+        ).first()
+    
+    if not notification:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notification not found"
+        )
+    
+    notification.is_read = True
+    db.commit()
+    db.refresh(notification)
+    return notification
 
 
 @router.get("/{alert_id}", response_model=AlertResponse)
@@ -261,8 +257,11 @@ def delete_alert(
             detail="Alert not found"
         )
     
+    delete_notifications(db, alert_id=alert_id)
     db.delete(alert)
+    alerts_version = bump_alerts_version(db)
     db.commit()
+    alert_indexes.update(alerts_version, remove=alert_id)
     logger.info(f"[Alerts] Alert {alert_id} deleted by user {current_user.id}")
     return
 
@@ -286,96 +285,229 @@ def toggle_alert(
         )
     
     alert.is_active = not alert.is_active
+    alerts_version = bump_alerts_version(db)
     db.commit()
     db.refresh(alert)
+    if alert.is_active:
+        alert_indexes.update(alerts_version, add=AlertCriteria.from_alert(alert))
+    else:
+        alert_indexes.update(alerts_version, remove=alert.id)
     
     logger.info(f"[Alerts] Alert {alert_id} toggled to {alert.is_active}")
     return alert
 
 
-def check_favorited_cars_price_drops(db: Session):
-    """Check price drops for favorited cars with alerts"""
-    from app.models import PriceHistory
-    from sqlalchemy import desc
+def _alert_created_at(db: Session):
+    """
+    Alert.created_at as the alert checks compare it
+    On SQLite, timestamps written by the server default have no fractional seconds
+    while bound datetimes always carry six digits; comparing against the padded text
+    keeps the set-based checks identical to filtering with alert.created_at as a parameter.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return func.substr(type_coerce(Alert.created_at, String).concat(".000000"), 1, 26)
+    return Alert.created_at
+
+
+def _is_set(column, empty):
+    """SQL for Python truthiness of an alert criterion (NULL and empty/zero mean "any")"""
+    return and_(column.isnot(None), column != empty)
+
+
+# Alert criterion -> (unset value, condition a car must meet when it's set)
+_CRITERIA = {
+    "make": ("", lambda car: car.make == Alert.make),
+    "model": ("", lambda car: car.model == Alert.model),
+    "max_price": (0, lambda car: car.price <= Alert.max_price),
+    "min_year": (0, lambda car: car.year >= Alert.min_year),
+    "max_mileage": (0, lambda car: car.mileage <= Alert.max_mileage),
+    "fuel_type": ("", lambda car: car.fuel_type == Alert.fuel_type),
+}
+
+
+def _criteria_matches(db: Session, alert_filters, fields, created_after_alert: bool = False):
+    """
+    Find every (alert, available car) pair where the car meets all criteria the alert sets
+
+    Runs one joined query per branch: alerts with a make join cars on make, alerts with
+    only a model join on model, and the rest join on the remaining criteria, so each
+    branch can be served from an index.
+
+    Args:
+        alert_filters: Which alerts to evaluate
+        fields: Alert criteria to apply
+        created_after_alert: Only match cars created at/after the alert (new listings).
+            Cars older than the oldest alert are then ruled out up front.
+
+    Returns:
+        Rows of (alert_id, user_id, car_id, make, model, price), ordered by alert then car
+    """
+    car = Car
+    conditions = []
+    if created_after_alert:
+        # Join only cars newer than the oldest alert (all cars if any alert is undated)
+        has_undated = db.query(Alert.id).filter(*alert_filters, Alert.created_at.is_(None)).first()
+        since = None if has_undated else db.query(func.min(Alert.created_at)).filter(*alert_filters).scalar()
+        if since is not None:
+            recent = db.query(Car).filter(Car.is_available == True, Car.created_at >= since).cte("recent_cars").prefix_with("MATERIALIZED")
+            car = aliased(Car, recent)
+        conditions.append(or_(Alert.created_at.is_(None), car.created_at >= _alert_created_at(db)))
     
-    alerts = db.query(Alert).filter(
+    conditions += [
+        or_(~_is_set(getattr(Alert, field), _CRITERIA[field][0]), _CRITERIA[field][1](car))
+        for field in fields
+    ]
+    make_set = _is_set(Alert.make, "")
+    model_set = _is_set(Alert.model, "")
+    branches = [(make_set, car.make == Alert.make)]
+    # With only recent cars to join, "no make" is split into NULL and '' so each
+    # branch seeks the make index instead of rescanning the alerts per car
+    for make_unset in (Alert.make.is_(None), Alert.make == "") if car is not Car else (~make_set,):
+        branches += [
+            (and_(make_unset, model_set), car.model == Alert.model),
+            (and_(make_unset, ~model_set), car.is_available == True),
+        ]
+    
+    rows = []
+    for alert_branch, join_on in branches:
+        rows.extend(
+            db.query(Alert.id, Alert.user_id, car.id, car.make, car.model, car.price)
+            .join(car, join_on)
+            .filter(*alert_filters, alert_branch, car.is_available == True, *conditions)
+            .all()
+        )
+    rows.sort(key=lambda row: (row[0], row[2]))
+    return rows
+
+
+def _car_price_drops(db: Session, inclusive: bool, alert_ids: Optional[List[int]] = None):
+    """
+    Find car-specific price_drop alerts whose car now costs less than it did when the alert was created
+
+    The baseline is each alert's latest PriceHistory row recorded before (or, if
+    inclusive, at) the alert's creation, picked with a window function.
+
+    Args:
+        inclusive: Also count prices recorded at the moment the alert was created
+        alert_ids: Only check these alerts (default: every active one)
+
+    Returns:
+        Rows of (alert_id, user_id, car_id, make, model, price, baseline_price), ordered by alert
+    """
+    alert_filters = (
         Alert.alert_type == "price_drop",
+        Alert.is_active == True,
         Alert.car_id.isnot(None),
-        Alert.is_active == True
-    ).all()
+        Alert.car_id != 0
+    )
+    if alert_ids is not None:
+        alert_filters += (Alert.id.in_(alert_ids),)
+    created_at = _alert_created_at(db)
+    recorded_before = PriceHistory.recorded_at <= created_at if inclusive else PriceHistory.recorded_at < created_at
     
-    matches = []
-    for alert in alerts:
-        car = db.query(Car).filter(Car.id == alert.car_id).first()
-        if not car:
-            continue
-        
-        price_record = db.query(PriceHistory).filter(
-            PriceHistory.car_id == car.id,
-            PriceHistory.recorded_at <= alert.created_at
-        ).order_by(desc(PriceHistory.recorded_at)).first()
-        
-        if price_record and car.price < price_record.price:
-            drop = price_record.price - car.price
-            drop_percent = (drop / price_record.price * 100) if price_record.price > 0 else 0
-            if drop_percent >= 1.0:
-                matches.append({
-                    "alert_id": alert.id,
-                    "user_id": alert.user_id,
-                    "car_id": car.id,
-                    "message": f"Price drop: {car.make} {car.model} dropped ${drop:,.0f} ({drop_percent:.1f}%)"
-                })
+    baselines = db.query(
+        Alert.id.label("alert_id"),
+        PriceHistory.price.label("price"),
+        func.row_number().over(
+            partition_by=Alert.id,
+            order_by=(PriceHistory.recorded_at.desc(), PriceHistory.id.desc())
+        ).label("position")
+    ).join(
+        PriceHistory, and_(PriceHistory.car_id == Alert.car_id, recorded_before)
+    ).filter(*alert_filters).subquery()
     
+    return db.query(
+        Alert.id, Alert.user_id, Car.id, Car.make, Car.model, Car.price, baselines.c.price
+    ).join(
+        Car, Car.id == Alert.car_id
+    ).join(
+        baselines, and_(baselines.c.alert_id == Alert.id, baselines.c.position == 1)
+    ).filter(
+        *alert_filters, Car.price < baselines.c.price
+    ).order_by(Alert.id).all()
+
+
+def _favorite_drop_matches(rows):
+    """Matches for favorited-car price drops of at least 1%"""
+    matches = []
+    for alert_id, user_id, car_id, make, model, price, baseline in rows:
+        drop = baseline - price
+        drop_percent = (drop / baseline * 100) if baseline > 0 else 0
+        if drop_percent >= 1.0:
+            matches.append({
+                "alert_id": alert_id,
+                "user_id": user_id,
+                "car_id": car_id,
+                "alert_type": "price_drop",
+                "price": price,
+                "old_price": baseline,
+                "message": f"Price drop: {make} {model} dropped ${drop:,.0f} ({drop_percent:.1f}%)"
+            })
     return matches
 
 
+def _price_drop_matches(rows):
+    """Matches for car-specific price drops"""
+    return [
+        {
+            "alert_id": alert_id,
+            "user_id": user_id,
+            "car_id": car_id,
+            "alert_type": "price_drop",
+            "price": price,
+            "old_price": baseline,
+            "message": f"Price drop: {make} {model} dropped ${baseline - price:,.0f}"
+        }
+        for alert_id, user_id, car_id, make, model, price, baseline in rows
+    ]
+
+
+def _criteria_match(alert_id, user_id, car_id, make, model, price):
+    """Match for a price_drop alert without a car"""
+    return {
+        "alert_id": alert_id,
+        "user_id": user_id,
+        "car_id": car_id,
+        "alert_type": "price_drop",
+        "price": price,
+        "message": f"Match: {make} {model} - ${price:,.0f}"
+    }
+
+
+def _listing_match(alert_id, user_id, car_id, make, model, price):
+    """Match for a new_listing alert"""
+    return {
+        "alert_id": alert_id,
+        "user_id": user_id,
+        "car_id": car_id,
+        "alert_type": "new_listing",
+        "price": price,
+        "message": f"New listing alert: {make} {model} - ${price:,.0f}"
+    }
+
+
+def check_favorited_cars_price_drops(db: Session):
+    """Check price drops for favorited cars with alerts"""
+    return _favorite_drop_matches(_car_price_drops(db, inclusive=True))
+
+
 def check_price_drop_alerts(db: Session):
     """Check for price drops on cars with alerts"""
-    from app.models import PriceHistory
-    from sqlalchemy import desc
-    
-    alerts = db.query(Alert).filter(
-        Alert.alert_type == "price_drop",
-        Alert.is_active == True
-    ).all()
+    matches = _price_drop_matches(_car_price_drops(db, inclusive=False))
     
-    matches = []
-    for alert in alerts:
-        if alert.car_id:
-            car = db.query(Car).filter(Car.id == alert.car_id).first()
-            if not car:
-                continue
-            
-            price_record = db.query(PriceHistory).filter(
-                PriceHistory.car_id == car.id,
-                PriceHistory.recorded_at < alert.created_at
-            ).order_by(desc(PriceHistory.recorded_at)).first()
-            
-            if price_record and car.price < price_record.price:
-                drop = price_record.price - car.price
-                matches.append({
-                    "alert_id": alert.id,
-                    "user_id": alert.user_id,
-                    "car_id": car.id,
-                    "message": f"Price drop: {car.make} {car.model} dropped ${drop:,.0f}"
-                })
-        else:
-            query = db.query(Car).filter(Car.is_available == True)
-            if alert.make:
-                query = query.filter(Car.make == alert.make)
-            if alert.model:
-                query = query.filter(Car.model == alert.model)
-            if alert.max_price:
-                query = query.filter(Car.price <= alert.max_price)
-            
-            for car in query.all():
-                matches.append({
-                    "alert_id": alert.id,
-                    "user_id": alert.user_id,
-                    "car_id": car.id,
-                    "message": f"Match: {car.make} {car.model} - ${car.price:,.0f}"
-                })
+    # Alerts without a car match every available car meeting their criteria
+    criteria_rows = _criteria_matches(
+        db,
+        (
+            Alert.alert_type == "price_drop",
+            Alert.is_active == True,
+            or_(Alert.car_id.is_(None), Alert.car_id == 0)
+        ),
+        ("make", "model", "max_price")
+    )
+    matches += [_criteria_match(*row) for row in criteria_rows]
     
+    matches.sort(key=lambda match: match["alert_id"])
     return matches
 
 
@@ -383,43 +515,15 @@ def check_new_listing_alerts(db: Session):
     """Check for new listings matching alert criteria"""
     logger.info("[Alert Agent] Checking new listing alerts...")
     
-    # Get all active new_listing alerts
-    alerts = db.query(Alert).filter(
-        Alert.alert_type == "new_listing",
-        Alert.is_active == True
-    ).all()
-    
-    matches = []
+    rows = _criteria_matches(
+        db,
+        (Alert.alert_type == "new_listing", Alert.is_active == True),
+        ("make", "model", "max_price", "min_year", "max_mileage", "fuel_type"),
+        # Only cars created after the alert was created
+        created_after_alert=True
+    )
     
-    for alert in alerts:
-        query = db.query(Car).filter(Car.is_available == True)
-        
-        # Only check cars created after alert was created
-        if alert.created_at:
-            query = query.filter(Car.created_at >= alert.created_at)
-        
-        if alert.make:
-            query = query.filter(Car.make == alert.make)
-        if alert.model:
-            query = query.filter(Car.model == alert.model)
-        if alert.max_price:
-            query = query.filter(Car.price <= alert.max_price)
-        if alert.min_year:
-            query = query.filter(Car.year >= alert.min_year)
-        if alert.max_mileage:
-            query = query.filter(Car.mileage <= alert.max_mileage)
-        if alert.fuel_type:
-            query = query.filter(Car.fuel_type == alert.fuel_type)
-        
-        cars = query.all()
-        
-        for car in cars:
-            matches.append({
-                "alert_id": alert.id,
-                "user_id": alert.user_id,
-                "car_id": car.id,
-                "message": f"New listing alert: {car.make} {car.model} - ${car.price:,.0f}"
-            })
+    matches = [_listing_match(*row) for row in rows]
     
     logger.info(f"[Alert Agent] Found {len(matches)} new listing matches")
     return matches
@@ -463,3 +567,172 @@ def run_alert_agent(db: Session):
         "matches": all_matches
     }
 
+
+def previous_prices(
+    db: Session,
+    car_ids: Iterable[int],
+    before_history_id: Optional[int] = None
+) -> Dict[int, float]:
+    """
+    Each car's price before its latest change, from PriceHistory
+
+    Args:
+        before_history_id: Take the latest price recorded at or before this PriceHistory
+            row (what the last agent run saw); default: the second-latest recorded price
+
+    Returns:
+        car_id -> previous price (cars without one are left out)
+    """
+    car_ids = list(car_ids)
+    if not car_ids:
+        return {}
+    filters = [PriceHistory.car_id.in_(car_ids)]
+    if before_history_id is not None:
+        filters.append(PriceHistory.id <= before_history_id)
+    ranked = db.query(
+        PriceHistory.car_id,
+        PriceHistory.price,
+        func.row_number().over(partition_by=PriceHistory.car_id, order_by=PriceHistory.id.desc()).label("position")
+    ).filter(*filters).subquery()
+    position = 1 if before_history_id is not None else 2
+    return dict(db.query(ranked.c.car_id, ranked.c.price).filter(ranked.c.position == position).all())
+
+
+def match_cars_against_alerts(
+    db: Session,
+    cars: List[Car],
+    new_car_ids: Set[int],
+    prices_before: Dict[int, float]
+):
+    """
+    Find the new alert matches for cars that were just listed or repriced
+
+    Each car is looked up in the in-memory alert index; only car-specific price_drop
+    alerts it hits need a query (for their baseline price). New listings are matched
+    against every alert. A repriced car was already reported at its previous price,
+    so it is only matched again when the price went down: never by new_listing
+    alerts, and by price_drop alerts only when it now costs less than prices_before.
+
+    Args:
+        new_car_ids: Cars that were just listed
+        prices_before: Previous price of the repriced cars (see previous_prices)
+
+    Returns:
+        Matches in run_alert_agent order: price drops, favorited-car drops, new listings
+    """
+    index = alert_indexes.get(db)
+    criteria_matches = []
+    listing_matches = []
+    car_alert_ids = []
+    for car in cars:
+        is_new = car.id in new_car_ids
+        dropped = car.id in prices_before and car.price < prices_before[car.id]
+        for alert in index.match(car):
+            if alert.alert_type == "new_listing":
+                if is_new:
+                    listing_matches.append(_listing_match(alert.id, alert.user_id, car.id, car.make, car.model, car.price))
+            elif not (is_new or dropped):
+                continue
+            elif alert.car_id is not None:
+                car_alert_ids.append(alert.id)
+            else:
+                criteria_matches.append(_criteria_match(alert.id, alert.user_id, car.id, car.make, car.model, car.price))
+    
+    price_matches = criteria_matches
+    favorite_matches = []
+    if car_alert_ids:
+        price_matches += _price_drop_matches(_car_price_drops(db, inclusive=False, alert_ids=car_alert_ids))
+        favorite_matches = _favorite_drop_matches(_car_price_drops(db, inclusive=True, alert_ids=car_alert_ids))
+    
+    # Same order as a full run: by alert, then car
+    price_matches.sort(key=lambda match: (match["alert_id"], match["car_id"]))
+    listing_matches.sort(key=lambda match: (match["alert_id"], match["car_id"]))
+    return price_matches + favorite_matches + listing_matches
+
+
+def deliver_alert_matches(db: Session, matches):
+    """Store alert matches as notifications for their users (duplicates of stored ones are skipped)"""
+    store_notifications(db, matches)
+    db.commit()
+    logger.info(f"[Alert Agent] Delivered {len(matches)} matches as notifications")
+
+
+def notify_car_alerts(car_ids: List[int]):
+    """
+    Background task: match cars that were just listed or repriced against alerts
+    Queued by the write paths so alert holders hear about a change right away
+    instead of at the next scheduler run.
+    """
+    from app.db.database import SessionLocal
+    
+    db = SessionLocal()
+    try:
+        cars = db.query(Car).filter(Car.id.in_(car_ids)).all()
+        # A car without an earlier price was just listed
+        prices_before = previous_prices(db, car_ids)
+        new_car_ids = {car.id for car in cars if car.id not in prices_before}
+        matches = match_cars_against_alerts(db, cars, new_car_ids, prices_before)
+        logger.info(f"[Alert Agent] {len(cars)} changed cars matched {len(matches)} alerts")
+        deliver_alert_matches(db, matches)
+    except Exception as e:
+        logger.error(f"[Alert Agent] Error checking alerts for cars {car_ids}: {e}")
+    finally:
+        db.close()
+
+
+def run_incremental_alert_agent(db: Session):
+    """
+    Run the alert agent over the cars that changed since the last run
+
+    New cars (Car.id past the high-water mark) and repriced cars (PriceHistory.id
+    past it) are matched against the in-memory alert index, so the work scales with
+    the changes rather than the inventory. Only new matches are reported: new cars
+    get what a full run would report for them, repriced cars only price_drop matches,
+    and only if they now cost less than at the last run. Without a recorded
+    high-water mark (first run, or no alert_agent_state table) this falls back to a
+    full run.
+    """
+    # Marks are read before evaluating, so rows written meanwhile are left for the next run
+    car_mark = db.query(func.max(Car.id)).scalar() or 0
+    price_mark = db.query(func.max(PriceHistory.id)).scalar() or 0
+    state = get_alert_state(db)
+    
+    if state is None or state.last_car_id is None or state.last_price_history_id is None:
+        logger.info("[Alert Agent] No high-water mark yet, running a full check")
+        result = run_alert_agent(db)
+        result["mode"] = "full"
+        if state is not None:
+            state.last_car_id = car_mark
+            state.last_price_history_id = price_mark
+            db.commit()
+        return result
+    
+    repriced = db.query(PriceHistory.car_id).filter(
+        PriceHistory.id > state.last_price_history_id,
+        PriceHistory.id <= price_mark
+    )
+    cars = db.query(Car).filter(
+        or_(
+            and_(Car.id > state.last_car_id, Car.id <= car_mark),
+            Car.id.in_(repriced)
+        )
+    ).order_by(Car.id).all()
+    new_car_ids = {car.id for car in cars if car.id > state.last_car_id}
+    prices_before = previous_prices(
+        db, (car.id for car in cars if car.id not in new_car_ids), before_history_id=state.last_price_history_id
+    )
+    all_matches = match_cars_against_alerts(db, cars, new_car_ids, prices_before)
+    
+    state.last_car_id = car_mark
+    state.last_price_history_id = price_mark
+    db.commit()
+    
+    logger.info(f"[Alert Agent] Incremental run: {len(cars)} changed cars, {len(all_matches)} matches")
+    return {
+        "status": "completed",
+        "mode": "incremental",
+        "cars_checked": len(cars),
+        "matches_found": len(all_matches),
+        "matches": all_matches
+    }
+
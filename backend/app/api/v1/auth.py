@@ -30,7 +30,7 @@ def get_current_user(
     db: Session = Depends(get_db)
 ) -> User:
     """Get current authenticated user"""
-    logger.debug(f"[DEBUG] get_current_user: Validating token")
+    logger.debug("[DEBUG] get_current_user: Validating token")
     
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -39,34 +39,34 @@ def get_current_user(
     )
     
     if not token:
-        logger.debug(f"[DEBUG] get_current_user: No token provided")
+        logger.debug("[DEBUG] get_current_user: No token provided")
         raise credentials_exception
     
     try:
         payload = decode_access_token(token)
         if payload is None:
-            logger.debug(f"[DEBUG] get_current_user: Token decode failed - invalid or expired token")
+            logger.debug("[DEBUG] get_current_user: Token decode failed - invalid or expired token")
             raise credentials_exception
         
         email: str = payload.get("sub")
         if email is None:
-            logger.warning(f"[DEBUG] get_current_user: No email in token payload")
+            logger.warning("[DEBUG] get_current_user: No email in token payload")
             raise credentials_exception
         
-        logger.debug(f"[DEBUG] get_current_user: Token valid, email: {email}")
+        logger.debug("[DEBUG] get_current_user: Token valid, email: %s", email)
         token_data = TokenData(email=email)
         user = db.query(User).filter(User.email == token_data.email).first()
         
         if user is None:
-            logger.warning(f"[DEBUG] get_current_user: User not found for email {email}")
+            logger.warning("[DEBUG] get_current_user: User not found for email %s", email)
             raise credentials_exception
         
-        logger.debug(f"[DEBUG] get_current_user: User authenticated (ID: {user.id})")
+        logger.debug("[DEBUG] get_current_user: User authenticated (ID: %s)", user.id)
         return user
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[DEBUG] get_current_user: Unexpected error: {e}")
+        logger.error("[DEBUG] get_current_user: Unexpected error: %s", e)
         raise credentials_exception
 
 
@@ -125,18 +125,18 @@ def get_admin_user(
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     """Create a new user account"""
-    logger.info(f"[DEBUG] signup: Signup request for email {user_data.email}")
+    logger.info("[DEBUG] signup: Signup request for email %s", user_data.email)
     
     # Check if user already exists
     existing_user = db.query(User).filter(User.email == user_data.email).first()
     if existing_user:
-        logger.warning(f"[DEBUG] signup: Email {user_data.email} already registered")
+        logger.warning("[DEBUG] signup: Email %s already registered", user_data.email)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    logger.debug(f"[DEBUG] signup: Creating new user with email {user_data.email}")
+    logger.debug("[DEBUG] signup: Creating new user with email %s", user_data.email)
     # Create new user
     hashed_password = get_password_hash(user_data.password)
     db_user = User(
@@ -147,7 +147,7 @@ def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
-    logger.info(f"[DEBUG] signup: User created successfully (ID: {db_user.id})")
+    logger.info("[DEBUG] signup: User created successfully (ID: %s)", db_user.id)
     
     return db_user
 
@@ -158,22 +158,22 @@ def login(
     db: Session = Depends(get_db)
 ):
     """Login and get access token"""
-    logger.info(f"[DEBUG] login: Login attempt for email {form_data.username}")
+    logger.info("[DEBUG] login: Login attempt for email %s", form_data.username)
     
     # Find user by email
     user = db.query(User).filter(User.email == form_data.username).first()
     
     if not user:
-        logger.warning(f"[DEBUG] login: User {form_data.username} not found")
+        logger.warning("[DEBUG] login: User %s not found", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    logger.debug(f"[DEBUG] login: User found (ID: {user.id}), verifying password")
+    logger.debug("[DEBUG] login: User found (ID: %s), verifying password", user.id)
     if not verify_password(form_data.password, user.hashed_password):
-        logger.warning(f"[DEBUG] login: Password verification failed for user {form_data.username}")
+        logger.warning("[DEBUG] login: Password verification failed for user %s", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -181,20 +181,20 @@ def login(
         )
     
     if not user.is_active:
-        logger.warning(f"[DEBUG] login: User {form_data.username} is inactive")
+        logger.warning("[DEBUG] login: User %s is inactive", form_data.username)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
     
-    logger.debug(f"[DEBUG] login: Creating access token for user {user.id}")
+    logger.debug("[DEBUG] login: Creating access token for user %s", user.id)
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={"sub": user.email},
         expires_delta=access_token_expires
     )
-    logger.info(f"[DEBUG] login: Login successful for user {user.id}, token created")
+    logger.info("[DEBUG] login: Login successful for user %s, token created", user.id)
     
     return {"access_token": access_token, "token_type": "bearer"}
 
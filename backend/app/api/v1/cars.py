@@ -1,23 +1,131 @@
 """
 Car listings API endpoints
 """
+import io
 import logging
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc, asc
-from typing import Optional, List
-from app.db.database import get_db
+import tempfile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_, and_, desc, asc, func, select, type_coerce, String, DateTime
+from typing import Literal, Optional, List
+from app.db.database import SessionLocal, get_db, get_async_db
 from app.models import Car, CarSpec, CarScore
-from app.schemas.car import CarResponse, CarListResponse, CarDetailResponse, CarBase
+from app.core.pagination import encode_cursor, decode_cursor, InvalidCursorError
+from app.core.catalog import bump_catalog_version
+from app.core.config import settings
+from app.core.export import EXPORT_FORMATS, EXPORT_MEDIA_TYPES, stream_export
+from app.core.ingest import DEFAULT_BATCH_SIZE, INGEST_FORMATS, ingest_cars
+from app.core.notifications import delete_notifications
+from app.core.review_stats import delete_review_stats
+from app.core.search import search_subquery
+from app.core.listing_cache import (
+    FACET_FIELDS,
+    ListingCounts,
+    listing_counts,
+    normalize_filters,
+    car_snapshot,
+)
+from app.core.response_cache import cache_response, cached_response, catalog_stamps, current_catalog_stamp
+from app.schemas.car import (
+    CarResponse, CarListResponse, CarDetailResponse, CarBase, CarIngestResponse,
+    CarCardResponse, CarFieldsListResponse
+)
 from app.api.v1.auth import get_admin_user
+from app.api.v1.alerts import notify_car_alerts
 from app.models.user import User
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
+def _keyset_column(db: AsyncSession, sort_field):
+    """
+    Column expression used for cursor comparisons.
+    SQLite stores DATETIME as text, and rows written by the server default lack the
+    microsecond suffix SQLAlchemy adds to bound datetimes, so compare the raw text there.
+    """
+    if db.bind.dialect.name == "sqlite" and isinstance(sort_field.type, DateTime):
+        return type_coerce(sort_field, String)
+    return sort_field
+
+
+# Relationships serialized with every car (CarResponse), loaded up front (async sessions can't
+# lazy-load, and sync ones would query once per car). Both are one-to-one, so they're joined into
+# the car query itself; use with contains_eager(...).options(...) when cars are loaded via a join.
+CAR_RESPONSE_OPTIONS = (joinedload(Car.specs), joinedload(Car.scores))
+
+# Fields a sparse listing (fields=...) can select: the car's columns, plus the first image
+# and the overall score, which are all a listing card needs of image_urls and scores
+PROJECTION_FIELDS = {
+    **{name: getattr(Car, name) for name in ("id", *CarBase.model_fields, "is_available", "created_at", "updated_at")},
+    "image_url": Car.image_urls[0].as_string(),
+    "overall_score": CarScore.overall_score,
+}
+LISTING_VIEWS = {"card": tuple(CarCardResponse.model_fields)}
+
+
+def _listing_projection(fields: Optional[str], view: Optional[str]) -> Optional[tuple]:
+    """Field names requested with fields= or view= (id always first), or None for full cars"""
+    if fields and view:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either fields or view, not both"
+        )
+    if view:
+        if view not in LISTING_VIEWS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"view must be one of: {', '.join(LISTING_VIEWS)}"
+            )
+        return LISTING_VIEWS[view]
+    if not fields:
+        return None
+    
+    names = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in names if name not in PROJECTION_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return tuple(dict.fromkeys(["id", *names]))
+
+
+def _select_projection(query, projection: tuple):
+    """Restrict a Car select to the projected columns (rows come back as plain tuples, no ORM objects)"""
+    query = query.with_only_columns(*(PROJECTION_FIELDS[name].label(name) for name in projection))
+    if "overall_score" in projection:
+        query = query.outerjoin(CarScore, CarScore.car_id == Car.id)
+    return query
+
+
+async def _count_with_facets(db: AsyncSession, query) -> ListingCounts:
+    """
+    Compute the total and per-facet value counts for a filtered Car select
+    in a single GROUP BY over the facet columns
+    """
+    facet_columns = [getattr(Car, field) for field in FACET_FIELDS]
+    rows = (await db.execute(
+        query.with_only_columns(*facet_columns, func.count(Car.id)).group_by(*facet_columns)
+    )).all()
+    
+    facets = {field: {} for field in FACET_FIELDS}
+    total = 0
+    for row in rows:
+        count = row[-1]
+        total += count
+        for field, value in zip(FACET_FIELDS, row[:-1]):
+            facets[field][value] = facets[field].get(value, 0) + count
+    
+    return ListingCounts(total=total, facets=facets)
+
+
 @router.get("/", response_model=CarListResponse)
-def get_cars(
+async def get_cars(
+    request: Request,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(12, ge=1, le=100, description="Items per page"),
     make: Optional[str] = Query(None, description="Filter by make"),
@@ -30,57 +138,91 @@ def get_cars(
     transmission: Optional[str] = Query(None, description="Filter by transmission"),
     condition: Optional[str] = Query(None, description="Filter by condition"),
     search: Optional[str] = Query(None, description="Search in make, model, description"),
-    sort_by: Optional[str] = Query("created_at", description="Sort by: price, year, mileage, created_at"),
+    sort_by: Optional[str] = Query("created_at", description="Sort by: price, year, mileage, created_at, relevance (with search)"),
     sort_order: Optional[str] = Query("desc", description="Sort order: asc or desc"),
-    db: Session = Depends(get_db)
+    pagination: Literal["offset", "cursor"] = Query("offset", description="Pagination mode: offset or cursor (keyset, skips the total count)"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous response's next_cursor (implies cursor mode)"),
+    include_facets: bool = Query(False, description="Include per-value counts for make, fuel_type, transmission and condition"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return per car (id is always included)"),
+    view: Optional[str] = Query(None, description="Predefined field set: card (what a listing card shows)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Get list of cars with filtering and pagination"""
-    logger.info(f"[DEBUG] get_cars: Request received - page={page}, page_size={page_size}, make={make}, search={search}, sort_by={sort_by}")
+    """
+    Get list of cars with filtering and pagination
+    With fields= or view= only those columns are selected and returned (CarFieldsListResponse).
+    """
+    logger.info("[DEBUG] get_cars: Request received - page=%s, page_size=%s, make=%s, search=%s, sort_by=%s",
+                page, page_size, make, search, sort_by)
+    
+    filter_key = normalize_filters(
+        make=make, model=model, min_year=min_year, max_year=max_year,
+        min_price=min_price, max_price=max_price, fuel_type=fuel_type,
+        transmission=transmission, condition=condition, search=search
+    )
+    
+    # Unchanged catalog: answer 304 or from the response cache without querying
+    catalog = await current_catalog_stamp(db)
+    projection = _listing_projection(fields, view)
+    cache_key = ("cars", filter_key, page, page_size, sort_by, sort_order, pagination, cursor, include_facets, projection)
+    cached = cached_response(request, catalog, cache_key)
+    if cached is not None:
+        return cached
     
     # Start with base query
-    query = db.query(Car).filter(Car.is_available == True)
-    logger.debug(f"[DEBUG] get_cars: Base query created")
+    query = select(Car).where(Car.is_available == True)
+    logger.debug("[DEBUG] get_cars: Base query created")
     
     # Apply filters
     if make:
-        query = query.filter(Car.make.ilike(f"%{make}%"))
+        query = query.where(Car.make.ilike(f"%{make}%"))
     
     if model:
-        query = query.filter(Car.model.ilike(f"%{model}%"))
+        query = query.where(Car.model.ilike(f"%{model}%"))
     
     if min_year:
-        query = query.filter(Car.year >= min_year)
+        query = query.where(Car.year >= min_year)
     
     if max_year:
-        query = query.filter(Car.year <= max_year)
+        query = query.where(Car.year <= max_year)
     
     if min_price:
-        query = query.filter(Car.price >= min_price)
+        query = query.where(Car.price >= min_price)
     
     if max_price:
-        query = query.filter(Car.price <= max_price)
+        query = query.where(Car.price <= max_price)
     
     if fuel_type:
-        query = query.filter(Car.fuel_type == fuel_type)
+        query = query.where(Car.fuel_type == fuel_type)
     
     if transmission:
-        query = query.filter(Car.transmission == transmission)
+        query = query.where(Car.transmission == transmission)
     
     if condition:
-        query = query.filter(Car.condition == condition)
+        query = query.where(Car.condition == condition)
     
-    # Search functionality
+    # Search functionality: full-text index when available, ILIKE scan otherwise
+    search_matches = None
     if search:
-        search_filter = or_(
-            Car.make.ilike(f"%{search}%"),
-            Car.model.ilike(f"%{search}%"),
-            Car.description.ilike(f"%{search}%")
-        )
-        query = query.filter(search_filter)
-    
-    # Get total count
-    total = query.count()
-    logger.debug(f"[DEBUG] get_cars: Total cars matching filters: {total}")
+        search_matches = await db.run_sync(search_subquery, search)
+        if search_matches is not None:
+            query = query.join(search_matches, search_matches.c.car_id == Car.id)
+        else:
+            search_filter = or_(
+                Car.make.ilike(f"%{search}%"),
+                Car.model.ilike(f"%{search}%"),
+                Car.description.ilike(f"%{search}%")
+            )
+            query = query.where(search_filter)
+    
+    # Totals and facet counts come from the listing count cache when possible
+    catalog_version = catalog.version if catalog else None
+    counts = listing_counts.get(filter_key, catalog_version)
+    
+    if include_facets and (counts is None or counts.facets is None):
+        counts = await _count_with_facets(db, query)
+        listing_counts.set(filter_key, catalog_version, counts)
+    
+    facets = counts.facets if include_facets else None
     
     # Apply sorting
     valid_sort_fields = {
@@ -89,63 +231,193 @@ def get_cars(
         "mileage": Car.mileage,
         "created_at": Car.created_at
     }
+    if search_matches is not None:
+        valid_sort_fields["relevance"] = search_matches.c.rank
+    
+    sort_key = sort_by if sort_by in valid_sort_fields else "created_at"
+    sort_field = valid_sort_fields[sort_key]
+    order = "asc" if sort_order and sort_order.lower() == "asc" else "desc"
+    if sort_key == "relevance":
+        order = "asc"  # Lower rank is a better match
+    direction = asc if order == "asc" else desc
+    logger.debug("[DEBUG] get_cars: Sorting by %s (%s)", sort_key, order)
+    
+    # Cursor (keyset) pagination: seek past the last (sort value, id) instead of
+    # OFFSET, and skip the COUNT so deep pages cost the same as the first one
+    if pagination == "cursor" or cursor:
+        keyset_field = _keyset_column(db, sort_field)
+        
+        if cursor:
+            try:
+                last_value, last_id = decode_cursor(cursor, sort_key, order)
+            except InvalidCursorError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+            
+            if order == "asc":
+                query = query.where(or_(
+                    keyset_field > last_value,
+                    and_(keyset_field == last_value, Car.id > last_id)
+                ))
+            else:
+                query = query.where(or_(
+                    keyset_field < last_value,
+                    and_(keyset_field == last_value, Car.id < last_id)
+                ))
+        
+        # Fetch one extra row to know whether another page exists
+        page_query = query.options(*CAR_RESPONSE_OPTIONS) if projection is None else _select_projection(query, projection)
+        rows = (await db.execute(
+            page_query.add_columns(keyset_field.label("cursor_value")).order_by(
+                direction(keyset_field), direction(Car.id)
+            ).limit(page_size + 1)
+        )).all()
+        
+        next_cursor = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            last_sort_value = rows[-1].cursor_value
+            last_id = rows[-1][0].id if projection is None else rows[-1].id
+            next_cursor = encode_cursor(sort_key, order, last_sort_value, last_id)
+        
+        if projection is None:
+            cars = [row[0] for row in rows]
+        else:
+            cars = [{name: row._mapping[name] for name in projection} for row in rows]
+        logger.info("[DEBUG] get_cars: Returning %s cars (cursor mode, has_more=%s)", len(cars), next_cursor is not None)
+        
+        # Report the total only when it's already cached
+        total = counts.total if counts else None
+        
+        content = {
+            "cars": cars,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size if total is not None else None,
+            "next_cursor": next_cursor,
+            "facets": facets
+        }
+        if projection is not None:
+            return cache_response(catalog, cache_key, CarFieldsListResponse, content, serialize=True)
+        return cache_response(catalog, cache_key, CarListResponse, content)
     
-    sort_field = valid_sort_fields.get(sort_by, Car.created_at)
-    logger.debug(f"[DEBUG] get_cars: Sorting by {sort_by} ({sort_order})")
+    # Get total count
+    if counts is None:
+        counts = ListingCounts(total=(await db.execute(
+            select(func.count()).select_from(query.subquery())
+        )).scalar_one())
+        listing_counts.set(filter_key, catalog_version, counts)
+    total = counts.total
+    logger.debug("[DEBUG] get_cars: Total cars matching filters: %s", total)
     
-    if sort_order.lower() == "asc":
-        query = query.order_by(asc(sort_field))
-    else:
-        query = query.order_by(desc(sort_field))
+    query = query.order_by(direction(sort_field))
     
     # Apply pagination
     offset = (page - 1) * page_size
-    logger.debug(f"[DEBUG] get_cars: Pagination - offset={offset}, limit={page_size}")
-    cars = query.offset(offset).limit(page_size).all()
+    logger.debug("[DEBUG] get_cars: Pagination - offset=%s, limit=%s", offset, page_size)
+    if projection is None:
+        cars = (await db.scalars(query.options(*CAR_RESPONSE_OPTIONS).offset(offset).limit(page_size))).all()
+    else:
+        rows = (await db.execute(_select_projection(query, projection).offset(offset).limit(page_size))).all()
+        cars = [dict(row._mapping) for row in rows]
     
-    logger.info(f"[DEBUG] get_cars: Returning {len(cars)} cars (page {page} of {(total + page_size - 1) // page_size})")
+    logger.info("[DEBUG] get_cars: Returning %s cars (page %s of %s)",
+                len(cars), page, (total + page_size - 1) // page_size)
     
     # Calculate total pages
     total_pages = (total + page_size - 1) // page_size
     
-    return {
+    content = {
         "cars": cars,
         "total": total,
         "page": page,
         "page_size": page_size,
-        "total_pages": total_pages
+        "total_pages": total_pages,
+        "facets": facets
     }
+    if projection is not None:
+        return cache_response(catalog, cache_key, CarFieldsListResponse, content, serialize=True)
+    return cache_response(catalog, cache_key, CarListResponse, content)
 
 
 @router.get("/makes/list", response_model=List[str])
-def get_makes(db: Session = Depends(get_db)):
+async def get_makes(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get list of all unique car makes"""
-    makes = db.query(Car.make).distinct().order_by(Car.make).all()
-    return [make[0] for make in makes]
+    catalog = await current_catalog_stamp(db)
+    cached = cached_response(request, catalog, ("makes",))
+    if cached is not None:
+        return cached
+    
+    makes = await db.scalars(select(Car.make).distinct().order_by(Car.make))
+    return cache_response(catalog, ("makes",), List[str], list(makes))
 
 
 @router.get("/fuel-types/list", response_model=List[str])
-def get_fuel_types(db: Session = Depends(get_db)):
+async def get_fuel_types(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get list of all unique fuel types"""
-    fuel_types = db.query(Car.fuel_type).distinct().order_by(Car.fuel_type).all()
-    return [ft[0] for ft in fuel_types]
+    catalog = await current_catalog_stamp(db)
+    cached = cached_response(request, catalog, ("fuel_types",))
+    if cached is not None:
+        return cached
+    
+    fuel_types = await db.scalars(select(Car.fuel_type).distinct().order_by(Car.fuel_type))
+    return cache_response(catalog, ("fuel_types",), List[str], list(fuel_types))
+
+
+@router.get("/export")
+def export_cars(
+    request: Request,
+    format: str = Query("ndjson", description="ndjson or csv"),
+    include_details: bool = Query(True, description="Include specs and scores"),
+    available_only: bool = Query(True, description="Only cars that are currently listed"),
+    admin_user: User = Depends(get_admin_user)
+):
+    """
+    Stream the whole inventory as NDJSON or CSV (Admin only)
+    For partners syncing the catalog: one request instead of paging through the listings.
+    The body is gzip-compressed when the client accepts it.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+    logger.info("[Admin] Inventory export (%s, gzip=%s) by %s", format, compress, admin_user.email)
+    
+    headers = {"Content-Disposition": f'attachment; filename="cars.{format}"', "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        stream_export(SessionLocal, format, include_details, available_only, compress),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers
+    )
 
 
 @router.get("/{car_id}", response_model=CarDetailResponse)
-def get_car_detail(car_id: int, db: Session = Depends(get_db)):
+async def get_car_detail(car_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
     """Get detailed information about a specific car"""
-    logger.info(f"[DEBUG] get_car_detail: Request for car ID {car_id}")
-    car = db.query(Car).filter(Car.id == car_id).first()
+    logger.info("[DEBUG] get_car_detail: Request for car ID %s", car_id)
+    catalog = await current_catalog_stamp(db)
+    cached = cached_response(request, catalog, ("car", car_id))
+    if cached is not None:
+        return cached
+    
+    car = await db.scalar(select(Car).options(*CAR_RESPONSE_OPTIONS).where(Car.id == car_id))
     
     if not car:
-        logger.warning(f"[DEBUG] get_car_detail: Car ID {car_id} not found")
+        logger.warning("[DEBUG] get_car_detail: Car ID %s not found", car_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Car not found"
         )
     
-    logger.info(f"[DEBUG] get_car_detail: Car found - {car.make} {car.model} (ID: {car.id})")
-    return car
+    logger.info("[DEBUG] get_car_detail: Car found - %s %s (ID: %s)", car.make, car.model, car.id)
+    return cache_response(catalog, ("car", car_id), CarDetailResponse, car)
 
 
 @router.delete("/{car_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -164,8 +436,14 @@ def delete_car(
             detail="Car not found"
         )
     
+    snapshot = car_snapshot(car)
+    delete_review_stats(db, car_id)
+    delete_notifications(db, car_id=car_id)
     db.delete(car)
+    catalog_version = bump_catalog_version(db)
     db.commit()
+    listing_counts.invalidate_car(snapshot, catalog_version)
+    catalog_stamps.invalidate()
     
     logger.info(f"[Admin] Car {car_id} deleted successfully")
     return None
@@ -174,6 +452,7 @@ def delete_car(
 @router.patch("/{car_id}/price", response_model=CarResponse)
 def update_car_price(
     car_id: int,
+    background_tasks: BackgroundTasks,
     new_price: float = Query(..., ge=0, description="New price"),
     db: Session = Depends(get_db),
     admin_user: User = Depends(get_admin_user)
@@ -191,6 +470,7 @@ def update_car_price(
     # Store original image_urls to preserve them
     original_image_urls = car.image_urls
     
+    snapshot = car_snapshot(car)
     old_price = car.price
     car.price = new_price
     
@@ -203,7 +483,10 @@ def update_car_price(
     price_history = PriceHistory(car_id=car.id, price=new_price)
     db.add(price_history)
     
+    catalog_version = bump_catalog_version(db)
     db.commit()
+    listing_counts.invalidate_price_change(snapshot, old_price, new_price, catalog_version)
+    catalog_stamps.invalidate()
     db.refresh(car)
     
     # Double-check image_urls are preserved after refresh
@@ -213,9 +496,87 @@ def update_car_price(
         db.commit()
         db.refresh(car)
     
-    # Alert feature removed
+    # Match the new price against alerts right after the response
+    background_tasks.add_task(notify_car_alerts, [car.id])
     
     logger.info(f"[Admin] Car {car_id} price updated from ${old_price} to ${new_price}")
     logger.debug(f"[Admin] Image URLs preserved: {car.image_urls}")
     return car
 
+
+# Bulk uploads are buffered in memory up to this size, then on disk
+INGEST_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
+# Received body chunks are gathered up to this size and written to the spool in a worker thread
+INGEST_SPOOL_WRITE_SIZE = 1024 * 1024
+
+# Ingestions that add or reprice more cars than this leave alert matching to the scheduled
+# incremental alert agent, which finds new cars and PriceHistory rows by high-water mark
+INGEST_NOTIFY_MAX_CARS = 1000
+
+
+@router.post("/bulk", response_model=CarIngestResponse)
+async def bulk_ingest_cars(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    format: Optional[str] = Query(None, description="ndjson or csv (default: from Content-Type)"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=10000, description="Cars written per transaction"),
+    db: Session = Depends(get_db),
+    admin_user: User = Depends(get_admin_user)
+):
+    """
+    Bulk insert/update cars from an NDJSON or CSV request body (Admin only)
+    Cars are matched on VIN: existing listings are updated, the rest inserted.
+    Invalid records are skipped and reported; the rest are written in batches.
+    Bodies over INGEST_MAX_UPLOAD_BYTES are rejected with 413.
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    if fmt not in INGEST_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"format must be one of: {', '.join(INGEST_FORMATS)}"
+        )
+    max_bytes = settings.INGEST_MAX_UPLOAD_BYTES
+    too_large = HTTPException(
+        status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+        detail=f"Request body exceeds {max_bytes} bytes"
+    )
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    logger.info("[Admin] Bulk ingest (%s) by %s", fmt, admin_user.email)
+    
+    with tempfile.SpooledTemporaryFile(max_size=INGEST_SPOOL_MAX_MEMORY) as spool:
+        # Past INGEST_SPOOL_MAX_MEMORY the spool writes to disk, so keep writes off the event loop
+        received = 0
+        pending = bytearray()
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > max_bytes:
+                raise too_large
+            pending += chunk
+            if len(pending) >= INGEST_SPOOL_WRITE_SIZE:
+                await run_in_threadpool(spool.write, bytes(pending))
+                pending.clear()
+        if pending:
+            await run_in_threadpool(spool.write, bytes(pending))
+        spool.seek(0)
+        lines = io.TextIOWrapper(spool, encoding="utf-8", errors="replace", newline="")
+        result = await run_in_threadpool(
+            ingest_cars, db, lines, fmt, batch_size, max_changed_ids=INGEST_NOTIFY_MAX_CARS
+        )
+    
+    if result.inserted or result.updated:
+        # Other workers notice the catalog version bumps on their own
+        listing_counts.clear()
+        catalog_stamps.invalidate()
+    changed_car_ids = list(dict.fromkeys(result.changed_car_ids))
+    if changed_car_ids and len(changed_car_ids) <= INGEST_NOTIFY_MAX_CARS:
+        background_tasks.add_task(notify_car_alerts, changed_car_ids)
+    
+    summary = result.summary()
+    logger.info(
+        "[Admin] Bulk ingest: %s inserted, %s updated, %s failed (%s rows/s)",
+        summary["inserted"], summary["updated"], summary["failed"], summary["rows_per_second"]
+    )
+    return summary
@@ -4,11 +4,12 @@ Favorites API endpoints
 import logging
 from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
 from app.db.database import get_db
 from app.models import Favorite, Car
 from app.models.user import User
 from app.api.v1.auth import get_current_user
+from app.api.v1.cars import CAR_RESPONSE_OPTIONS
 from app.schemas.favorite import FavoriteResponse, FavoriteCreate
 
 router = APIRouter()
@@ -54,6 +55,8 @@ def add_favorite(
     db.add(favorite)
     db.commit()
     db.refresh(favorite)
+    # The commit expired the car; reload it with specs and scores in one query for the response
+    car = db.query(Car).options(*CAR_RESPONSE_OPTIONS).filter(Car.id == favorite.car_id).one()
     
     logger.info(f"[Favorites] Car {favorite_data.car_id} added to favorites for user {current_user.id}")
     return FavoriteResponse(
@@ -100,23 +103,24 @@ def get_favorites(
     """Get all favorites for current user"""
     logger.info(f"[Favorites] User {current_user.id} requesting favorites")
     
-    favorites = db.query(Favorite).filter(
+    # One query: favorites joined to their cars (dropping favorites whose car is gone),
+    # with each car's specs and scores
+    favorites = db.query(Favorite).join(Favorite.car).options(
+        contains_eager(Favorite.car).options(*CAR_RESPONSE_OPTIONS)
+    ).filter(
         Favorite.user_id == current_user.id
     ).all()
     
-    result = []
-    for fav in favorites:
-        car = db.query(Car).filter(Car.id == fav.car_id).first()
-        if car:
-            result.append(FavoriteResponse(
-                id=fav.id,
-                user_id=fav.user_id,
-                car_id=fav.car_id,
-                created_at=fav.created_at,
-                car=car
-            ))
-    
-    return result
+    return [
+        FavoriteResponse(
+            id=fav.id,
+            user_id=fav.user_id,
+            car_id=fav.car_id,
+            created_at=fav.created_at,
+            car=fav.car
+        )
+        for fav in favorites
+    ]
 
 
 @router.get("/check/{car_id}")
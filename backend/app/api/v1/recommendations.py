@@ -136,55 +136,58 @@ def get_personalized_recommendations(
             # Get recommendations using vector similarity
             recommended_car_ids = set()
             
+            # Get embeddings for all favorite cars at once, generating any that are missing
+            favorite_embeddings = vectordb.get_car_embeddings(favorite_car_ids)
             for favorite_car in favorite_cars:
+                if favorite_car.id in favorite_embeddings:
+                    continue
                 try:
-                    # Get or generate embedding for favorite car
-                    embedding = vectordb.get_car_embedding(favorite_car.id)
-                    
-                    if not embedding:
-                        # Generate embedding if not exists
-                        embedding = embeddings_service.generate_car_embedding(
-                            make=favorite_car.make,
-                            model=favorite_car.model,
-                            year=favorite_car.year,
-                            description=favorite_car.description,
-                            fuel_type=favorite_car.fuel_type,
-                            transmission=favorite_car.transmission
-                        )
-                        
-                        if embedding:
-                            metadata = {
-                                "make": favorite_car.make,
-                                "model": favorite_car.model,
-                                "year": favorite_car.year,
-                                "price": favorite_car.price,
-                                "fuel_type": favorite_car.fuel_type,
-                                "transmission": favorite_car.transmission,
-                                "description": favorite_car.description or ""
-                            }
-                            vectordb.add_car_embedding(favorite_car.id, embedding, metadata)
+                    embedding = embeddings_service.generate_car_embedding(
+                        make=favorite_car.make,
+                        model=favorite_car.model,
+                        year=favorite_car.year,
+                        description=favorite_car.description,
+                        fuel_type=favorite_car.fuel_type,
+                        transmission=favorite_car.transmission
+                    )
                     
                     if embedding:
-                        # Find similar cars (exclude favorites)
-                        similar_results = vectordb.search_similar_cars(
-                            query_embedding=embedding,
-                            n_results=n_results + len(favorite_car_ids)
-                        )
-                        
-                        # Filter out favorite cars
-                        for result in similar_results:
-                            car_id = result["car_id"]
-                            if car_id not in favorite_car_ids and car_id not in recommended_car_ids:
-                                recommended_car_ids.add(car_id)
-                                if len(recommended_car_ids) >= n_results:
-                                    break
-                        
+                        metadata = {
+                            "make": favorite_car.make,
+                            "model": favorite_car.model,
+                            "year": favorite_car.year,
+                            "price": favorite_car.price,
+                            "fuel_type": favorite_car.fuel_type,
+                            "transmission": favorite_car.transmission,
+                            "description": favorite_car.description or ""
+                        }
+                        vectordb.add_car_embedding(favorite_car.id, embedding, metadata)
+                        favorite_embeddings[favorite_car.id] = embedding
+                except Exception as e:
+                    logger.warning(f"[AI Recommendations] Error generating embedding for car {favorite_car.id}: {e}")
+            
+            # Find similar cars for every favorite in one batched search (exclude favorites)
+            query_cars = [car for car in favorite_cars if car.id in favorite_embeddings]
+            try:
+                batch_results = vectordb.search_similar_cars_batch(
+                    [favorite_embeddings[car.id] for car in query_cars],
+                    n_results=n_results + len(favorite_car_ids)
+                )
+            except Exception as e:
+                logger.warning(f"[AI Recommendations] Error getting similar cars: {e}")
+                batch_results = []
+            
+            for similar_results in batch_results:
+                # Filter out favorite cars
+                for result in similar_results:
+                    car_id = result["car_id"]
+                    if car_id not in favorite_car_ids and car_id not in recommended_car_ids:
+                        recommended_car_ids.add(car_id)
                         if len(recommended_car_ids) >= n_results:
                             break
-                            
-                except Exception as e:
-                    logger.warning(f"[AI Recommendations] Error getting similar cars: {e}")
-                    continue
+                
+                if len(recommended_car_ids) >= n_results:
+                    break
             
             # If we don't have enough, fill with preference-based
             if len(recommended_car_ids) < n_results:
@@ -4,14 +4,18 @@ Reviews API endpoints
 import logging
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from app.db.database import get_db
+from sqlalchemy import func, desc, select
+from app.db.database import get_db, get_async_db
 from app.models import Review, Car
 from app.models.user import User
 from app.api.v1.auth import get_current_user, get_current_active_user
-from app.schemas.review import ReviewCreate, ReviewUpdate, ReviewResponse, ReviewListResponse
+from app.schemas.review import (
+    ReviewCreate, ReviewUpdate, ReviewResponse, ReviewListResponse, ReviewStatsBatchResponse
+)
 from app.core.embeddings import EmbeddingsService
+from app.core.review_stats import apply_review_change, get_review_aggregates
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -49,6 +53,7 @@ def generate_review_summary(car_id: int):
             # In a production system, you might want a separate table for car summaries
             latest_review = reviews[-1]
             latest_review.ai_summary = summary
+            apply_review_change(db, car_id)
             db.commit()
             logger.info(f"[Reviews] Generated AI summary for car {car_id}")
         else:
@@ -102,6 +107,7 @@ def create_review(
         content=review_data.content
     )
     db.add(review)
+    apply_review_change(db, review_data.car_id, added_rating=review_data.rating)
     db.commit()
     db.refresh(review)
     logger.info(f"[DEBUG] create_review: Review created successfully (ID: {review.id})")
@@ -113,18 +119,18 @@ def create_review(
 
 
 @router.get("/car/{car_id}", response_model=ReviewListResponse)
-def get_car_reviews(
+async def get_car_reviews(
     car_id: int,
     skip: int = Query(0, ge=0),
     limit: int = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all reviews for a specific car"""
     logger.info(f"[DEBUG] get_car_reviews: Getting reviews for car {car_id}")
     
     # Check if car exists
-    car = db.query(Car).filter(Car.id == car_id).first()
-    if not car:
+    car_exists = await db.scalar(select(Car.id).where(Car.id == car_id))
+    if car_exists is None:
         logger.warning(f"[DEBUG] get_car_reviews: Car {car_id} not found")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -132,12 +138,14 @@ def get_car_reviews(
         )
     
     # Get reviews
-    reviews_query = db.query(Review).filter(Review.car_id == car_id).order_by(desc(Review.created_at))
-    total = reviews_query.count()
-    reviews = reviews_query.offset(skip).limit(limit).all()
+    reviews = (await db.scalars(
+        select(Review).where(Review.car_id == car_id).order_by(desc(Review.created_at)).offset(skip).limit(limit)
+    )).all()
     
-    # Calculate average rating
-    avg_rating = db.query(func.avg(Review.rating)).filter(Review.car_id == car_id).scalar()
+    # Total and average rating in one aggregate
+    total, avg_rating = (await db.execute(
+        select(func.count(Review.id), func.avg(Review.rating)).where(Review.car_id == car_id)
+    )).one()
     
     logger.info(f"[DEBUG] get_car_reviews: Found {total} reviews for car {car_id}, returning {len(reviews)}")
     
@@ -148,6 +156,27 @@ def get_car_reviews(
     )
 
 
+# Upper bound on car_ids per stats request (a listing page shows at most 100 cars)
+MAX_STATS_CAR_IDS = 100
+
+
+@router.get("/stats", response_model=ReviewStatsBatchResponse)
+async def get_review_stats(
+    car_ids: List[int] = Query(..., description="Car IDs (repeat the parameter, max 100)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get review count, average rating and star histogram for several cars in one request"""
+    if len(car_ids) > MAX_STATS_CAR_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_STATS_CAR_IDS} car_ids per request"
+        )
+
+    aggregates = await db.run_sync(get_review_aggregates, car_ids)
+    logger.debug("[Reviews] get_review_stats: Returning stats for %s cars", len(aggregates))
+    return ReviewStatsBatchResponse(stats=[aggregate._asdict() for aggregate in aggregates])
+
+
 @router.get("/{review_id}", response_model=ReviewResponse)
 def get_review(
     review_id: int,
@@ -194,10 +223,12 @@ def update_review(
         )
     
     # Update review
+    old_rating = review.rating
     update_data = review_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(review, field, value)
     
+    apply_review_change(db, review.car_id, added_rating=review.rating, removed_rating=old_rating)
     db.commit()
     db.refresh(review)
     logger.info(f"[DEBUG] update_review: Review {review_id} updated successfully")
@@ -231,6 +262,7 @@ def delete_review(
         )
     
     db.delete(review)
+    apply_review_change(db, review.car_id, removed_rating=review.rating)
     db.commit()
     logger.info(f"[DEBUG] delete_review: Review {review_id} deleted successfully")
     return None
@@ -0,0 +1,297 @@
+"""
+In-process index of active alert criteria, for matching individual cars against alerts
+"""
+import logging
+import math
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.core.alert_state import get_alerts_version
+from app.models.alert import Alert
+
+logger = logging.getLogger(__name__)
+
+# Criteria the alert agent checks per alert type (see check_price_drop_alerts / check_new_listing_alerts)
+ALERT_CRITERIA_FIELDS = {
+    "price_drop": ("make", "model", "max_price"),
+    "new_listing": ("make", "model", "max_price", "min_year", "max_mileage", "fuel_type"),
+}
+
+
+class CarFacts(NamedTuple):
+    """The Car columns alert criteria look at (plain values, cheap to read in a tight loop)"""
+    id: int
+    make: str
+    model: str
+    year: int
+    price: float
+    mileage: int
+    fuel_type: str
+    is_available: bool
+    created_at: Optional[datetime]
+
+    @classmethod
+    def from_car(cls, car) -> "CarFacts":
+        return cls(
+            car.id, car.make, car.model, car.year, car.price, car.mileage,
+            car.fuel_type, car.is_available, car.created_at
+        )
+
+
+class AlertCriteria(NamedTuple):
+    """What the alert agent needs to know about one alert (criteria it doesn't check are None)"""
+    id: int
+    user_id: int
+    alert_type: str
+    car_id: Optional[int] = None
+    make: Optional[str] = None
+    model: Optional[str] = None
+    max_price: Optional[float] = None
+    min_year: Optional[int] = None
+    max_mileage: Optional[int] = None
+    fuel_type: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    @classmethod
+    def from_alert(cls, alert) -> "AlertCriteria":
+        """Build from an Alert (or a row with the same column names)"""
+        # A price_drop alert for one car watches that car only; its criteria are ignored
+        car_id = (alert.car_id or None) if alert.alert_type == "price_drop" else None
+        fields = () if car_id else ALERT_CRITERIA_FIELDS.get(alert.alert_type, ())
+        return cls(
+            id=alert.id,
+            user_id=alert.user_id,
+            alert_type=alert.alert_type,
+            car_id=car_id,
+            created_at=alert.created_at,
+            **{field: getattr(alert, field) or None for field in fields}
+        )
+
+    def matches(self, car) -> bool:
+        """Check a car against this alert (unset criteria match anything)"""
+        if self.car_id is not None:
+            return car.id == self.car_id
+        if not car.is_available:
+            return False
+        if self.make and car.make != self.make:
+            return False
+        if self.model and car.model != self.model:
+            return False
+        if self.max_price and car.price > self.max_price:
+            return False
+        if self.min_year and car.year < self.min_year:
+            return False
+        if self.max_mileage and car.mileage > self.max_mileage:
+            return False
+        if self.fuel_type and car.fuel_type != self.fuel_type:
+            return False
+        # New listing alerts only cover cars listed after the alert was created
+        if self.alert_type == "new_listing" and self.created_at:
+            if car.created_at is None or car.created_at < self.created_at:
+                return False
+        return True
+
+
+def _max_price_key(alert: AlertCriteria) -> float:
+    return -(alert.max_price or math.inf)
+
+
+def _created_at_key(alert: AlertCriteria) -> tuple:
+    return (0,) if alert.created_at is None else (1, alert.created_at)
+
+
+# Per alert type, the bucket sort order that rules out most alerts for a car with one bisect:
+# price_drop alerts by max_price (highest or unset first), new_listing alerts by creation
+# date (undated first), as an old car being repriced only falls under alerts older than it.
+_BUCKET_ORDER = {
+    "price_drop": _max_price_key,
+    "new_listing": _created_at_key,
+}
+
+
+def _bucket_bound(alert_type: str, car) -> object:
+    """The largest sort key (see _BUCKET_ORDER) an alert can have and still match the car"""
+    if alert_type == "price_drop":
+        return -car.price
+    return (0,) if car.created_at is None else (1, car.created_at)
+
+
+class _SortedBucket:
+    """Alerts kept sorted by a key, so ruling out the ones past a bound is a bisect"""
+
+    def __init__(self, key):
+        self._key = key
+        self._keys: list = []
+        self._alerts: List[AlertCriteria] = []
+
+    def add(self, alert: AlertCriteria):
+        key = self._key(alert)
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._alerts.insert(position, alert)
+
+    def remove(self, alert_id: int):
+        for position, alert in enumerate(self._alerts):
+            if alert.id == alert_id:
+                del self._keys[position]
+                del self._alerts[position]
+                return
+
+    def upto(self, bound) -> List[AlertCriteria]:
+        """Alerts whose key is at most bound"""
+        return self._alerts[:bisect_right(self._keys, bound)]
+
+
+class AlertIndex:
+    """
+    Active alerts bucketed so a car is only checked against alerts that could match it
+
+    Car-specific alerts are keyed by car_id and criteria alerts by (type, make, model),
+    with None standing in for an unset make or model. Alerts that set neither are
+    keyed by (type, fuel_type) (None = any). Each bucket is sorted as _BUCKET_ORDER
+    says, so a lookup is a handful of dict gets and bisects, followed by the
+    remaining criteria checks on the alerts left.
+    """
+
+    def __init__(self, alerts: Iterable[AlertCriteria] = ()):
+        self._by_car = defaultdict(list)
+        self._buckets: Dict[tuple, _SortedBucket] = {}
+        # alert_id -> the criteria it was indexed with (to find its bucket again)
+        self._alerts: Dict[int, AlertCriteria] = {}
+        for alert in alerts:
+            self.add(alert)
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    @staticmethod
+    def _bucket_key(alert: AlertCriteria) -> tuple:
+        if alert.make or alert.model:
+            return (alert.alert_type, alert.make, alert.model)
+        return (alert.alert_type, alert.fuel_type)
+
+    def add(self, alert: AlertCriteria):
+        """Index an alert (replacing any earlier version of it); types the agent doesn't check are skipped"""
+        self.remove(alert.id)
+        if alert.alert_type not in ALERT_CRITERIA_FIELDS:
+            return
+        if alert.car_id is not None:
+            self._by_car[alert.car_id].append(alert)
+        else:
+            key = self._bucket_key(alert)
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _SortedBucket(_BUCKET_ORDER[alert.alert_type])
+            bucket.add(alert)
+        self._alerts[alert.id] = alert
+
+    def remove(self, alert_id: int):
+        """Drop an alert from the index (no-op if it isn't indexed)"""
+        alert = self._alerts.pop(alert_id, None)
+        if alert is None:
+            return
+        if alert.car_id is not None:
+            self._by_car[alert.car_id] = [a for a in self._by_car[alert.car_id] if a.id != alert_id]
+        else:
+            self._buckets[self._bucket_key(alert)].remove(alert_id)
+
+    def candidates(self, car, alert_type: Optional[str] = None) -> List[AlertCriteria]:
+        """Alerts whose bucket a car falls into and whose sort key it's within (each alert at most once)"""
+        candidates = [
+            alert for alert in self._by_car.get(car.id, ())
+            if alert_type is None or alert.alert_type == alert_type
+        ]
+        for type_ in ((alert_type,) if alert_type else _BUCKET_ORDER):
+            bound = _bucket_bound(type_, car)
+            for key in (
+                (type_, car.make, car.model),
+                (type_, car.make, None),
+                (type_, None, car.model),
+                (type_, car.fuel_type),
+                (type_, None),
+            ):
+                bucket = self._buckets.get(key)
+                if bucket is not None:
+                    candidates += bucket.upto(bound)
+        return candidates
+
+    def match(self, car, alert_type: Optional[str] = None) -> List[AlertCriteria]:
+        """
+        Find the alerts a car matches
+
+        Args:
+            car: Car (or any object with the Car columns the criteria look at)
+            alert_type: Only return alerts of this type
+        """
+        facts = CarFacts.from_car(car)
+        return [alert for alert in self.candidates(facts, alert_type) if alert.matches(facts)]
+
+
+def load_alert_index(db: Session) -> AlertIndex:
+    """Build an index of every active alert the agent evaluates"""
+    rows = db.query(
+        Alert.id, Alert.user_id, Alert.alert_type, Alert.car_id, Alert.make, Alert.model,
+        Alert.max_price, Alert.min_year, Alert.max_mileage, Alert.fuel_type, Alert.created_at
+    ).filter(
+        Alert.is_active == True,
+        Alert.alert_type.in_(list(ALERT_CRITERIA_FIELDS))
+    ).all()
+    return AlertIndex(AlertCriteria.from_alert(row) for row in rows)
+
+
+class SharedAlertIndex:
+    """
+    Process-wide AlertIndex tagged with the alert set version it was built at
+
+    Rebuilt from the database whenever the version moves on (any worker or script
+    that changes alerts bumps it), or on every use if the state table is missing.
+    Changes made through this process's API are applied in place instead.
+    """
+
+    def __init__(self):
+        self._index: Optional[AlertIndex] = None
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> AlertIndex:
+        """Get the index, rebuilding it if alerts changed since it was built"""
+        version = get_alerts_version(db)
+        with self._lock:
+            if self._index is None or version is None or version != self._version:
+                self._index = load_alert_index(db)
+                self._version = version
+                logger.info(f"[AlertIndex] Indexed {len(self._index)} active alerts (version {version})")
+            return self._index
+
+    def update(self, version: Optional[int], add: Optional[AlertCriteria] = None, remove: Optional[int] = None):
+        """
+        Apply one alert change made at the given (just bumped) version
+
+        Applied in place when the index is exactly one version behind; otherwise
+        another worker changed alerts too, and the index is dropped to be rebuilt.
+        """
+        with self._lock:
+            if self._index is None:
+                return
+            if version is None or self._version is None or version != self._version + 1:
+                self._index = None
+                self._version = None
+                return
+            if remove is not None:
+                self._index.remove(remove)
+            if add is not None:
+                self._index.add(add)
+            self._version = version
+
+    def clear(self):
+        """Drop the index (rebuilt on next use)"""
+        with self._lock:
+            self._index = None
+            self._version = None
+
+
+# Shared instance used by the alert agent
+alert_indexes = SharedAlertIndex()
@@ -0,0 +1,68 @@
+"""
+Alert agent state shared by the API, the scheduler and the db_deploy scripts:
+the alert set version and the incremental run's high-water marks
+"""
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.db.schema import table_available
+from app.models.alert_agent_state import AlertAgentState
+
+
+def alert_state_available(db: Session) -> bool:
+    """Check that the alert_agent_state table exists"""
+    return table_available(db, AlertAgentState.__tablename__, "add_alert_agent_state_table.py")
+
+
+def get_alert_state(db: Session) -> Optional[AlertAgentState]:
+    """
+    Get the alert agent state row, creating it on first use
+
+    Returns:
+        State row, or None if the alert_agent_state table doesn't exist
+    """
+    if not alert_state_available(db):
+        return None
+
+    state = db.query(AlertAgentState).filter(AlertAgentState.id == 1).first()
+    if state is None:
+        state = AlertAgentState(id=1, alerts_version=0)
+        db.add(state)
+        db.flush()
+    return state
+
+
+def get_alerts_version(db: Session) -> Optional[int]:
+    """
+    Get the current alert set version
+
+    Returns:
+        Version number, or None if the alert_agent_state table doesn't exist
+    """
+    if not alert_state_available(db):
+        return None
+
+    version = db.query(AlertAgentState.alerts_version).filter(AlertAgentState.id == 1).scalar()
+    return version or 0
+
+
+def bump_alerts_version(db: Session) -> Optional[int]:
+    """
+    Increment the alert set version inside the caller's transaction
+    Call this before committing any change to alerts (create, delete, toggle).
+
+    Returns:
+        New version number, or None if the alert_agent_state table doesn't exist
+    """
+    if not alert_state_available(db):
+        return None
+
+    updated = db.query(AlertAgentState).filter(AlertAgentState.id == 1).update(
+        {AlertAgentState.alerts_version: AlertAgentState.alerts_version + 1},
+        synchronize_session=False
+    )
+    if not updated:
+        db.add(AlertAgentState(id=1, alerts_version=1))
+        db.flush()
+        return 1
+
+    return db.query(AlertAgentState.alerts_version).filter(AlertAgentState.id == 1).scalar()
@@ -0,0 +1,58 @@
+"""
+In-process cache of the per-car context documents used by the AI chat (RAG)
+"""
+import logging
+import threading
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class CarContextCache:
+    """
+    LRU cache of context documents keyed by car ID, each tagged with the version it was built at
+
+    The version combines the catalog version (car, specs and scores changes) with
+    the car's review stats version (review and AI summary changes); an entry is only
+    served while both still match.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[int, Tuple[Hashable, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, car_id: int, version: Hashable) -> Optional[str]:
+        """Get the cached context for a car if it was built at this version"""
+        with self._lock:
+            entry = self._entries.get(car_id)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                del self._entries[car_id]
+                return None
+            self._entries.move_to_end(car_id)
+            return entry[1]
+
+    def set(self, car_id: int, version: Hashable, context: str):
+        """Store a context built at the given version"""
+        with self._lock:
+            self._entries[car_id] = (version, context)
+            self._entries.move_to_end(car_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, car_id: int):
+        """Drop a car's cached context"""
+        with self._lock:
+            self._entries.pop(car_id, None)
+
+    def clear(self):
+        """Drop all cached contexts"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared instance used by the AI router
+car_contexts = CarContextCache()
@@ -0,0 +1,72 @@
+"""
+Catalog version counter shared by the API and the db_deploy scripts
+"""
+from datetime import datetime
+from typing import NamedTuple, Optional
+from sqlalchemy.orm import Session
+from app.db.schema import table_available
+from app.models.catalog_state import CatalogState
+
+
+def _catalog_table_available(db: Session) -> bool:
+    """Check that the catalog_state table exists"""
+    return table_available(db, CatalogState.__tablename__, "add_catalog_state_table.py")
+
+
+def get_catalog_version(db: Session) -> Optional[int]:
+    """
+    Get the current catalog version
+
+    Returns:
+        Version number, or None if the catalog_state table doesn't exist
+    """
+    if not _catalog_table_available(db):
+        return None
+
+    version = db.query(CatalogState.version).filter(CatalogState.id == 1).scalar()
+    return version or 0
+
+
+class CatalogStamp(NamedTuple):
+    """Catalog version and when it last changed (for HTTP validators)"""
+    version: int
+    updated_at: Optional[datetime] = None
+
+
+def get_catalog_stamp(db: Session) -> Optional[CatalogStamp]:
+    """
+    Get the current catalog version with its last-change time
+
+    Returns:
+        CatalogStamp, or None if the catalog_state table doesn't exist
+    """
+    if not _catalog_table_available(db):
+        return None
+
+    row = db.query(CatalogState.version, CatalogState.updated_at).filter(CatalogState.id == 1).first()
+    if row is None:
+        return CatalogStamp(version=0)
+    return CatalogStamp(version=row.version or 0, updated_at=row.updated_at)
+
+
+def bump_catalog_version(db: Session) -> Optional[int]:
+    """
+    Increment the catalog version inside the caller's transaction
+    Call this before committing any change to car listings.
+
+    Returns:
+        New version number, or None if the catalog_state table doesn't exist
+    """
+    if not _catalog_table_available(db):
+        return None
+
+    updated = db.query(CatalogState).filter(CatalogState.id == 1).update(
+        {CatalogState.version: CatalogState.version + 1},
+        synchronize_session=False
+    )
+    if not updated:
+        db.add(CatalogState(id=1, version=1))
+        db.flush()
+        return 1
+
+    return db.query(CatalogState.version).filter(CatalogState.id == 1).scalar()
@@ -62,7 +62,23 @@ class Settings(BaseSettings):
     # Database - Use absolute path to project root
     # Can be overridden with DATABASE_URL environment variable
     DATABASE_URL: str = os.environ.get('DATABASE_URL', f"sqlite:///{_db_path}")
-    
+
+    # Connection pool - connections kept open, extra ones allowed under load, seconds to wait
+    # for a free one, seconds before a connection is replaced (-1 = never), liveness check on checkout
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite connection pragmas - WAL lets reads proceed during writes; busy timeout in ms;
+    # cache_size in pages (negative = KiB); mmap_size in bytes (0 = off). Empty string skips a pragma.
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -65536
+    SQLITE_MMAP_SIZE: int = 268435456
+
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
@@ -87,6 +103,47 @@ class Settings(BaseSettings):
     
     # OpenAI (for future use)
     OPENAI_API_KEY: Optional[str] = None
+    # Alternative OpenAI-compatible endpoint, e.g. a local fake server for benchmarks (None = api.openai.com)
+    OPENAI_BASE_URL: Optional[str] = None
+    
+    # Async OpenAI client (AI routes) - max requests in flight per process, pooled connections, request timeout
+    OPENAI_MAX_CONCURRENCY: int = 8
+    OPENAI_MAX_CONNECTIONS: int = 20
+    OPENAI_TIMEOUT_SECONDS: float = 60.0
+    
+    # Embeddings provider: "openai", or "fake" for deterministic offline vectors (benchmarks/dev)
+    EMBEDDINGS_PROVIDER: str = "openai"
+    
+    # Embedding cache - reuse vectors for text that was already embedded (defaults to db_deploy/embedding_cache.db)
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: Optional[str] = None
+    
+    # Vector search - keep all car embeddings in an in-memory NumPy index (Chroma stays the persistent store)
+    VECTOR_INDEX_IN_MEMORY: bool = False
+    
+    # Alert agent - only check cars added/repriced since the last run (needs the alert_agent_state table)
+    ALERT_AGENT_INCREMENTAL: bool = True
+    
+    # HTTP response cache for catalog reads (makes, fuel types, car detail, listings) - max entries,
+    # seconds an entry lives; seconds the in-memory catalog version is trusted before re-reading it
+    # (writes in this process apply at once, other workers/scripts within this delay)
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 256
+    RESPONSE_CACHE_TTL_SECONDS: float = 300.0
+    CATALOG_VERSION_TTL_SECONDS: float = 2.0
+    
+    # Logging - level for all app modules, plus per-module overrides ("app.api.v1.cars=INFO,app.api.v1.auth=DEBUG")
+    LOG_LEVEL: str = "WARNING"
+    LOG_LEVELS: str = ""
+    
+    # Request metrics - per-route totals at /metrics (admin only); a sampled share of requests (0-1) also gets SQL
+    # statement count/time in a Server-Timing header; sampled requests with a statement this slow are logged
+    METRICS_ENABLED: bool = True
+    METRICS_SAMPLE_RATE: float = 0.1
+    METRICS_SLOW_QUERY_MS: Optional[float] = 500.0
+    
+    # Admin bulk ingest (POST /api/v1/cars/bulk) - largest request body accepted, in bytes (larger: 413)
+    INGEST_MAX_UPLOAD_BYTES: int = 512 * 1024 * 1024
     
     class Config:
         # Look for .env file in project root (one level up from backend/)
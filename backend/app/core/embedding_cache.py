@@ -0,0 +1,124 @@
+"""
+Persistent embedding cache keyed by a hash of the model name and exact input text
+Stored in a small SQLite file so cached vectors survive restarts and are shared
+by the API and the db_deploy scripts.
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Default location, next to the SQLite database and ChromaDB in db_deploy
+_base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+_project_root = os.path.dirname(_base_dir)
+_default_cache_path = os.path.join(_project_root, 'db_deploy', 'embedding_cache.db').replace('\\', '/')
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_BATCH_SIZE = 500
+
+
+def cache_key(model: str, text: str) -> str:
+    """Hash of model name + exact input text"""
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """SQLite-backed map of cache_key -> float32 vector, with hit/miss counters"""
+
+    def __init__(self, path: str = _default_cache_path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " dimensions INTEGER NOT NULL,"
+            " vector BLOB NOT NULL,"
+            " created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)"
+        )
+        self._conn.commit()
+        logger.info(f"[EmbeddingCache] Using {path}")
+
+    def get_many(self, model: str, texts: Sequence[str]) -> Dict[int, List[float]]:
+        """
+        Look up cached vectors for texts
+
+        Returns:
+            Mapping of position in texts -> vector, for the texts that were cached
+        """
+        keys = [cache_key(model, text) for text in texts]
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            unique = list(dict.fromkeys(keys))
+            for start in range(0, len(unique), _LOOKUP_BATCH_SIZE):
+                batch = unique[start:start + _LOOKUP_BATCH_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            result = {i: found[key] for i, key in enumerate(keys) if key in found}
+            self.hits += len(result)
+            self.misses += len(keys) - len(result)
+        return result
+
+    def set_many(self, model: str, texts: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        """Store vectors for texts"""
+        rows = []
+        for text, embedding in zip(texts, embeddings):
+            vector = np.asarray(embedding, dtype=np.float32)
+            rows.append((cache_key(model, text), model, len(vector), vector.tobytes()))
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dimensions, vector) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def count(self) -> int:
+        """Number of cached vectors"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self) -> Dict[str, float]:
+        """Hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": self.count()
+        }
+
+
+# Shared instance (one SQLite connection and one set of counters per process)
+_cache: Optional[EmbeddingCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache, or None if disabled/unavailable"""
+    global _cache
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            try:
+                _cache = EmbeddingCache(settings.EMBEDDING_CACHE_PATH or _default_cache_path)
+            except Exception as e:
+                logger.error(f"[EmbeddingCache] Failed to open cache, embeddings won't be cached: {e}")
+                return None
+        return _cache
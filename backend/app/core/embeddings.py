@@ -1,25 +1,188 @@
 """
 OpenAI embeddings service for generating car and text embeddings
 """
+import asyncio
+import hashlib
 import logging
-from typing import List, Optional
-from openai import OpenAI
+import time
+import weakref
+from types import SimpleNamespace
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+import httpx
+import numpy as np
+from openai import AsyncOpenAI, OpenAI
 from app.core.config import settings
+from app.core.embedding_cache import get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "text-embedding-3-small"  # Using small model for cost efficiency
+EMBEDDING_DIMENSIONS = 1536
+CHAT_MODEL = "gpt-3.5-turbo"
+
+# OpenAI embeddings request limits (inputs per request, and a conservative
+# character budget that stays under the per-request token limit)
+MAX_BATCH_INPUTS = 2048
+MAX_BATCH_CHARS = 600_000
+
+
+def build_car_text(
+    make: str,
+    model: str,
+    year: int,
+    description: Optional[str] = None,
+    fuel_type: Optional[str] = None,
+    transmission: Optional[str] = None
+) -> str:
+    """Create the text representation of a car that gets embedded"""
+    car_text = f"{year} {make} {model}"
+    
+    if fuel_type:
+        car_text += f" {fuel_type}"
+    if transmission:
+        car_text += f" {transmission}"
+    if description:
+        car_text += f". {description}"
+    
+    return car_text
+
+
+def chunk_texts(texts: List[str], max_inputs: int = MAX_BATCH_INPUTS, max_chars: int = MAX_BATCH_CHARS) -> List[List[str]]:
+    """Split texts into consecutive chunks that fit in one embeddings request"""
+    chunks = []
+    current: List[str] = []
+    current_chars = 0
+    for text in texts:
+        if current and (len(current) >= max_inputs or current_chars + len(text) > max_chars):
+            chunks.append(current)
+            current, current_chars = [], 0
+        current.append(text)
+        current_chars += len(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+class FakeEmbeddings:
+    """
+    Offline stand-in for client.embeddings (same create() signature)
+    Returns deterministic unit vectors derived from a hash of each input, after an
+    optional simulated per-request latency, so pipelines can be benchmarked without network.
+    """
+    
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS, latency_ms: float = 0.0):
+        self.dimensions = dimensions
+        self.latency_ms = latency_ms
+        self.requests = 0
+    
+    def create(self, model: str, input):
+        """Mimic openai.embeddings.create"""
+        self.requests += 1
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        return self._response(model, input)
+    
+    def _response(self, model: str, input):
+        """Build an embeddings response with one vector per input"""
+        texts = [input] if isinstance(input, str) else list(input)
+        data = []
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.sha256(f"{model}:{text}".encode("utf-8")).digest()[:8], "little")
+            vector = np.random.default_rng(seed).standard_normal(self.dimensions).astype(np.float32)
+            vector /= np.linalg.norm(vector)
+            data.append(SimpleNamespace(index=i, embedding=vector.tolist()))
+        return SimpleNamespace(data=data, model=model)
+
+
+class AsyncFakeEmbeddings(FakeEmbeddings):
+    """FakeEmbeddings with an awaitable create(), matching AsyncOpenAI().embeddings"""
+    
+    async def create(self, model: str, input):
+        """Mimic AsyncOpenAI().embeddings.create"""
+        self.requests += 1
+        if self.latency_ms:
+            await asyncio.sleep(self.latency_ms / 1000)
+        return self._response(model, input)
+
+
+def _split_cached(cache, model: str, texts: List[str]) -> Tuple[Dict[int, List[float]], List[int]]:
+    """Look texts up in the embedding cache; returns (position -> vector, positions still missing)"""
+    cached = cache.get_many(model, texts) if cache else {}
+    return cached, [i for i in range(len(texts)) if i not in cached]
+
+
+def _store_generated(cache, model: str, texts: List[str], embeddings: List[List[float]]):
+    """Write freshly generated vectors to the embedding cache"""
+    if not cache:
+        return
+    try:
+        cache.set_many(model, texts, embeddings)
+    except Exception as e:
+        logger.warning(f"[Embeddings] Failed to cache embeddings: {e}")
+
+
+def review_summary_messages(reviews: List[str], max_length: int = 200) -> List[dict]:
+    """Build the chat messages used to summarize a car's reviews"""
+    # Combine reviews
+    combined_reviews = "\n\n".join(reviews)
+    
+    # Limit total length to avoid token limits
+    if len(combined_reviews) > 3000:
+        combined_reviews = combined_reviews[:3000] + "..."
+    
+    # Create prompt
+    prompt = f"""Summarize the following car reviews in a concise way. 
+Focus on common themes, pros, cons, and overall sentiment.
+Keep the summary under {max_length} words.
+
+IMPORTANT: Do NOT mention:
+- Individual ratings (like "5/5", "4 stars", etc.)
+- Number of reviewers
+- Individual reviewer opinions (like "one reviewer said", "another user gave")
+- Rating statistics (like "both reviewers gave it 5/5")
+- Any specific rating numbers
+
+Just provide a clean, general summary of the reviews focusing on the car's features, performance, and overall experience.
+
+Reviews:
+{combined_reviews}
+
+Summary:"""
+    
+    return [
+        {"role": "system", "content": "You are a helpful assistant that summarizes car reviews. You provide clean, general summaries without mentioning individual ratings, reviewer counts, or specific rating numbers."},
+        {"role": "user", "content": prompt}
+    ]
+
 
 class EmbeddingsService:
     """Service for generating embeddings using OpenAI"""
     
-    def __init__(self):
-        """Initialize OpenAI client"""
+    def __init__(self, provider: Optional[str] = None, fake_latency_ms: float = 0.0):
+        """
+        Initialize OpenAI client
+        
+        Args:
+            provider: "openai" or "fake" (defaults to settings.EMBEDDINGS_PROVIDER)
+            fake_latency_ms: Simulated per-request latency for the fake provider
+        """
+        provider = provider or settings.EMBEDDINGS_PROVIDER
+        self.embeddings_client = None
+        self.cache = get_embedding_cache()
+        # Fake vectors must never be served in place of real ones
+        self.cache_model = f"fake:{EMBEDDING_MODEL}" if provider == "fake" else EMBEDDING_MODEL
+        
         if not settings.OPENAI_API_KEY:
             logger.warning("[Embeddings] OpenAI API key not set. Embeddings will not work.")
             self.client = None
         else:
-            self.client = OpenAI(api_key=settings.OPENAI_API_KEY)
+            self.client = OpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+            self.embeddings_client = self.client.embeddings
             logger.info("[Embeddings] OpenAI client initialized")
+        
+        if provider == "fake":
+            self.embeddings_client = FakeEmbeddings(latency_ms=fake_latency_ms)
+            logger.info("[Embeddings] Using fake local embeddings provider")
     
     def generate_car_embedding(
         self,
@@ -44,28 +207,16 @@ class EmbeddingsService:
         Returns:
             Embedding vector or None if failed
         """
-        if not self.client:
+        if not self.embeddings_client:
             logger.error("[Embeddings] OpenAI client not available")
             return None
         
         try:
             # Create text representation of car
-            car_text = f"{year} {make} {model}"
-            
-            if fuel_type:
-                car_text += f" {fuel_type}"
-            if transmission:
-                car_text += f" {transmission}"
-            if description:
-                car_text += f". {description}"
+            car_text = build_car_text(make, model, year, description, fuel_type, transmission)
             
             # Generate embedding
-            response = self.client.embeddings.create(
-                model="text-embedding-3-small",  # Using small model for cost efficiency
-                input=car_text
-            )
-            
-            embedding = response.data[0].embedding
+            embedding = self._embed([car_text])[0]
             logger.info(f"[Embeddings] Generated embedding for {car_text}")
             return embedding
         except Exception as e:
@@ -82,23 +233,66 @@ class EmbeddingsService:
         Returns:
             Embedding vector or None if failed
         """
-        if not self.client:
+        if not self.embeddings_client:
             logger.error("[Embeddings] OpenAI client not available")
             return None
         
         try:
-            response = self.client.embeddings.create(
-                model="text-embedding-3-small",
-                input=text
-            )
-            
-            embedding = response.data[0].embedding
+            embedding = self._embed([text])[0]
             logger.info(f"[Embeddings] Generated text embedding (length: {len(text)} chars)")
             return embedding
         except Exception as e:
             logger.error(f"[Embeddings] Failed to generate text embedding: {e}")
             return None
     
+    def generate_embeddings(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """
+        Generate embeddings for many texts, using as few requests as the provider limits allow
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Embeddings in the same order as texts, or None if any request failed
+        """
+        if not self.embeddings_client:
+            logger.error("[Embeddings] OpenAI client not available")
+            return None
+        
+        if not texts:
+            return []
+        
+        try:
+            embeddings = self._embed(texts)
+            logger.info(f"[Embeddings] Generated {len(embeddings)} embeddings in batch")
+            return embeddings
+        except Exception as e:
+            logger.error(f"[Embeddings] Failed to generate batch embeddings: {e}")
+            return None
+    
+    def _embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, serving cached vectors and only sending cache misses to the provider
+        Raises on provider errors.
+        """
+        cached, missing = _split_cached(self.cache, self.cache_model, texts)
+        
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            generated: List[List[float]] = []
+            for chunk in chunk_texts(missing_texts):
+                response = self.embeddings_client.create(
+                    model=EMBEDDING_MODEL,
+                    input=chunk
+                )
+                # Results carry their input index; don't rely on response order
+                generated.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+            
+            _store_generated(self.cache, self.cache_model, missing_texts, generated)
+            cached.update(zip(missing, generated))
+        
+        return [cached[i] for i in range(len(texts))]
+    
     def summarize_reviews(self, reviews: List[str], max_length: int = 200) -> Optional[str]:
         """
         Summarize multiple reviews using OpenAI
@@ -118,39 +312,10 @@ class EmbeddingsService:
             return None
         
         try:
-            # Combine reviews
-            combined_reviews = "\n\n".join(reviews)
-            
-            # Limit total length to avoid token limits
-            if len(combined_reviews) > 3000:
-                combined_reviews = combined_reviews[:3000] + "..."
-            
-            # Create prompt
-            prompt = f"""Summarize the following car reviews in a concise way. 
-Focus on common themes, pros, cons, and overall sentiment.
-Keep the summary under {max_length} words.
-
-IMPORTANT: Do NOT mention:
-- Individual ratings (like "5/5", "4 stars", etc.)
-- Number of reviewers
-- Individual reviewer opinions (like "one reviewer said", "another user gave")
-- Rating statistics (like "both reviewers gave it 5/5")
-- Any specific rating numbers
-
-Just provide a clean, general summary of the reviews focusing on the car's features, performance, and overall experience.
-
-Reviews:
-{combined_reviews}
-
-Summary:"""
-            
             # Generate summary
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that summarizes car reviews. You provide clean, general summaries without mentioning individual ratings, reviewer counts, or specific rating numbers."},
-                    {"role": "user", "content": prompt}
-                ],
+                model=CHAT_MODEL,
+                messages=review_summary_messages(reviews, max_length),
                 max_tokens=max_length * 2,  # Rough estimate
                 temperature=0.7
             )
@@ -162,3 +327,201 @@ Summary:"""
             logger.error(f"[Embeddings] Failed to summarize reviews: {e}")
             return None
 
+
+
+# One AsyncOpenAI client (and so one HTTP connection pool) per process, shared by
+# every AsyncEmbeddingsService, and one concurrency limit per event loop
+_async_client: Optional[AsyncOpenAI] = None
+_openai_limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+
+def _openai_limiter() -> asyncio.Semaphore:
+    """
+    Get the running event loop's OPENAI_MAX_CONCURRENCY semaphore
+    Created lazily: a Semaphore binds to the first loop that waits on it, and scripts
+    may run several loops (asyncio.run) in one process.
+    """
+    loop = asyncio.get_running_loop()
+    limiter = _openai_limiters.get(loop)
+    if limiter is None:
+        limiter = _openai_limiters[loop] = asyncio.Semaphore(settings.OPENAI_MAX_CONCURRENCY)
+    return limiter
+
+
+def get_async_openai_client() -> Optional[AsyncOpenAI]:
+    """Get the shared AsyncOpenAI client, or None if no API key is configured"""
+    global _async_client
+    if _async_client is None and settings.OPENAI_API_KEY:
+        _async_client = AsyncOpenAI(
+            api_key=settings.OPENAI_API_KEY,
+            base_url=settings.OPENAI_BASE_URL,
+            timeout=settings.OPENAI_TIMEOUT_SECONDS,
+            http_client=httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=settings.OPENAI_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.OPENAI_MAX_CONNECTIONS
+                ),
+                timeout=settings.OPENAI_TIMEOUT_SECONDS
+            )
+        )
+        logger.info("[Embeddings] Async OpenAI client initialized")
+    return _async_client
+
+
+class AsyncEmbeddingsService:
+    """
+    Async counterpart of EmbeddingsService for async routes
+    Calls run on the event loop instead of a worker thread, and at most
+    OPENAI_MAX_CONCURRENCY requests are in flight per process.
+    """
+    
+    def __init__(self, provider: Optional[str] = None, fake_latency_ms: float = 0.0):
+        """
+        Args:
+            provider: "openai" or "fake" (defaults to settings.EMBEDDINGS_PROVIDER)
+            fake_latency_ms: Simulated per-request latency for the fake provider
+        """
+        provider = provider or settings.EMBEDDINGS_PROVIDER
+        self.client = get_async_openai_client()
+        self.embeddings_client = self.client.embeddings if self.client else None
+        self.cache = get_embedding_cache()
+        self.cache_model = f"fake:{EMBEDDING_MODEL}" if provider == "fake" else EMBEDDING_MODEL
+        
+        if provider == "fake":
+            self.embeddings_client = AsyncFakeEmbeddings(latency_ms=fake_latency_ms)
+    
+    async def generate_car_embedding(
+        self,
+        make: str,
+        model: str,
+        year: int,
+        description: Optional[str] = None,
+        fuel_type: Optional[str] = None,
+        transmission: Optional[str] = None
+    ) -> Optional[List[float]]:
+        """Generate embedding for a car based on its attributes (see EmbeddingsService)"""
+        if not self.embeddings_client:
+            logger.error("[Embeddings] OpenAI client not available")
+            return None
+        
+        try:
+            car_text = build_car_text(make, model, year, description, fuel_type, transmission)
+            embedding = (await self._embed([car_text]))[0]
+            logger.info(f"[Embeddings] Generated embedding for {car_text}")
+            return embedding
+        except Exception as e:
+            logger.error(f"[Embeddings] Failed to generate car embedding: {e}")
+            return None
+    
+    async def generate_text_embedding(self, text: str) -> Optional[List[float]]:
+        """Generate embedding for arbitrary text"""
+        if not self.embeddings_client:
+            logger.error("[Embeddings] OpenAI client not available")
+            return None
+        
+        try:
+            embedding = (await self._embed([text]))[0]
+            logger.info(f"[Embeddings] Generated text embedding (length: {len(text)} chars)")
+            return embedding
+        except Exception as e:
+            logger.error(f"[Embeddings] Failed to generate text embedding: {e}")
+            return None
+    
+    async def generate_embeddings(self, texts: List[str]) -> Optional[List[List[float]]]:
+        """Generate embeddings for many texts, in the same order as texts"""
+        if not self.embeddings_client:
+            logger.error("[Embeddings] OpenAI client not available")
+            return None
+        
+        if not texts:
+            return []
+        
+        try:
+            embeddings = await self._embed(texts)
+            logger.info(f"[Embeddings] Generated {len(embeddings)} embeddings in batch")
+            return embeddings
+        except Exception as e:
+            logger.error(f"[Embeddings] Failed to generate batch embeddings: {e}")
+            return None
+    
+    async def _embed(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts, serving cached vectors and only sending cache misses to the provider
+        The SQLite cache is read and written in a worker thread, off the event loop.
+        """
+        cached, missing = await asyncio.to_thread(_split_cached, self.cache, self.cache_model, texts)
+        
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            generated: List[List[float]] = []
+            for chunk in chunk_texts(missing_texts):
+                async with _openai_limiter():
+                    response = await self.embeddings_client.create(
+                        model=EMBEDDING_MODEL,
+                        input=chunk
+                    )
+                generated.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+            
+            await asyncio.to_thread(_store_generated, self.cache, self.cache_model, missing_texts, generated)
+            cached.update(zip(missing, generated))
+        
+        return [cached[i] for i in range(len(texts))]
+    
+    async def chat(self, messages: List[dict], max_tokens: int = 300, temperature: float = 0.7) -> str:
+        """
+        Get a chat completion
+        
+        Returns:
+            The reply text (raises on failure)
+        """
+        async with _openai_limiter():
+            response = await self.client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature
+            )
+        return response.choices[0].message.content.strip()
+    
+    async def chat_stream(
+        self,
+        messages: List[dict],
+        max_tokens: int = 300,
+        temperature: float = 0.7
+    ) -> AsyncIterator[str]:
+        """
+        Stream a chat completion, yielding text deltas as they arrive
+        Holds a concurrency slot until the stream finishes or is closed, so callers
+        should aclose() it when they stop early (raises on failure).
+        """
+        async with _openai_limiter():
+            stream = await self.client.chat.completions.create(
+                model=CHAT_MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+    
+    async def summarize_reviews(self, reviews: List[str], max_length: int = 200) -> Optional[str]:
+        """Summarize multiple reviews (see EmbeddingsService.summarize_reviews)"""
+        if not self.client:
+            logger.error("[Embeddings] OpenAI client not available")
+            return None
+        
+        if not reviews:
+            return None
+        
+        try:
+            summary = await self.chat(
+                review_summary_messages(reviews, max_length),
+                max_tokens=max_length * 2  # Rough estimate
+            )
+            logger.info(f"[Embeddings] Generated review summary ({len(summary)} chars)")
+            return summary
+        except Exception as e:
+            logger.error(f"[Embeddings] Failed to summarize reviews: {e}")
+            return None
@@ -0,0 +1,140 @@
+"""
+Streaming inventory export: cars (optionally with specs and scores) as NDJSON or CSV
+
+Rows are read as plain column tuples (no ORM objects) through a server-side cursor,
+EXPORT_CHUNK_ROWS at a time, and each chunk is encoded (and gzip-compressed, if
+asked) before the next is fetched, so memory stays flat however large the inventory.
+The output uses the same shape ingest_cars reads: NDJSON objects with nested "specs"
+and "scores", CSV columns "specs.<field>" / "scores.<field>".
+"""
+import csv
+import io
+import json
+import logging
+import zlib
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List
+from sqlalchemy import select
+from app.models import Car, CarScore, CarSpec
+from app.schemas.car import CarBase, CarScoreBase, CarSpecBase
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Rows fetched, encoded and sent per chunk
+EXPORT_CHUNK_ROWS = 1000
+
+CAR_FIELDS = ["id", *CarBase.model_fields, "is_available", "created_at", "updated_at"]
+DETAIL_FIELDS = {"specs": list(CarSpecBase.model_fields), "scores": list(CarScoreBase.model_fields)}
+_DETAIL_MODELS = {"specs": CarSpec, "scores": CarScore}
+
+
+def export_query(include_details: bool = True, available_only: bool = True):
+    """Core select of the exported columns, in id order (detail columns labelled group.field)"""
+    columns = [getattr(Car, field) for field in CAR_FIELDS]
+    query = select(*columns)
+    if include_details:
+        for group, fields in DETAIL_FIELDS.items():
+            model = _DETAIL_MODELS[group]
+            # The detail row's id tells "no specs" apart from "specs with all fields empty"
+            columns = [model.id.label(f"{group}.id")] + [getattr(model, f).label(f"{group}.{f}") for f in fields]
+            query = query.add_columns(*columns).outerjoin(model, model.car_id == Car.id)
+    if available_only:
+        query = query.where(Car.is_available == True)
+    return query.order_by(Car.id)
+
+
+def _json_default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _record(row, include_details: bool) -> Dict[str, Any]:
+    """Nested NDJSON record from one result row"""
+    mapping = row._mapping
+    record = {field: mapping[field] for field in CAR_FIELDS}
+    if include_details:
+        for group, fields in DETAIL_FIELDS.items():
+            if mapping[f"{group}.id"] is None:
+                record[group] = None
+            else:
+                record[group] = {field: mapping[f"{group}.{field}"] for field in fields}
+    return record
+
+
+def _csv_header(include_details: bool) -> List[str]:
+    header = list(CAR_FIELDS)
+    if include_details:
+        for group, fields in DETAIL_FIELDS.items():
+            header += [f"{group}.{field}" for field in fields]
+    return header
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        # "|"-separated, as ingest_cars reads it, unless a value contains "|"
+        return json.dumps(value) if any("|" in str(item) for item in value) else "|".join(map(str, value))
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _encode_chunks(rows_in_chunks: Iterator[list], fmt: str, include_details: bool) -> Iterator[str]:
+    if fmt == "ndjson":
+        for rows in rows_in_chunks:
+            yield "".join(
+                json.dumps(_record(row, include_details), default=_json_default) + "\n" for row in rows
+            )
+        return
+
+    header = _csv_header(include_details)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for rows in rows_in_chunks:
+        writer.writerows([_csv_value(row._mapping[column]) for column in header] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def stream_export(
+    session_factory,
+    fmt: str = "ndjson",
+    include_details: bool = True,
+    available_only: bool = True,
+    compress: bool = False
+) -> Iterator[bytes]:
+    """
+    Yield the export body chunk by chunk (for a StreamingResponse)
+
+    Args:
+        session_factory: Creates the Session to read with (the export outlives the request's own)
+        fmt: "ndjson" or "csv"
+        compress: gzip the output (send with Content-Encoding: gzip)
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r} (expected one of {', '.join(EXPORT_FORMATS)})")
+
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip container
+    db = session_factory()
+    try:
+        query = export_query(include_details, available_only).execution_options(yield_per=EXPORT_CHUNK_ROWS)
+        for text in _encode_chunks(db.execute(query).partitions(), fmt, include_details):
+            data = text.encode("utf-8")
+            if compressor is not None:
+                data = compressor.compress(data)
+            if data:
+                yield data
+        if compressor is not None:
+            yield compressor.flush()
+        logger.info("[Export] %s export finished (gzip=%s)", fmt, compress)
+    finally:
+        db.close()
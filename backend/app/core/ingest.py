@@ -0,0 +1,288 @@
+"""
+Bulk car ingestion: NDJSON/CSV streams written in large batched transactions
+
+Records are validated with CarIngestRecord and written batch_size at a time, one
+transaction per batch: new cars go in with multi-row INSERTs (ids come back via
+RETURNING and are matched on VIN), cars whose VIN already exists are updated in place with one executemany,
+specs, scores and PriceHistory rows (every new car, every changed price) are inserted
+in bulk, and the catalog version is bumped once per batch. Within a batch the last
+record for a VIN wins.
+
+NDJSON records use the seed_data.py shape (nested "specs" and "scores" objects); CSV
+columns are the car fields plus "specs.<field>" / "scores.<field>", empty cells are
+treated as missing and image_urls is a JSON list or "|"-separated.
+"""
+import csv
+import json
+import logging
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.core.catalog import bump_catalog_version
+from app.models import Car, CarScore, CarSpec, PriceHistory
+from app.schemas.car import CarIngestRecord
+
+logger = logging.getLogger(__name__)
+
+INGEST_FORMATS = ("ndjson", "csv")
+DEFAULT_BATCH_SIZE = 5000
+
+# Only the first few bad records are reported back in full
+MAX_REPORTED_ERRORS = 20
+
+# Columns the full-text search index covers (app.core.search triggers)
+SEARCHED_COLUMNS = (Car.make, Car.model, Car.description)
+
+
+class IngestError(ValueError):
+    """A record that can't be parsed or validated"""
+
+
+class IngestResult:
+    """Running totals of an ingestion"""
+
+    __slots__ = ("received", "inserted", "updated", "failed", "errors", "changed_car_ids", "started")
+
+    def __init__(self):
+        self.received = 0
+        self.inserted = 0
+        self.updated = 0
+        self.failed = 0
+        self.errors: List[str] = []
+        self.changed_car_ids: List[int] = []  # New and repriced cars, for alert matching
+        self.started = time.perf_counter()
+
+    def error(self, message: str, records: int = 1):
+        self.failed += records
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    @property
+    def seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals and throughput (CarIngestResponse fields)"""
+        seconds = self.seconds
+        written = self.inserted + self.updated
+        return {
+            "received": self.received,
+            "inserted": self.inserted,
+            "updated": self.updated,
+            "failed": self.failed,
+            "errors": self.errors,
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(written / seconds, 1) if seconds > 0 else 0.0,
+        }
+
+
+def _csv_record(row: Dict[str, str]) -> Dict[str, Any]:
+    """Turn a flat CSV row into the nested NDJSON shape"""
+    record: Dict[str, Any] = {}
+    for column, value in row.items():
+        if column is None or value is None or value.strip() == "":
+            continue
+        value = value.strip()
+        if column == "image_urls":
+            value = json.loads(value) if value.startswith("[") else value.split("|")
+        group, _, name = column.partition(".")
+        if name:
+            record.setdefault(group, {})[name] = value
+        else:
+            record[column] = value
+    return record
+
+
+def parse_records(lines: Iterable[str], fmt: str = "ndjson") -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Yield (line number, raw record) pairs from an NDJSON or CSV stream
+    Unparseable lines are yielded as (line number, IngestError) so the caller can count them.
+    """
+    if fmt not in INGEST_FORMATS:
+        raise ValueError(f"Unknown ingest format {fmt!r} (expected one of {', '.join(INGEST_FORMATS)})")
+
+    if fmt == "csv":
+        reader = csv.DictReader(lines)
+        for row in reader:
+            try:
+                yield reader.line_num, _csv_record(row)
+            except ValueError as e:
+                yield reader.line_num, IngestError(f"invalid image_urls: {e}")
+        return
+
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield line_number, IngestError(f"invalid JSON: {e}")
+            continue
+        if not isinstance(record, dict):
+            yield line_number, IngestError("expected a JSON object")
+            continue
+        yield line_number, record
+
+
+def _validate(record: Any) -> CarIngestRecord:
+    if isinstance(record, IngestError):
+        raise record
+    try:
+        return CarIngestRecord.model_validate(record)
+    except ValidationError as e:
+        problems = "; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()[:3]
+        )
+        raise IngestError(problems) from None
+
+
+def _write_batch(db: Session, records: List[CarIngestRecord]) -> Tuple[int, int, List[int]]:
+    """
+    Insert or update one batch of cars in the caller's transaction
+    Inserts are Core statements on the tables (executemany, no ORM bookkeeping per row).
+
+    Returns:
+        (inserted, updated, ids of new and repriced cars)
+    """
+    by_vin: Dict[str, CarIngestRecord] = {}
+    new_records: List[CarIngestRecord] = []
+    for record in records:
+        if record.vin:
+            by_vin[record.vin] = record
+        else:
+            new_records.append(record)
+
+    existing: Dict[str, Any] = {}
+    if by_vin:
+        rows = db.execute(
+            select(Car.id, Car.vin, Car.price, *SEARCHED_COLUMNS).where(Car.vin.in_(list(by_vin)))
+        )
+        existing = {row.vin: row for row in rows}
+    new_records += [record for vin, record in by_vin.items() if vin not in existing]
+
+    def car_row(record: CarIngestRecord, **options) -> Dict[str, Any]:
+        return record.model_dump(exclude={"specs", "scores"}, **options)
+
+    # New cars are matched to their ids by VIN, so the INSERT can be batched with RETURNING
+    # in any order; only cars without a VIN need ordered RETURNING (one row per statement on SQLite)
+    new_ids: List[int] = []
+    with_vin = [record for record in new_records if record.vin]
+    if with_vin:
+        ids_by_vin = dict(db.execute(
+            insert(Car.__table__).returning(Car.vin, Car.id),
+            [car_row(record) for record in with_vin]
+        ).all())
+        new_ids += [ids_by_vin[record.vin] for record in with_vin]
+    without_vin = [record for record in new_records if not record.vin]
+    if without_vin:
+        new_ids += db.scalars(
+            insert(Car.__table__).returning(Car.id, sort_by_parameter_order=True),
+            [car_row(record) for record in without_vin]
+        ).all()
+    new_records = with_vin + without_vin
+
+    def update_row(record: CarIngestRecord) -> Dict[str, Any]:
+        # Fields a record leaves out keep their current values; unchanged searched text
+        # is left out of the SET so the search index trigger doesn't re-index the car
+        row = car_row(record, exclude_unset=True)
+        current = existing[record.vin]
+        for column in SEARCHED_COLUMNS:
+            if column.key in row and row[column.key] == getattr(current, column.key):
+                del row[column.key]
+        return {"id": current.id, **row}
+
+    updated = [(existing[vin].id, record) for vin, record in by_vin.items() if vin in existing]
+    if updated:
+        db.execute(update(Car), [update_row(record) for _, record in updated])
+
+    # Specs and scores of updated cars are replaced when the record carries them
+    written = list(zip(new_ids, new_records)) + updated
+    for model, field in ((CarSpec, "specs"), (CarScore, "scores")):
+        replaced = [car_id for car_id, record in updated if getattr(record, field) is not None]
+        if replaced:
+            db.execute(delete(model).where(model.car_id.in_(replaced)))
+        rows = [
+            {"car_id": car_id, **getattr(record, field).model_dump()}
+            for car_id, record in written
+            if getattr(record, field) is not None
+        ]
+        if rows:
+            db.execute(insert(model.__table__), rows)
+
+    repriced = [car_id for car_id, record in updated if record.price != existing[record.vin].price]
+    changed = new_ids + repriced
+    prices = {car_id: record.price for car_id, record in written}
+    if changed:
+        db.execute(insert(PriceHistory.__table__), [{"car_id": car_id, "price": prices[car_id]} for car_id in changed])
+
+    return len(new_ids), len(updated), changed
+
+
+def ingest_cars(
+    db: Session,
+    lines: Iterable[str],
+    fmt: str = "ndjson",
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_changed_ids: Optional[int] = None,
+    on_batch=None
+) -> IngestResult:
+    """
+    Validate and write a stream of cars, committing every batch_size valid records
+
+    Args:
+        lines: NDJSON or CSV text, line by line (a file object works)
+        fmt: "ndjson" or "csv"
+        max_changed_ids: Collect at most this many changed car ids, plus one (None: collect all)
+        on_batch: Called with the running IngestResult after each batch (progress reporting)
+
+    Returns:
+        IngestResult; invalid records and failed batches are counted, not raised
+    """
+    result = IngestResult()
+    batch: List[CarIngestRecord] = []
+    batch_start = None
+
+    def flush():
+        try:
+            inserted, updated, changed = _write_batch(db, batch)
+            bump_catalog_version(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error("[Ingest] Batch starting at line %s failed: %s", batch_start, e)
+            result.error(f"batch starting at line {batch_start}: {e}", records=len(batch))
+        else:
+            result.inserted += inserted
+            result.updated += updated
+            if max_changed_ids is None:
+                result.changed_car_ids += changed
+            else:
+                # One past the limit, so the caller can tell it was exceeded
+                room = max_changed_ids + 1 - len(result.changed_car_ids)
+                result.changed_car_ids += changed[:max(room, 0)]
+            logger.debug("[Ingest] Batch at line %s: %s inserted, %s updated", batch_start, inserted, updated)
+        batch.clear()
+        if on_batch is not None:
+            on_batch(result)
+
+    for line_number, record in parse_records(lines, fmt):
+        result.received += 1
+        try:
+            batch.append(_validate(record))
+        except IngestError as e:
+            result.error(f"line {line_number}: {e}")
+            continue
+        if len(batch) == 1:
+            batch_start = line_number
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    logger.info(
+        "[Ingest] %s records: %s inserted, %s updated, %s failed in %.1fs",
+        result.received, result.inserted, result.updated, result.failed, result.seconds
+    )
+    return result
@@ -0,0 +1,214 @@
+"""
+In-process cache of listing totals and facet counts, keyed by normalized filters
+"""
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Dict, NamedTuple, Optional
+from app.core.search import search_terms
+
+logger = logging.getLogger(__name__)
+
+# Columns the listing page can show per-value counts for
+FACET_FIELDS = ("make", "fuel_type", "transmission", "condition")
+
+
+def _fold(value: Optional[str]) -> str:
+    """Casefold and strip accents, like the full-text tokenizer (unicode61 remove_diacritics 2)"""
+    decomposed = unicodedata.normalize("NFKD", value or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+class ListingFilters(NamedTuple):
+    """Normalized get_cars filters (cache key)"""
+    make: Optional[str] = None
+    model: Optional[str] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    fuel_type: Optional[str] = None
+    transmission: Optional[str] = None
+    condition: Optional[str] = None
+    search: Optional[str] = None
+
+    def matches(self, car: Dict[str, Any]) -> bool:
+        """
+        Check whether a car (as a dict of column values) falls under these filters
+        Errs on the side of True when a LIKE pattern can't be evaluated exactly. Text is
+        compared accent- and case-folded, which matches at least everything the search does.
+        """
+        if not car.get("is_available"):
+            return False
+
+        def like(term: Optional[str], *values: Optional[str]) -> bool:
+            if term is None or "%" in term or "_" in term:
+                return True
+            term = _fold(term)
+            return any(term in _fold(v) for v in values)
+
+        if not like(self.make, car.get("make")):
+            return False
+        if not like(self.model, car.get("model")):
+            return False
+        if self.search is not None:
+            texts = [car.get("make"), car.get("model"), car.get("description")]
+            # ILIKE matches the whole term; the full-text index matches each word as a prefix
+            folded = [_fold(v) for v in texts]
+            words_match = all(
+                any(_fold(term) in v for v in folded)
+                for term in search_terms(self.search)
+            )
+            if not (like(self.search, *texts) or words_match):
+                return False
+        if self.min_year is not None and car["year"] < self.min_year:
+            return False
+        if self.max_year is not None and car["year"] > self.max_year:
+            return False
+        if self.min_price is not None and car["price"] < self.min_price:
+            return False
+        if self.max_price is not None and car["price"] > self.max_price:
+            return False
+        for field in ("fuel_type", "transmission", "condition"):
+            value = getattr(self, field)
+            if value is not None and car.get(field) != value:
+                return False
+        return True
+
+
+class ListingCounts(NamedTuple):
+    """Cached total (and optional per-facet counts) for one filter combination"""
+    total: int
+    facets: Optional[Dict[str, Dict[str, int]]] = None
+
+
+def normalize_filters(**filters) -> ListingFilters:
+    """
+    Build a cache key from raw get_cars query params
+    Falsy values are dropped (get_cars ignores them) and ILIKE terms are lowercased.
+    """
+    def text(value: Optional[str], fold: bool = False) -> Optional[str]:
+        value = (value or "").strip()
+        if not value:
+            return None
+        return value.lower() if fold else value
+
+    return ListingFilters(
+        make=text(filters.get("make"), fold=True),
+        model=text(filters.get("model"), fold=True),
+        min_year=filters.get("min_year") or None,
+        max_year=filters.get("max_year") or None,
+        min_price=filters.get("min_price") or None,
+        max_price=filters.get("max_price") or None,
+        fuel_type=text(filters.get("fuel_type")),
+        transmission=text(filters.get("transmission")),
+        condition=text(filters.get("condition")),
+        search=text(filters.get("search"), fold=True),
+    )
+
+
+def car_snapshot(car) -> Dict[str, Any]:
+    """Capture the columns the listing filters look at (call before deleting/updating)"""
+    return {
+        "make": car.make,
+        "model": car.model,
+        "year": car.year,
+        "price": car.price,
+        "fuel_type": car.fuel_type,
+        "transmission": car.transmission,
+        "condition": car.condition,
+        "description": car.description,
+        "is_available": car.is_available,
+    }
+
+
+class ListingCountCache:
+    """
+    LRU cache of ListingCounts tagged with the catalog version they were computed at
+
+    Writes made through the API invalidate only the entries they affect; any other
+    version change (another worker, a db_deploy script) flushes the cache.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[ListingFilters, ListingCounts]" = OrderedDict()
+        self._version: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def _sync(self, version: Optional[int]) -> bool:
+        """Flush if the catalog moved on without us; returns whether the cache is usable"""
+        if version is None:
+            self._entries.clear()
+            self._version = None
+            return False
+        if version != self._version:
+            if self._entries:
+                logger.debug("[ListingCache] Catalog version %s -> %s, flushing", self._version, version)
+            self._entries.clear()
+            self._version = version
+        return True
+
+    def get(self, filters: ListingFilters, version: Optional[int]) -> Optional[ListingCounts]:
+        """Get cached counts for filters at the given catalog version"""
+        with self._lock:
+            if not self._sync(version):
+                return None
+            counts = self._entries.get(filters)
+            if counts is not None:
+                self._entries.move_to_end(filters)
+            return counts
+
+    def set(self, filters: ListingFilters, version: Optional[int], counts: ListingCounts):
+        """Store counts computed at the given catalog version"""
+        with self._lock:
+            # Counts computed against an older version may already be stale
+            if version is None or version != self._version:
+                return
+            self._entries[filters] = counts
+            self._entries.move_to_end(filters)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _apply_write(self, new_version: Optional[int], affected) -> int:
+        """Drop entries for which affected(filters) is True and advance to new_version"""
+        with self._lock:
+            if new_version is None or self._version is None or new_version != self._version + 1:
+                # Missed another writer's bump - nothing cached can be trusted
+                self._entries.clear()
+                self._version = None
+                return 0
+            stale = [key for key in self._entries if affected(key)]
+            for key in stale:
+                del self._entries[key]
+            self._version = new_version
+            return len(stale)
+
+    def invalidate_car(self, car: Dict[str, Any], new_version: Optional[int]):
+        """Invalidate entries that counted a car that was added or removed"""
+        dropped = self._apply_write(new_version, lambda f: f.matches(car))
+        logger.debug("[ListingCache] Car change invalidated %s entries", dropped)
+
+    def invalidate_price_change(
+        self,
+        car: Dict[str, Any],
+        old_price: float,
+        new_price: float,
+        new_version: Optional[int]
+    ):
+        """Invalidate entries whose membership changes when a car's price moves"""
+        before = dict(car, price=old_price)
+        after = dict(car, price=new_price)
+        dropped = self._apply_write(new_version, lambda f: f.matches(before) != f.matches(after))
+        logger.debug("[ListingCache] Price change invalidated %s entries", dropped)
+
+    def clear(self):
+        """Drop all cached counts"""
+        with self._lock:
+            self._entries.clear()
+            self._version = None
+
+
+# Shared instance used by the cars router
+listing_counts = ListingCountCache()
@@ -0,0 +1,123 @@
+"""
+Logging setup for the app: levels from Settings and request-id correlation
+
+All app modules log through logging.getLogger(__name__), i.e. under the "app"
+logger. configure_logging gives that tree one handler, the level from LOG_LEVEL
+and per-module overrides from LOG_LEVELS, so discarded messages cost a level check
+(log calls pass arguments lazily, %-style, instead of pre-formatted f-strings).
+RequestIdMiddleware tags each request with an id (the client's X-Request-ID, or a
+generated one) that is added to every log line and echoed in the response.
+"""
+import logging
+import re
+import uuid
+from contextvars import ContextVar
+from typing import Dict
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+REQUEST_ID_HEADER = "X-Request-ID"
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+
+# Client-supplied ids are reused only if short and free of characters that could forge log lines
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+_request_id: ContextVar[str] = ContextVar("request_id", default="-")
+
+
+def current_request_id() -> str:
+    """Id of the request being served ("-" outside a request)"""
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Add the current request id to log records as %(request_id)s"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+def parse_module_levels(value: str) -> Dict[str, int]:
+    """
+    Parse LOG_LEVELS ("app.api.v1.cars=DEBUG,app.core.scheduler=INFO") into {logger name: level}
+    Malformed entries are skipped with a warning.
+    """
+    levels = {}
+    for entry in (value or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        name, _, level_name = entry.partition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not name.strip() or not isinstance(level, int):
+            logger.warning("[Logging] Ignoring LOG_LEVELS entry %r (expected module=LEVEL)", entry)
+            continue
+        levels[name.strip()] = level
+    return levels
+
+
+def configure_logging(level: str = None, module_levels: str = None):
+    """
+    Set up the "app" logger tree (safe to call more than once)
+
+    Args:
+        level: Level for all app modules (defaults to settings.LOG_LEVEL)
+        module_levels: Per-module overrides, module=LEVEL comma-separated (defaults to settings.LOG_LEVELS)
+    """
+    from app.core.config import settings
+
+    app_logger = logging.getLogger("app")
+    if not any(isinstance(f, RequestIdFilter) for handler in app_logger.handlers for f in handler.filters):
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handler.addFilter(RequestIdFilter())
+        app_logger.addHandler(handler)
+        # Root handlers (e.g. basicConfig in scripts) would print app records a second time
+        app_logger.propagate = False
+
+    level_name = (level or settings.LOG_LEVEL).upper()
+    app_level = logging.getLevelName(level_name)
+    if not isinstance(app_level, int):
+        logger.warning("[Logging] Unknown LOG_LEVEL %r, using WARNING", level_name)
+        app_level = logging.WARNING
+    app_logger.setLevel(app_level)
+
+    for name, module_level in parse_module_levels(
+        settings.LOG_LEVELS if module_levels is None else module_levels
+    ).items():
+        logging.getLogger(name).setLevel(module_level)
+
+
+class RequestIdMiddleware:
+    """ASGI middleware: set the request id for log records and return it in X-Request-ID"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _VALID_REQUEST_ID.match(candidate):
+                    request_id = candidate
+                break
+        if request_id is None:
+            request_id = uuid.uuid4().hex[:16]
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message).append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
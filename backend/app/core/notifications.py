@@ -0,0 +1,65 @@
+"""
+Stored alert notifications: written by the alert agent, read by the notifications endpoint
+"""
+from typing import List, Optional
+from sqlalchemy.orm import Session
+from app.db.schema import table_available
+from app.models.notification import Notification
+
+
+def notifications_available(db: Session) -> bool:
+    """Check that the notifications table exists"""
+    return table_available(db, Notification.__tablename__, "add_notifications_table.py")
+
+
+def delete_notifications(db: Session, car_id: Optional[int] = None, alert_id: Optional[int] = None):
+    """Remove the notifications of a deleted car or alert inside the caller's transaction (no-op without the table)"""
+    if car_id is None and alert_id is None:
+        raise ValueError("delete_notifications needs a car_id or an alert_id")
+    if not notifications_available(db):
+        return
+    query = db.query(Notification)
+    if car_id is not None:
+        query = query.filter(Notification.car_id == car_id)
+    if alert_id is not None:
+        query = query.filter(Notification.alert_id == alert_id)
+    query.delete(synchronize_session=False)
+
+
+def _insert_ignoring_duplicates(db: Session):
+    """INSERT that skips rows a unique key already covers: (alert_id, car_id, price), or (alert_id, car_id) for new listings"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(Notification).on_conflict_do_nothing()
+
+
+def store_notifications(db: Session, matches: List[dict]):
+    """
+    Store alert agent matches as notifications, inside the caller's transaction
+
+    A match whose alert already reported the car at the same price (for new_listing
+    alerts: at all) is skipped, so full runs, incremental runs and the price-update
+    hook can all report it safely.
+
+    Args:
+        matches: Matches as built by the alert agent (alert_id, user_id, car_id,
+            alert_type, message, price, optional old_price)
+    """
+    if not matches or not notifications_available(db):
+        return
+
+    db.execute(_insert_ignoring_duplicates(db), [
+        {
+            "user_id": match["user_id"],
+            "alert_id": match["alert_id"],
+            "car_id": match["car_id"],
+            "alert_type": match["alert_type"],
+            "message": match["message"],
+            "price": match["price"],
+            "old_price": match.get("old_price"),
+            "is_read": False,
+        }
+        for match in matches
+    ])
@@ -0,0 +1,66 @@
+"""
+Opaque cursor helpers for keyset pagination
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a cursor cannot be decoded or doesn't match the request"""
+
+
+def encode_cursor(sort_by: str, sort_order: str, value: Any, last_id: int) -> str:
+    """
+    Encode the position after the last row of a page into an opaque cursor
+
+    Args:
+        sort_by: Sort field name the page was ordered by
+        sort_order: "asc" or "desc"
+        value: Sort field value of the last row on the page
+        last_id: ID of the last row on the page (tie-breaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = {"s": sort_by, "o": sort_order, "id": last_id}
+    if isinstance(value, datetime):
+        payload["v"] = value.isoformat()
+        payload["t"] = "dt"
+    else:
+        payload["v"] = value
+
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[Optional[Any], int]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Args:
+        cursor: Cursor string from a previous response
+        sort_by: Sort field of the current request
+        sort_order: Sort order of the current request
+
+    Returns:
+        (sort value, last id) tuple
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or was issued for a different sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        value = payload["v"]
+        last_id = int(payload["id"])
+        if payload.get("t") == "dt":
+            value = datetime.fromisoformat(value)
+    except Exception as e:
+        raise InvalidCursorError("Invalid cursor") from e
+
+    if payload.get("s") != sort_by or payload.get("o") != sort_order:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+
+    return value, last_id
@@ -0,0 +1,226 @@
+"""
+Per-request SQL instrumentation: statement count, DB time and slowest statement per route
+
+A sampled share of requests (METRICS_SAMPLE_RATE) gets a RequestStats object in a
+context variable; SQLAlchemy cursor hooks on the app's engines add to it, and the
+middleware reports it in a Server-Timing header and in per-route totals rendered in
+Prometheus text format at /metrics (admins only). Unsampled requests only count towards request
+totals and latency, so the cursor hooks cost a context variable lookup.
+"""
+import logging
+import random
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+# Route label for requests that matched no route (keeps /metrics cardinality bounded)
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    """SQL statements run while serving one sampled request"""
+    __slots__ = ("statements", "db_time", "slowest_time", "slowest_statement")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+
+    def record(self, statement: str, elapsed: float):
+        self.statements += 1
+        self.db_time += elapsed
+        if elapsed > self.slowest_time:
+            self.slowest_time = elapsed
+            self.slowest_statement = statement
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        return (
+            f'db;dur={self.db_time * 1000:.2f};desc="{self.statements} queries", '
+            f'db-slowest;dur={self.slowest_time * 1000:.2f}, '
+            f'app;dur={max(total - self.db_time, 0.0) * 1000:.2f}'
+        )
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Stats of the request being served, or None if it isn't sampled"""
+    return _request_stats.get()
+
+
+# ---------------------------------------------------------------------------
+# SQLAlchemy hooks
+# ---------------------------------------------------------------------------
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _request_stats.get() is not None:
+        context._metrics_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_stats.get()
+    started = getattr(context, "_metrics_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+def install_query_hooks(*engines):
+    """
+    Time statements on the given engines (sync Engine objects; pass
+    async_engine.sync_engine for an AsyncEngine). Safe to call more than once.
+    """
+    for bind in engines:
+        if not event.contains(bind, "before_cursor_execute", _before_cursor_execute):
+            event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+            event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+
+
+# ---------------------------------------------------------------------------
+# Per-route totals
+# ---------------------------------------------------------------------------
+
+class _RouteTotals:
+    __slots__ = ("requests", "server_errors", "seconds", "sampled", "statements", "db_seconds", "slowest_seconds")
+
+    def __init__(self):
+        self.requests = 0
+        self.server_errors = 0
+        self.seconds = 0.0
+        self.sampled = 0
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+
+
+_totals: Dict[Tuple[str, str], _RouteTotals] = {}
+_totals_lock = threading.Lock()
+
+
+def record_request(method: str, route: str, status_code: int, elapsed: float,
+                   stats: Optional[RequestStats], slow_query_seconds: Optional[float] = None):
+    """Add one finished request to its route's totals (and log a slow statement, if any)"""
+    with _totals_lock:
+        totals = _totals.get((method, route))
+        if totals is None:
+            totals = _totals[(method, route)] = _RouteTotals()
+        totals.requests += 1
+        totals.seconds += elapsed
+        if status_code >= 500:
+            totals.server_errors += 1
+        if stats is not None:
+            totals.sampled += 1
+            totals.statements += stats.statements
+            totals.db_seconds += stats.db_time
+            totals.slowest_seconds = max(totals.slowest_seconds, stats.slowest_time)
+
+    if stats is not None and slow_query_seconds is not None and stats.slowest_time >= slow_query_seconds:
+        logger.warning(
+            "[Metrics] %s %s: slow statement %.1f ms (%d statements, %.1f ms DB): %s",
+            method, route, stats.slowest_time * 1000, stats.statements, stats.db_time * 1000,
+            " ".join((stats.slowest_statement or "").split())[:500],
+        )
+
+
+def reset_metrics():
+    """Clear the per-route totals"""
+    with _totals_lock:
+        _totals.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# (metric name, type, help, _RouteTotals attribute)
+_METRICS = (
+    ("cargenie_http_requests_total", "counter", "Requests served", "requests"),
+    ("cargenie_http_server_errors_total", "counter", "Requests answered with a 5xx status", "server_errors"),
+    ("cargenie_http_request_seconds_total", "counter", "Time spent serving requests", "seconds"),
+    ("cargenie_db_sampled_requests_total", "counter", "Requests with SQL instrumentation (sampled)", "sampled"),
+    ("cargenie_db_statements_total", "counter", "SQL statements run by sampled requests", "statements"),
+    ("cargenie_db_seconds_total", "counter", "Time spent in SQL statements by sampled requests", "db_seconds"),
+    ("cargenie_db_slowest_statement_seconds", "gauge", "Slowest SQL statement seen in a sampled request", "slowest_seconds"),
+)
+
+
+def render_metrics() -> str:
+    """Per-route totals in Prometheus text exposition format"""
+    with _totals_lock:
+        snapshot = [
+            (method, route, {attr: getattr(totals, attr) for *_, attr in _METRICS})
+            for (method, route), totals in sorted(_totals.items())
+        ]
+    lines = []
+    for name, kind, help_text, attr in _METRICS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for method, route, values in snapshot:
+            lines.append(f'{name}{{method="{method}",route="{_label(route)}"}} {values[attr]}')
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Middleware
+# ---------------------------------------------------------------------------
+
+def _route_template(scope) -> str:
+    """Path template of the matched route (e.g. /api/v1/cars/{car_id}), not the raw path"""
+    # Newer FastAPI keeps included routes relative to their router and records the full
+    # template in effective_route_context; older versions copy routes with the prefix applied
+    for matched in ((scope.get("fastapi") or {}).get("effective_route_context"), scope.get("route")):
+        path = getattr(matched, "path", None)
+        if path:
+            return path
+    return UNMATCHED_ROUTE
+
+
+class RequestMetricsMiddleware:
+    """
+    ASGI middleware: count and time every request per route; for a sampled share,
+    collect SQL stats and add a Server-Timing header
+
+    Args:
+        app: ASGI application
+        sample_rate: Share of requests (0-1) with SQL instrumentation
+        slow_query_ms: Log sampled requests whose slowest statement takes at least this long (None = never)
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0, slow_query_ms: Optional[float] = None):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_query_seconds = slow_query_ms / 1000 if slow_query_ms is not None else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        stats = RequestStats() if self.sample_rate > 0 and random.random() < self.sample_rate else None
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if stats is not None:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", stats.server_timing(time.perf_counter() - started)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_stats.reset(token)
+            record_request(scope["method"], _route_template(scope), status_code, time.perf_counter() - started,
+                           stats, self.slow_query_seconds)
@@ -0,0 +1,217 @@
+"""
+HTTP response cache for catalog read endpoints: serialized bodies plus ETag/Last-Modified validators
+
+Responses are cached per route and normalized parameters, tagged with the catalog
+version they were built at; the ETag is derived from that version and the key, so
+an If-None-Match check needs nothing but the version. The version itself is kept
+in memory for CATALOG_VERSION_TTL_SECONDS: car writes made through this process
+invalidate it at once, bumps by other workers or db_deploy scripts are seen within
+the TTL.
+
+Usage in a route:
+    catalog = await current_catalog_stamp(db)
+    cached = cached_response(request, catalog, key)
+    if cached is not None:
+        return cached
+    ...build content...
+    return cache_response(catalog, key, ResponseModel, content)
+"""
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from functools import lru_cache
+from typing import Any, Hashable, Optional, Tuple
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.catalog import CatalogStamp, get_catalog_stamp
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Browsers may store responses but must revalidate (cheap: a 304 from the ETag) before reuse
+CACHE_CONTROL = "no-cache"
+
+_MISSING = object()
+
+
+class CatalogStampCache:
+    """The catalog stamp as last read from the database, trusted for ttl seconds"""
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._stamp: Any = _MISSING
+        self._read_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> Any:
+        """Cached stamp (None if the table is missing), or _MISSING if it needs a fresh read"""
+        with self._lock:
+            if self._stamp is _MISSING or time.monotonic() - self._read_at > self.ttl_seconds:
+                return _MISSING
+            return self._stamp
+
+    def set(self, stamp: Optional[CatalogStamp]):
+        with self._lock:
+            self._stamp = stamp
+            self._read_at = time.monotonic()
+
+    def invalidate(self):
+        """Force the next read to hit the database (call after committing a catalog change)"""
+        with self._lock:
+            self._stamp = _MISSING
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of serialized response bodies, tagged with the catalog version
+
+    An entry is served only at the catalog version it was built at, so catalog
+    changes make older entries unreachable; they age out by TTL or LRU order.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, version: int) -> Optional[bytes]:
+        """Cached body for key at the given catalog version"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry_version, expires_at, body = entry
+            if entry_version != version or time.monotonic() > expires_at:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: Hashable, version: int, body: bytes):
+        """Store a body built at the given catalog version"""
+        with self._lock:
+            self._entries[key] = (version, time.monotonic() + self.ttl_seconds, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all cached bodies"""
+        with self._lock:
+            self._entries.clear()
+
+
+# Shared instances used by the catalog routes
+catalog_stamps = CatalogStampCache(settings.CATALOG_VERSION_TTL_SECONDS)
+response_cache = ResponseCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+
+
+async def current_catalog_stamp(db: AsyncSession) -> Optional[CatalogStamp]:
+    """Catalog version and last-change time, from memory when read recently"""
+    stamp = catalog_stamps.get()
+    if stamp is _MISSING:
+        stamp = await db.run_sync(get_catalog_stamp)
+        catalog_stamps.set(stamp)
+    return stamp
+
+
+def make_etag(version: int, key: Hashable) -> str:
+    """Strong ETag for a cache key at a catalog version"""
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"'
+
+
+def _last_modified(stamp: CatalogStamp) -> Optional[datetime]:
+    if stamp.updated_at is None:
+        return None
+    updated_at = stamp.updated_at
+    if updated_at.tzinfo is None:
+        # SQLite stores CURRENT_TIMESTAMP (UTC) without an offset
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    return updated_at.replace(microsecond=0)
+
+
+def _validator_headers(stamp: CatalogStamp, etag: str) -> dict:
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    last_modified = _last_modified(stamp)
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    return headers
+
+
+def _not_modified(request: Request, stamp: CatalogStamp, etag: str) -> bool:
+    """Evaluate If-None-Match (or, without it, If-Modified-Since) against the current validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as RFC 9110 specifies for If-None-Match
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    last_modified = _last_modified(stamp)
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified <= since
+    return False
+
+
+def cached_response(request: Request, stamp: Optional[CatalogStamp], key: Hashable) -> Optional[Response]:
+    """
+    Answer from validators or the cache, if possible
+
+    Returns:
+        304 if the client's copy is current, the cached body if there is one, else None
+    """
+    if stamp is None or not settings.RESPONSE_CACHE_ENABLED:
+        return None
+
+    etag = make_etag(stamp.version, key)
+    if _not_modified(request, stamp, etag):
+        return Response(status_code=304, headers=_validator_headers(stamp, etag))
+
+    body = response_cache.get(key, stamp.version)
+    if body is None:
+        return None
+    return Response(content=body, media_type="application/json", headers=_validator_headers(stamp, etag))
+
+
+@lru_cache(maxsize=None)
+def _adapter(response_type) -> TypeAdapter:
+    return TypeAdapter(response_type)
+
+
+def cache_response(
+    stamp: Optional[CatalogStamp],
+    key: Hashable,
+    response_type,
+    content: Any,
+    serialize: bool = False
+) -> Any:
+    """
+    Serialize content as response_type, cache it and return it with validators
+
+    Returns content unchanged (for FastAPI to serialize) when caching is off or
+    the catalog has no version, unless serialize is set: then it is returned as a
+    serialized Response either way (for content that isn't the route's response_model).
+    """
+    caching = stamp is not None and settings.RESPONSE_CACHE_ENABLED
+    if not caching and not serialize:
+        return content
+
+    adapter = _adapter(response_type)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+    if not caching:
+        return Response(content=body, media_type="application/json")
+    response_cache.set(key, stamp.version, body)
+    etag = make_etag(stamp.version, key)
+    return Response(content=body, media_type="application/json", headers=_validator_headers(stamp, etag))
@@ -0,0 +1,151 @@
+"""
+Incrementally maintained per-car review aggregates (count, rating sum, star histogram, version)
+"""
+from typing import Dict, Iterable, List, NamedTuple, Optional
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.schema import table_available
+from app.models.review import Review, CarReviewStats
+
+# Star rating -> histogram column on CarReviewStats
+RATING_COUNT_COLUMNS = {stars: f"rating_{stars}_count" for stars in range(1, 6)}
+
+
+class ReviewAggregate(NamedTuple):
+    """Review count, average and star histogram of one car"""
+    car_id: int
+    review_count: int
+    average_rating: Optional[float]
+    rating_histogram: Dict[int, int]
+
+
+def review_stats_available(db: Session) -> bool:
+    """Check that the car_review_stats table and its histogram columns exist"""
+    table = CarReviewStats.__tablename__
+    return (
+        table_available(db, table, "add_review_stats_table.py")
+        and table_available(db, table, "add_review_rating_counts.py", columns=RATING_COUNT_COLUMNS.values())
+    )
+
+
+def get_review_stats(db: Session, car_id: int) -> Optional[CarReviewStats]:
+    """
+    Get a car's review aggregates
+
+    Returns:
+        Stats row, or None if the table doesn't exist or the car has never been reviewed
+    """
+    if not review_stats_available(db):
+        return None
+    return db.query(CarReviewStats).filter(CarReviewStats.car_id == car_id).first()
+
+
+def get_review_aggregates(db: Session, car_ids: Iterable[int]) -> List[ReviewAggregate]:
+    """
+    Get review count, average and star histogram for several cars with one query
+    Reads the maintained aggregates, or groups the reviews themselves if the table isn't there.
+
+    Returns:
+        One ReviewAggregate per distinct car id, in request order (zeros for cars without reviews)
+    """
+    car_ids = list(dict.fromkeys(car_ids))
+    if not car_ids:
+        return []
+
+    histograms: Dict[int, Dict[int, int]] = {}
+    if review_stats_available(db):
+        for stats in db.query(CarReviewStats).filter(CarReviewStats.car_id.in_(car_ids)):
+            histograms[stats.car_id] = stats.rating_histogram
+    else:
+        rows = db.query(Review.car_id, Review.rating, func.count(Review.id)).filter(
+            Review.car_id.in_(car_ids)
+        ).group_by(Review.car_id, Review.rating)
+        for car_id, rating, count in rows:
+            histograms.setdefault(car_id, dict.fromkeys(RATING_COUNT_COLUMNS, 0))[rating] = count
+
+    aggregates = []
+    for car_id in car_ids:
+        histogram = histograms.get(car_id) or dict.fromkeys(RATING_COUNT_COLUMNS, 0)
+        review_count = sum(histogram.values())
+        rating_sum = sum(stars * count for stars, count in histogram.items())
+        aggregates.append(ReviewAggregate(
+            car_id=car_id,
+            review_count=review_count,
+            average_rating=rating_sum / review_count if review_count else None,
+            rating_histogram=histogram,
+        ))
+    return aggregates
+
+
+def delete_review_stats(db: Session, car_id: int):
+    """Remove a deleted car's aggregates inside the caller's transaction (no-op without the table)"""
+    if review_stats_available(db):
+        db.query(CarReviewStats).filter(CarReviewStats.car_id == car_id).delete(synchronize_session=False)
+
+
+def _insert_stats(db: Session):
+    """INSERT into car_review_stats with the dialect's ON CONFLICT support"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(CarReviewStats)
+
+
+def apply_review_change(
+    db: Session,
+    car_id: int,
+    added_rating: Optional[int] = None,
+    removed_rating: Optional[int] = None
+):
+    """
+    Adjust a car's review aggregates inside the caller's transaction
+    Call this after adding/updating/deleting a review (or its AI summary), before committing.
+
+    Args:
+        car_id: Car whose reviews changed
+        added_rating: Rating of a new review, or the new rating of an edited one
+        removed_rating: Rating of a deleted review, or the old rating of an edited one
+        (neither: only the version is bumped, e.g. for a new AI summary)
+    """
+    if not review_stats_available(db):
+        return
+
+    changes = {
+        CarReviewStats.review_count: (added_rating is not None) - (removed_rating is not None),
+        CarReviewStats.rating_sum: (added_rating or 0) - (removed_rating or 0),
+    }
+    for rating, delta in ((added_rating, 1), (removed_rating, -1)):
+        if rating is not None:
+            column = getattr(CarReviewStats, RATING_COUNT_COLUMNS[rating])
+            changes[column] = changes.get(column, 0) + delta
+
+    values = {column: column + delta for column, delta in changes.items()}
+    values[CarReviewStats.version] = CarReviewStats.version + 1
+    updated = db.query(CarReviewStats).filter(CarReviewStats.car_id == car_id).update(
+        values,
+        synchronize_session=False
+    )
+    if updated:
+        return
+
+    # First change since the car's row was created: count the reviews once (the flush
+    # makes the pending change part of the count, so the deltas aren't applied). A
+    # concurrent first review may insert the row meanwhile; its count can't include
+    # this uncommitted review, so on conflict only this change's deltas are added.
+    db.flush()
+    counts = dict(db.query(Review.rating, func.count(Review.id)).filter(
+        Review.car_id == car_id
+    ).group_by(Review.rating).all())
+    db.execute(
+        _insert_stats(db).values(
+            car_id=car_id,
+            review_count=sum(counts.values()),
+            rating_sum=sum(rating * count for rating, count in counts.items()),
+            version=1,
+            **{column: counts.get(stars, 0) for stars, column in RATING_COUNT_COLUMNS.items()}
+        ).on_conflict_do_update(
+            index_elements=[CarReviewStats.car_id],
+            set_={column.key: value for column, value in values.items()} | {"updated_at": func.now()}
+        )
+    )
@@ -5,8 +5,9 @@ import logging
 import asyncio
 from datetime import datetime
 from sqlalchemy.orm import Session
+from app.core.config import settings
 from app.db.database import SessionLocal
-from app.api.v1.alerts import run_alert_agent
+from app.api.v1.alerts import deliver_alert_matches, run_alert_agent, run_incremental_alert_agent
 
 logger = logging.getLogger(__name__)
 
@@ -18,8 +19,12 @@ async def run_alert_agent_task():
     try:
         db = SessionLocal()
         try:
-            result = run_alert_agent(db)
-            logger.info(f"[Scheduler] Alert agent completed: {result}")
+            if settings.ALERT_AGENT_INCREMENTAL:
+                result = run_incremental_alert_agent(db)
+            else:
+                result = run_alert_agent(db)
+            deliver_alert_matches(db, result["matches"])
+            logger.info(f"[Scheduler] Alert agent completed: {result['matches_found']} matches ({result.get('mode', 'full')})")
         finally:
             db.close()
     except Exception as e:
@@ -52,7 +57,12 @@ if __name__ == "__main__":
     
     db = SessionLocal()
     try:
-        result = run_alert_agent(db)
+        # --full re-checks the whole inventory instead of only what changed since the last run
+        if settings.ALERT_AGENT_INCREMENTAL and "--full" not in sys.argv:
+            result = run_incremental_alert_agent(db)
+        else:
+            result = run_alert_agent(db)
+        deliver_alert_matches(db, result["matches"])
         print(f"Alert agent run completed: {result}")
     finally:
         db.close()
@@ -0,0 +1,125 @@
+"""
+Full-text search index over car make, model and description
+SQLite uses an FTS5 table kept in sync by triggers; PostgreSQL uses a GIN
+expression index on a tsvector. Both support prefix matching and ranking.
+"""
+import logging
+import re
+from typing import List, Optional
+from sqlalchemy import Float, Integer, literal_column, select, text, func
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from app.db.schema import schema_available
+from app.models import Car
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "cars_fts"
+PG_INDEX = "ix_cars_search_vector"
+
+# Must match the expression the GIN index is built on, or PostgreSQL won't use it
+_PG_DOCUMENT = "to_tsvector('simple', coalesce({t}make, '') || ' ' || coalesce({t}model, '') || ' ' || coalesce({t}description, ''))"
+
+_SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        make, model, description,
+        content='cars', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cars_fts_ai AFTER INSERT ON cars BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, make, model, description)
+        VALUES (new.id, new.make, new.model, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cars_fts_ad AFTER DELETE ON cars BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, make, model, description)
+        VALUES ('delete', old.id, old.make, old.model, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS cars_fts_au AFTER UPDATE OF make, model, description ON cars BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, make, model, description)
+        VALUES ('delete', old.id, old.make, old.model, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, make, model, description)
+        VALUES (new.id, new.make, new.model, new.description);
+    END
+    """,
+    # Index rows that existed before the table was created
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+def search_terms(search: Optional[str]) -> List[str]:
+    """Split a search string into lowercase word tokens"""
+    return re.findall(r"[^\W_]+", (search or "").lower())
+
+
+def create_search_index(engine: Engine) -> bool:
+    """
+    Create the full-text index for the engine's dialect (idempotent)
+
+    Returns:
+        True if the index exists afterwards
+    """
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                for statement in _SQLITE_DDL:
+                    conn.execute(text(statement))
+            elif dialect == "postgresql":
+                conn.execute(text(
+                    f"CREATE INDEX IF NOT EXISTS {PG_INDEX} ON cars USING GIN ({_PG_DOCUMENT.format(t='')})"
+                ))
+            else:
+                logger.warning(f"[Search] Full-text index not supported on {dialect}")
+                return False
+        logger.info(f"[Search] Full-text index ready ({dialect})")
+        return True
+    except Exception as e:
+        logger.error(f"[Search] Failed to create full-text index: {e}")
+        return False
+
+
+def search_index_available(db: Session) -> bool:
+    """Check that the full-text index exists (without it search falls back to ILIKE)"""
+    dialect = db.get_bind().dialect.name
+
+    def probe(inspector) -> bool:
+        if dialect == "sqlite":
+            return inspector.has_table(FTS_TABLE)
+        if dialect == "postgresql":
+            return any(ix["name"] == PG_INDEX for ix in inspector.get_indexes("cars"))
+        return False
+
+    return schema_available(db, FTS_TABLE, probe)
+
+
+def search_subquery(db: Session, search: Optional[str]):
+    """
+    Build a (car_id, rank) subquery of cars matching every search term as a word prefix
+    Lower rank means a better match.
+
+    Returns:
+        Subquery, or None if the index isn't available (callers fall back to ILIKE)
+    """
+    terms = search_terms(search)
+    if not terms or not search_index_available(db):
+        return None
+
+    if db.get_bind().dialect.name == "sqlite":
+        match = " AND ".join(f'"{term}"*' for term in terms)
+        return text(
+            f"SELECT rowid AS car_id, bm25({FTS_TABLE}) AS rank FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+        ).bindparams(match=match).columns(car_id=Integer, rank=Float).subquery("car_search")
+
+    document = literal_column(_PG_DOCUMENT.format(t="cars."))
+    ts_query = func.to_tsquery(literal_column("'simple'"), " & ".join(f"{term}:*" for term in terms))
+    return select(
+        Car.id.label("car_id"),
+        (-func.ts_rank(document, ts_query)).label("rank")
+    ).where(document.op("@@")(ts_query)).subquery("car_search")
@@ -0,0 +1,203 @@
+"""
+In-memory vector index mirroring a ChromaDB collection
+Holds every embedding in one contiguous float32 matrix so top-k queries
+(single or batched) are a single matmul + argpartition.
+"""
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Rows fetched per collection.get() call when loading
+_LOAD_BATCH_SIZE = 1000
+
+
+class InMemoryVectorIndex:
+    """Exact nearest-neighbour index over car embeddings"""
+
+    def __init__(self, space: str = "l2"):
+        """
+        Args:
+            space: Distance the collection uses ("l2", "cosine" or "ip"), so
+                   reported distances match what Chroma would return
+        """
+        if space not in ("l2", "cosine", "ip"):
+            raise ValueError(f"Unsupported distance space: {space}")
+        self.space = space
+        self._matrix: Optional[np.ndarray] = None  # (capacity, dim) float32
+        self._sq_norms = np.zeros(0, dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[int, int] = {}  # car_id -> row
+        self._size = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_collection(cls, collection) -> "InMemoryVectorIndex":
+        """Build an index from every embedding stored in a Chroma collection"""
+        index = cls(space=_collection_space(collection))
+        offset = 0
+        while True:
+            batch = collection.get(
+                include=["embeddings", "metadatas"],
+                limit=_LOAD_BATCH_SIZE,
+                offset=offset
+            )
+            ids = batch["ids"]
+            if not ids:
+                break
+            index.upsert([int(i) for i in ids], batch["embeddings"], batch["metadatas"])
+            offset += len(ids)
+        logger.info(f"[VectorIndex] Loaded {len(index)} embeddings ({index.space} distance)")
+        return index
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _ensure_capacity(self, dim: int, needed: int):
+        """Grow the backing arrays geometrically so appends are amortized O(1)"""
+        if self._matrix is None:
+            capacity = max(needed, 64)
+            self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+            self._sq_norms = np.zeros(capacity, dtype=np.float32)
+            self._ids = np.zeros(capacity, dtype=np.int64)
+            return
+        if self._matrix.shape[1] != dim:
+            raise ValueError(f"Embedding dimension {dim} doesn't match index dimension {self._matrix.shape[1]}")
+        if needed <= self._matrix.shape[0]:
+            return
+        capacity = max(needed, self._matrix.shape[0] * 2)
+        matrix = np.zeros((capacity, dim), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        sq_norms = np.zeros(capacity, dtype=np.float32)
+        sq_norms[:self._size] = self._sq_norms[:self._size]
+        ids = np.zeros(capacity, dtype=np.int64)
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._sq_norms, self._ids = matrix, sq_norms, ids
+
+    def upsert(
+        self,
+        car_ids: Sequence[int],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Optional[Sequence[Dict[str, Any]]] = None
+    ):
+        """Insert or replace embeddings (and their metadata) for car IDs"""
+        if len(car_ids) == 0:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(car_ids):
+            raise ValueError("Expected one embedding per car ID")
+        metadatas = metadatas if metadatas is not None else [{}] * len(car_ids)
+
+        with self._lock:
+            new_ids = [i for i in dict.fromkeys(car_ids) if i not in self._rows]
+            self._ensure_capacity(vectors.shape[1], self._size + len(new_ids))
+            for car_id, vector, metadata in zip(car_ids, vectors, metadatas):
+                row = self._rows.get(car_id)
+                if row is None:
+                    row = self._size
+                    self._rows[car_id] = row
+                    self._ids[row] = car_id
+                    self._metadatas.append(dict(metadata or {}))
+                    self._size += 1
+                else:
+                    self._metadatas[row] = dict(metadata or {})
+                self._matrix[row] = vector
+                self._sq_norms[row] = float(vector @ vector)
+
+    def delete(self, car_ids: Sequence[int]):
+        """Remove embeddings by moving the last row into each freed slot"""
+        with self._lock:
+            for car_id in car_ids:
+                row = self._rows.pop(car_id, None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                if row != last:
+                    moved_id = int(self._ids[last])
+                    self._matrix[row] = self._matrix[last]
+                    self._sq_norms[row] = self._sq_norms[last]
+                    self._ids[row] = moved_id
+                    self._metadatas[row] = self._metadatas[last]
+                    self._rows[moved_id] = row
+                self._metadatas.pop()
+                self._size -= 1
+
+    def get(self, car_id: int) -> Optional[List[float]]:
+        """Get the stored embedding for a car"""
+        with self._lock:
+            row = self._rows.get(car_id)
+            if row is None:
+                return None
+            return self._matrix[row].tolist()
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Find the nearest stored embeddings for each query vector
+
+        Args:
+            query_embeddings: One or more query vectors
+            n_results: Number of neighbours per query
+
+        Returns:
+            One list per query of {"car_id", "distance", "metadata"} dicts, nearest first
+        """
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+
+        with self._lock:
+            size = self._size
+            if size == 0 or n_results <= 0:
+                return [[] for _ in range(len(queries))]
+            matrix = self._matrix[:size]
+            dots = queries @ matrix.T  # (n_queries, size)
+
+            if self.space == "cosine":
+                query_norms = np.linalg.norm(queries, axis=1, keepdims=True)
+                norms = np.sqrt(self._sq_norms[:size])[None, :]
+                distances = 1.0 - dots / np.maximum(query_norms * norms, 1e-12)
+            elif self.space == "ip":
+                distances = 1.0 - dots
+            else:
+                query_sq_norms = np.einsum("ij,ij->i", queries, queries)[:, None]
+                distances = np.maximum(query_sq_norms + self._sq_norms[:size][None, :] - 2.0 * dots, 0.0)
+
+            k = min(n_results, size)
+            if k < size:
+                top = np.argpartition(distances, k - 1, axis=1)[:, :k]
+            else:
+                top = np.tile(np.arange(size), (len(queries), 1))
+            top_distances = np.take_along_axis(distances, top, axis=1)
+            order = np.argsort(top_distances, axis=1, kind="stable")
+            top = np.take_along_axis(top, order, axis=1)
+
+            return [
+                [
+                    {
+                        "car_id": int(self._ids[row]),
+                        "distance": float(distances[q, row]),
+                        "metadata": self._metadatas[row]
+                    }
+                    for row in top[q]
+                ]
+                for q in range(len(queries))
+            ]
+
+
+def _collection_space(collection) -> str:
+    """Read the distance function a Chroma collection was created with"""
+    try:
+        configuration = getattr(collection, "configuration", None) or {}
+        space = (configuration.get("hnsw") or {}).get("space")
+    except Exception:
+        space = None
+    if not space:
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+    return space
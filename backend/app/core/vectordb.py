@@ -2,10 +2,13 @@
 ChromaDB vector database integration for car embeddings
 """
 import logging
+import threading
 import chromadb
 from chromadb.config import Settings
 from typing import List, Optional, Dict, Any
 import os
+from app.core.config import settings as app_settings
+from app.core.vector_index import InMemoryVectorIndex
 
 logger = logging.getLogger(__name__)
 
@@ -14,12 +17,54 @@ _base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fi
 _project_root = os.path.dirname(_base_dir)
 _chroma_db_path = os.path.join(_project_root, 'db_deploy', 'chroma_db').replace('\\', '/')
 
+# In-memory indexes shared by every VectorDB instance in the process, keyed by collection
+_memory_indexes: Dict[str, InMemoryVectorIndex] = {}
+_memory_indexes_lock = threading.Lock()
+
+
+def _format_metadata(car_id: int, metadata: Dict[str, Any]) -> Dict[str, str]:
+    """Prepare metadata for ChromaDB (requires string values)"""
+    chroma_metadata = {
+        "car_id": str(car_id),
+        "make": str(metadata.get("make", "")),
+        "model": str(metadata.get("model", "")),
+        "year": str(metadata.get("year", "")),
+        "price": str(metadata.get("price", "")),
+        "fuel_type": str(metadata.get("fuel_type", "")),
+        "transmission": str(metadata.get("transmission", "")),
+    }
+    
+    # Add description if available
+    if "description" in metadata:
+        chroma_metadata["description"] = str(metadata["description"])[:1000]  # Limit length
+    
+    return chroma_metadata
+
+
+def car_metadata(car) -> Dict[str, Any]:
+    """Metadata stored alongside a car's embedding"""
+    return {
+        "make": car.make,
+        "model": car.model,
+        "year": car.year,
+        "price": car.price,
+        "fuel_type": car.fuel_type,
+        "transmission": car.transmission,
+        "description": car.description or ""
+    }
+
 
 class VectorDB:
     """ChromaDB client for storing and querying car embeddings"""
     
-    def __init__(self, collection_name: str = "cars"):
-        """Initialize ChromaDB client"""
+    def __init__(self, collection_name: str = "cars", in_memory: Optional[bool] = None):
+        """
+        Initialize ChromaDB client
+        
+        Args:
+            collection_name: Chroma collection to use
+            in_memory: Serve reads from an in-memory index (defaults to settings.VECTOR_INDEX_IN_MEMORY)
+        """
         try:
             # Create persistent client
             self.client = chromadb.PersistentClient(
@@ -38,6 +83,23 @@ class VectorDB:
         except Exception as e:
             logger.error(f"[VectorDB] Failed to initialize: {e}")
             raise
+        
+        self.index: Optional[InMemoryVectorIndex] = None
+        if in_memory if in_memory is not None else app_settings.VECTOR_INDEX_IN_MEMORY:
+            self.index = self._load_memory_index(collection_name)
+    
+    def _load_memory_index(self, collection_name: str) -> Optional[InMemoryVectorIndex]:
+        """Get the process-wide in-memory index for a collection, loading it on first use"""
+        with _memory_indexes_lock:
+            index = _memory_indexes.get(collection_name)
+            if index is None:
+                try:
+                    index = InMemoryVectorIndex.from_collection(self.collection)
+                except Exception as e:
+                    logger.error(f"[VectorDB] Failed to load in-memory index, using Chroma only: {e}")
+                    return None
+                _memory_indexes[collection_name] = index
+            return index
     
     def add_car_embedding(
         self,
@@ -59,21 +121,7 @@ class VectorDB:
         try:
             # Use car_id as document ID
             doc_id = str(car_id)
-            
-            # Prepare metadata (ChromaDB requires string values)
-            chroma_metadata = {
-                "car_id": str(car_id),
-                "make": str(metadata.get("make", "")),
-                "model": str(metadata.get("model", "")),
-                "year": str(metadata.get("year", "")),
-                "price": str(metadata.get("price", "")),
-                "fuel_type": str(metadata.get("fuel_type", "")),
-                "transmission": str(metadata.get("transmission", "")),
-            }
-            
-            # Add description if available
-            if "description" in metadata:
-                chroma_metadata["description"] = str(metadata["description"])[:1000]  # Limit length
+            chroma_metadata = _format_metadata(car_id, metadata)
             
             # Upsert (update if exists, insert if not)
             self.collection.upsert(
@@ -82,23 +130,88 @@ class VectorDB:
                 metadatas=[chroma_metadata]
             )
             
+            if self.index is not None:
+                self.index.upsert([car_id], [embedding], [chroma_metadata])
+            
             logger.info(f"[VectorDB] Added/updated embedding for car {car_id}")
             return True
         except Exception as e:
             logger.error(f"[VectorDB] Failed to add embedding for car {car_id}: {e}")
             return False
     
+    def upsert_many(
+        self,
+        car_ids: List[int],
+        embeddings: List[List[float]],
+        metadatas: List[Dict[str, Any]]
+    ) -> bool:
+        """
+        Add or update embeddings for many cars in a single collection write
+        
+        Args:
+            car_ids: Car database IDs
+            embeddings: One vector embedding per car
+            metadatas: One metadata dict per car (same shape as add_car_embedding)
+        
+        Returns:
+            True if successful
+        """
+        if not car_ids:
+            return True
+        
+        try:
+            chroma_metadatas = [_format_metadata(car_id, metadata) for car_id, metadata in zip(car_ids, metadatas)]
+            self.collection.upsert(
+                ids=[str(car_id) for car_id in car_ids],
+                embeddings=embeddings,
+                metadatas=chroma_metadatas
+            )
+            
+            if self.index is not None:
+                self.index.upsert(car_ids, embeddings, chroma_metadatas)
+            
+            logger.info(f"[VectorDB] Added/updated {len(car_ids)} embeddings")
+            return True
+        except Exception as e:
+            logger.error(f"[VectorDB] Failed to upsert {len(car_ids)} embeddings: {e}")
+            return False
+    
     def get_car_embedding(self, car_id: int) -> Optional[List[float]]:
         """Get embedding for a specific car"""
+        if self.index is not None:
+            return self.index.get(car_id)
+        
         try:
-            result = self.collection.get(ids=[str(car_id)])
-            if result['embeddings'] and len(result['embeddings']) > 0:
-                return result['embeddings'][0]
+            result = self.collection.get(ids=[str(car_id)], include=["embeddings"])
+            embeddings = result.get('embeddings')
+            if embeddings is not None and len(embeddings) > 0:
+                return list(embeddings[0])
             return None
         except Exception as e:
             logger.error(f"[VectorDB] Failed to get embedding for car {car_id}: {e}")
             return None
     
+    def get_car_embeddings(self, car_ids: List[int]) -> Dict[int, List[float]]:
+        """
+        Get embeddings for several cars in one call
+        
+        Returns:
+            Dict of car_id -> embedding (cars without an embedding are omitted)
+        """
+        if self.index is not None:
+            found = {car_id: self.index.get(car_id) for car_id in car_ids}
+            return {car_id: emb for car_id, emb in found.items() if emb is not None}
+        
+        try:
+            result = self.collection.get(ids=[str(i) for i in car_ids], include=["embeddings"])
+            embeddings = result.get('embeddings')
+            if embeddings is None:
+                return {}
+            return {int(doc_id): list(emb) for doc_id, emb in zip(result['ids'], embeddings)}
+        except Exception as e:
+            logger.error(f"[VectorDB] Failed to get embeddings for cars {car_ids}: {e}")
+            return {}
+    
     def search_similar_cars(
         self,
         query_embedding: List[float],
@@ -116,6 +229,12 @@ class VectorDB:
         Returns:
             List of similar cars with similarity scores
         """
+        # Metadata filters are only supported by Chroma
+        if self.index is not None and not filters:
+            similar_cars = self.index.query([query_embedding], n_results)[0]
+            logger.info(f"[VectorDB] Found {len(similar_cars)} similar cars (in-memory)")
+            return similar_cars
+        
         try:
             where_clause = None
             if filters:
@@ -145,10 +264,54 @@ class VectorDB:
             logger.error(f"[VectorDB] Failed to search similar cars: {e}")
             return []
     
+    def search_similar_cars_batch(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 5
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar cars for several query vectors at once
+        
+        Args:
+            query_embeddings: Query vector embeddings
+            n_results: Number of results per query
+        
+        Returns:
+            One list of similar cars per query, in the same order as query_embeddings
+        """
+        if not query_embeddings:
+            return []
+        
+        if self.index is not None:
+            return self.index.query(query_embeddings, n_results)
+        
+        try:
+            results = self.collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results
+            )
+            
+            batch = []
+            for q in range(len(query_embeddings)):
+                batch.append([
+                    {
+                        "car_id": int(results['ids'][q][i]),
+                        "distance": results['distances'][q][i] if results.get('distances') else None,
+                        "metadata": results['metadatas'][q][i] if results.get('metadatas') else {}
+                    }
+                    for i in range(len(results['ids'][q]))
+                ])
+            return batch
+        except Exception as e:
+            logger.error(f"[VectorDB] Failed to batch search similar cars: {e}")
+            return [[] for _ in query_embeddings]
+    
     def delete_car_embedding(self, car_id: int) -> bool:
         """Delete embedding for a car"""
         try:
             self.collection.delete(ids=[str(car_id)])
+            if self.index is not None:
+                self.index.delete([car_id])
             logger.info(f"[VectorDB] Deleted embedding for car {car_id}")
             return True
         except Exception as e:
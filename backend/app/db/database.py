@@ -1,20 +1,97 @@
 """
 Database connection and session management
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune each new SQLite connection
+    WAL lets readers run while a writer commits, and busy_timeout makes a blocked
+    writer wait for the lock instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        if settings.SQLITE_JOURNAL_MODE:
+            cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        if settings.SQLITE_SYNCHRONOUS:
+            cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        cursor.execute(f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    finally:
+        cursor.close()
+
+
+def _engine_options(database_url: str) -> dict:
+    """create_engine keyword arguments for a URL: pool settings from Settings, SQLite connect args"""
+    is_sqlite = database_url.startswith("sqlite")
+    options = {}
+    if is_sqlite:
+        options["connect_args"] = {"check_same_thread": False}
+    # In-memory SQLite keeps a single connection per thread; there is no pool to size
+    if not (is_sqlite and (":memory:" in database_url or database_url.rstrip("/") == "sqlite:")):
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+        )
+    return options
+
+
+def build_engine(database_url: str) -> Engine:
+    """
+    Create an engine with the pool and (for SQLite) connection settings from Settings
+
+    Args:
+        database_url: SQLAlchemy database URL
+    """
+    new_engine = create_engine(database_url, **_engine_options(database_url))
+    if database_url.startswith("sqlite"):
+        event.listen(new_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
+
+def async_database_url(database_url: str) -> str:
+    """The same database with its async driver (sqlite -> aiosqlite, postgresql -> asyncpg)"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+    return url.render_as_string(hide_password=False)
+
+
+def build_async_engine(database_url: str) -> AsyncEngine:
+    """
+    Create an async engine for the same database, with the same pool and SQLite settings
+
+    Args:
+        database_url: SQLAlchemy database URL (sync driver; mapped by async_database_url)
+    """
+    new_engine = create_async_engine(async_database_url(database_url), **_engine_options(database_url))
+    if database_url.startswith("sqlite"):
+        event.listen(new_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return new_engine
+
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-)
+engine = build_engine(settings.DATABASE_URL)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine and sessions for read-heavy routes (requests wait on the event loop, not a threadpool worker)
+async_engine = build_async_engine(settings.DATABASE_URL)
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 # Base class for models
 Base = declarative_base()
 
@@ -27,3 +104,8 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
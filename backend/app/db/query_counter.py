@@ -0,0 +1,47 @@
+"""
+SQL statement counter for checks and tests: how many statements a block of code runs
+"""
+import threading
+from typing import List, Optional
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryCounter:
+    """
+    Record the SQL statements executed on the given engines inside a with block
+
+    Defaults to the app's sync engine and the async engine's sync core, so routes on
+    either session are counted. Statements from every thread are recorded (TestClient
+    runs the app in its own thread), so don't run unrelated work concurrently.
+
+    Example:
+        with QueryCounter() as queries:
+            client.get("/api/v1/favorites/")
+        assert queries.count == 2, queries.statements
+    """
+
+    def __init__(self, engines: Optional[List[Engine]] = None):
+        if engines is None:
+            from app.db.database import async_engine, engine
+            engines = [engine, async_engine.sync_engine]
+        self.engines = engines
+        self.statements: List[str] = []
+        self._lock = threading.Lock()
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def __enter__(self) -> "QueryCounter":
+        for bind in self.engines:
+            event.listen(bind, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        for bind in self.engines:
+            event.remove(bind, "before_cursor_execute", self._before_cursor_execute)
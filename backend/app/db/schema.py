@@ -0,0 +1,83 @@
+"""
+Presence checks for schema objects added by the db_deploy migration scripts
+
+Features backed by an optional table degrade gracefully while its migration hasn't
+run. A positive result is cached for the life of the process; a missing object is
+warned about once and only looked up again after MISSING_RECHECK_SECONDS, so a
+request path never inspects the schema on every call.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+from sqlalchemy import inspect
+from sqlalchemy.engine import Inspector
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# A missing table is looked up again after this long (picks up a migration run against a live server)
+MISSING_RECHECK_SECONDS = 60.0
+
+_lock = threading.Lock()
+_present: Set[Tuple[str, str]] = set()
+_missing_since: Dict[Tuple[str, str], float] = {}
+_warned: Set[Tuple[str, str]] = set()
+
+
+def schema_available(
+    db: Session,
+    name: str,
+    probe: Callable[[Inspector], bool],
+    warning: Optional[str] = None
+) -> bool:
+    """
+    Check (cached per database) that a schema object exists
+
+    Args:
+        name: Cache key for the object, e.g. a table name
+        probe: Inspects the database and returns whether the object is there
+        warning: Logged the first time the object is found missing (None: stay quiet)
+    """
+    bind = db.get_bind()
+    key = (str(bind.engine.url), name)
+    if key in _present:
+        return True
+    checked = _missing_since.get(key)
+    if checked is not None and time.monotonic() - checked < MISSING_RECHECK_SECONDS:
+        return False
+
+    available = probe(inspect(bind))
+    with _lock:
+        if available:
+            _present.add(key)
+            _missing_since.pop(key, None)
+        else:
+            _missing_since[key] = time.monotonic()
+            if warning and key not in _warned:
+                _warned.add(key)
+                logger.warning(warning)
+    return available
+
+
+def table_available(db: Session, table: str, migration: str, columns: Iterable[str] = ()) -> bool:
+    """
+    Check (cached per database) that a table, and optionally some of its columns, exist
+
+    Args:
+        table: Table name
+        migration: db_deploy script that creates it, named in the warning
+        columns: Columns that must be present too (added by a later migration)
+    """
+    columns = tuple(columns)
+
+    def probe(inspector: Inspector) -> bool:
+        if not inspector.has_table(table):
+            return False
+        return not columns or set(columns) <= {column["name"] for column in inspector.get_columns(table)}
+
+    what = f"{table} table" + (f" (columns {', '.join(columns)})" if columns else "")
+    return schema_available(
+        db, f"{table}:{','.join(columns)}", probe,
+        f"[Schema] {what} missing - run db_deploy/{migration}"
+    )
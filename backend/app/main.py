@@ -3,14 +3,21 @@ Main FastAPI application
 """
 import logging
 import asyncio
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from app.api.v1 import auth, cars, favorites, reviews, ai, recommendations, predictions
+from app.api.v1.auth import get_admin_user
 from app.core.config import settings
-from app.db.database import SessionLocal
+from app.core.logging_config import RequestIdMiddleware, configure_logging
+from app.core.request_metrics import RequestMetricsMiddleware, install_query_hooks, render_metrics
+from app.db.database import SessionLocal, async_engine, engine
 
 logger = logging.getLogger(__name__)
 
+# Log handler and levels from settings (LOG_LEVEL, LOG_LEVELS)
+configure_logging()
+
 # Create FastAPI app
 app = FastAPI(
     title="AI-Powered Automobile Website API",
@@ -40,6 +47,18 @@ app.add_middleware(
     max_age=3600,
 )
 
+# Request metrics (outside CORS, so preflights and errors are counted too)
+if settings.METRICS_ENABLED:
+    install_query_hooks(engine, async_engine.sync_engine)
+    app.add_middleware(
+        RequestMetricsMiddleware,
+        sample_rate=settings.METRICS_SAMPLE_RATE,
+        slow_query_ms=settings.METRICS_SLOW_QUERY_MS,
+    )
+
+# Request id for log correlation (added last, so it wraps everything above)
+app.add_middleware(RequestIdMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["Authentication"])
 app.include_router(cars.router, prefix="/api/v1/cars", tags=["Cars"])
@@ -49,6 +68,18 @@ app.include_router(ai.router, prefix="/api/v1/ai", tags=["AI"])
 app.include_router(recommendations.router, prefix="/api/v1", tags=["Recommendations"])
 app.include_router(predictions.router, prefix="/api/v1", tags=["Predictions"])
 
+if settings.METRICS_ENABLED:
+    # Admin only: the totals expose every route's traffic and latency
+    @app.get(
+        "/metrics",
+        response_class=PlainTextResponse,
+        include_in_schema=False,
+        dependencies=[Depends(get_admin_user)]
+    )
+    def metrics():
+        """Per-route request and SQL totals in Prometheus text format"""
+        return render_metrics()
+
 
 @app.get("/")
 def root():
@@ -4,9 +4,12 @@ Database models
 from app.models.user import User
 from app.models.car import Car, CarSpec, CarScore
 from app.models.favorite import Favorite
-from app.models.review import Review
+from app.models.review import Review, CarReviewStats
 from app.models.alert import Alert
 from app.models.price_history import PriceHistory
+from app.models.catalog_state import CatalogState
+from app.models.alert_agent_state import AlertAgentState
+from app.models.notification import Notification
 
 __all__ = [
     "User",
@@ -15,7 +18,11 @@ __all__ = [
     "CarScore",
     "Favorite",
     "Review",
+    "CarReviewStats",
     "Alert",
     "PriceHistory",
+    "CatalogState",
+    "AlertAgentState",
+    "Notification",
 ]
 
@@ -1,7 +1,7 @@
 """
 Alert model for price drop and listing alerts
 """
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -32,7 +32,16 @@ class Alert(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Index for the alert agent's per-type scans
+    __table_args__ = (
+        Index('ix_alerts_type_active', 'alert_type', 'is_active'),
+        # Set-based checks: join recent cars to the alerts for their make
+        Index('ix_alerts_type_active_make', 'alert_type', 'is_active', 'make'),
+    )
+    
     # Relationships
     user = relationship("User", back_populates="alerts")
     car = relationship("Car", foreign_keys=[car_id])
+    # Optional table (db_deploy migration): never loaded on delete, delete_alert removes the rows if the table exists
+    notifications = relationship("Notification", back_populates="alert", passive_deletes="all")
 
@@ -0,0 +1,19 @@
+"""
+Alert agent state model for incremental alert evaluation
+"""
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class AlertAgentState(Base):
+    """Single-row state: alert set version and the high-water marks of the last incremental run"""
+    __tablename__ = "alert_agent_state"
+
+    id = Column(Integer, primary_key=True)
+    # Bumped by every write path that changes alerts (invalidates in-memory alert indexes)
+    alerts_version = Column(Integer, nullable=False, default=0)
+    # Last Car.id / PriceHistory.id the agent has processed (NULL until the first run)
+    last_car_id = Column(Integer, nullable=True)
+    last_price_history_id = Column(Integer, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
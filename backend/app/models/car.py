@@ -1,7 +1,7 @@
 """
 Car models for listings and specifications
 """
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -30,12 +30,28 @@ class Car(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
+    # Indexes for listing filters + sorts (get_cars always filters on is_available;
+    # the trailing rowid also serves the id tie-breaker in cursor pagination)
+    __table_args__ = (
+        Index('ix_cars_available_created', 'is_available', 'created_at'),
+        Index('ix_cars_available_price', 'is_available', 'price'),
+        Index('ix_cars_available_year', 'is_available', 'year'),
+        Index('ix_cars_available_mileage', 'is_available', 'mileage'),
+        Index('ix_cars_available_fuel_created', 'is_available', 'fuel_type', 'created_at'),
+        Index('ix_cars_available_transmission_created', 'is_available', 'transmission', 'created_at'),
+        Index('ix_cars_available_condition_created', 'is_available', 'condition', 'created_at'),
+    )
+    
     # Relationships
     specs = relationship("CarSpec", back_populates="car", uselist=False, cascade="all, delete-orphan")
     scores = relationship("CarScore", back_populates="car", uselist=False, cascade="all, delete-orphan")
     favorites = relationship("Favorite", back_populates="car", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="car", cascade="all, delete-orphan")
+    # Optional table (db_deploy migration): never loaded on delete, delete_car removes the row if the table exists
+    review_stats = relationship("CarReviewStats", back_populates="car", uselist=False, passive_deletes="all")
     price_history = relationship("PriceHistory", back_populates="car", cascade="all, delete-orphan")
+    # Optional table (db_deploy migration): never loaded on delete, delete_car removes the rows if the table exists
+    notifications = relationship("Notification", back_populates="car", passive_deletes="all")
 
 
 class CarSpec(Base):
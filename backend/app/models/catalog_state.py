@@ -0,0 +1,15 @@
+"""
+Catalog state model for tracking changes to car listings
+"""
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class CatalogState(Base):
+    """Single-row version counter, bumped by every write path that changes car listings"""
+    __tablename__ = "catalog_state"
+    
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,44 @@
+"""
+Notification model for alert matches delivered to users
+"""
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, DateTime, Index, UniqueConstraint, text
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.database import Base
+
+
+class Notification(Base):
+    """An alert match materialized by the alert agent, read by GET /alerts/notifications"""
+    __tablename__ = "notifications"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    alert_id = Column(Integer, ForeignKey("alerts.id"), nullable=False)
+    car_id = Column(Integer, ForeignKey("cars.id"), nullable=False)
+    
+    alert_type = Column(String, nullable=False)  # Type of the alert that matched
+    message = Column(String, nullable=False)
+    price = Column(Float, nullable=False)  # Car price the match was found at
+    old_price = Column(Float, nullable=True)  # Baseline price, for price drops
+    
+    is_read = Column(Boolean, nullable=False, default=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    __table_args__ = (
+        # Dedup key: an alert reports a car once per price point, however often the agent runs
+        UniqueConstraint('alert_id', 'car_id', 'price', name='uq_notifications_alert_car_price'),
+        # A new listing is reported once per alert, whatever its price later does
+        Index(
+            'uq_notifications_new_listing', 'alert_id', 'car_id', unique=True,
+            sqlite_where=text("alert_type = 'new_listing'"),
+            postgresql_where=text("alert_type = 'new_listing'")
+        ),
+        # Newest-first pages and unread counts per user
+        Index('ix_notifications_user_id', 'user_id', 'id'),
+        Index('ix_notifications_user_read', 'user_id', 'is_read'),
+    )
+    
+    # Relationships
+    user = relationship("User", back_populates="notifications")
+    alert = relationship("Alert", back_populates="notifications")
+    car = relationship("Car", back_populates="notifications")
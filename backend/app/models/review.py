@@ -29,3 +29,37 @@ class Review(Base):
     car = relationship("Car", back_populates="reviews")
     user = relationship("User", back_populates="reviews")
 
+
+class CarReviewStats(Base):
+    """Per-car review aggregates, maintained incrementally by the review write paths"""
+    __tablename__ = "car_review_stats"
+    
+    car_id = Column(Integer, ForeignKey("cars.id"), primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    
+    # Star histogram: number of reviews with each rating
+    rating_1_count = Column(Integer, nullable=False, default=0)
+    rating_2_count = Column(Integer, nullable=False, default=0)
+    rating_3_count = Column(Integer, nullable=False, default=0)
+    rating_4_count = Column(Integer, nullable=False, default=0)
+    rating_5_count = Column(Integer, nullable=False, default=0)
+    
+    # Bumped on every review change (including AI summaries) so cached chat context can be revalidated
+    version = Column(Integer, nullable=False, default=0)
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    # Relationships
+    car = relationship("Car", back_populates="review_stats")
+    
+    @property
+    def average_rating(self):
+        """Mean rating, or None without reviews"""
+        return self.rating_sum / self.review_count if self.review_count else None
+    
+    @property
+    def rating_histogram(self):
+        """Number of reviews per star rating, {1: n, ..., 5: n}"""
+        return {stars: getattr(self, f"rating_{stars}_count") or 0 for stars in range(1, 6)}
+
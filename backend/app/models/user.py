@@ -25,4 +25,6 @@ class User(Base):
     favorites = relationship("Favorite", back_populates="user", cascade="all, delete-orphan")
     reviews = relationship("Review", back_populates="user", cascade="all, delete-orphan")
     alerts = relationship("Alert", back_populates="user", cascade="all, delete-orphan")
+    # Optional table (db_deploy migration): never loaded on delete
+    notifications = relationship("Notification", back_populates="user", passive_deletes="all")
 
@@ -2,7 +2,7 @@
 Car schemas for request/response validation
 """
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Any, Optional, List, Dict
 from datetime import datetime
 
 
@@ -86,13 +86,60 @@ class CarResponse(CarBase):
 class CarListResponse(BaseModel):
     """Car list response with pagination"""
     cars: List[CarResponse]
-    total: int
+    total: Optional[int]  # None in cursor mode (count is skipped)
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None  # Cursor mode only; None on the last page
+    facets: Optional[Dict[str, Dict[str, int]]] = None  # Only with include_facets=true
+
+
+class CarCardResponse(BaseModel):
+    """Listing card projection of a car (view=card)"""
+    id: int
+    make: str
+    model: str
+    year: int
+    price: float
+    mileage: int
+    fuel_type: str
+    transmission: str
+    location: Optional[str] = None
+    engine_condition: Optional[str] = None
+    image_url: Optional[str] = None  # First of image_urls
+    overall_score: Optional[float] = None  # From scores
+
+
+class CarFieldsListResponse(BaseModel):
+    """List of cars restricted to the requested fields (fields=... or view=card)"""
+    cars: List[Dict[str, Any]]
+    total: Optional[int]
+    page: int
+    page_size: int
+    total_pages: Optional[int]
+    next_cursor: Optional[str] = None
+    facets: Optional[Dict[str, Dict[str, int]]] = None
 
 
 class CarDetailResponse(CarResponse):
     """Car detail response with full information"""
     pass
 
+
+
+class CarIngestRecord(CarBase):
+    """One car in a bulk ingestion stream (NDJSON object or CSV row)"""
+    is_available: bool = True
+    specs: Optional[CarSpecBase] = None
+    scores: Optional[CarScoreBase] = None
+
+
+class CarIngestResponse(BaseModel):
+    """Outcome of a bulk ingestion"""
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: List[str]  # First few invalid records / failed batches
+    seconds: float
+    rows_per_second: float
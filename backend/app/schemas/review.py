@@ -2,7 +2,7 @@
 Review schemas for request/response validation
 """
 from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 
 
@@ -44,3 +44,16 @@ class ReviewListResponse(BaseModel):
     total: int
     average_rating: Optional[float] = None
 
+
+
+class CarReviewStatsResponse(BaseModel):
+    """Review aggregates of one car"""
+    car_id: int
+    review_count: int
+    average_rating: Optional[float] = None
+    rating_histogram: Dict[int, int] = Field(..., description="Number of reviews per star rating (1-5)")
+
+
+class ReviewStatsBatchResponse(BaseModel):
+    """Review aggregates for several cars, in request order"""
+    stats: List[CarReviewStatsResponse]
@@ -0,0 +1,58 @@
+"""
+Migration script to add alert_agent_state table (alert set version and incremental alert agent high-water marks)
+"""
+import sys
+import os
+import sqlite3
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+from app.core.config import settings
+
+def add_alert_agent_state_table():
+    """Add alert_agent_state table if it doesn't exist"""
+    db_path = settings.DATABASE_URL.replace("sqlite:///", "")
+    
+    if not os.path.exists(db_path):
+        print(f"Database file not found at {db_path}")
+        print("Run setup.py first to create the database.")
+        return
+    
+    print(f"Connecting to database: {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        # Check if table already exists
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='alert_agent_state'
+        """)
+        
+        if cursor.fetchone():
+            print("Table 'alert_agent_state' already exists. Skipping migration.")
+        else:
+            print("Creating 'alert_agent_state' table...")
+            cursor.execute("""
+                CREATE TABLE alert_agent_state (
+                    id INTEGER PRIMARY KEY,
+                    alerts_version INTEGER NOT NULL DEFAULT 0,
+                    last_car_id INTEGER,
+                    last_price_history_id INTEGER,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            # High-water marks stay NULL: the first incremental run does a full check and sets them
+            cursor.execute("INSERT INTO alert_agent_state (id, alerts_version) VALUES (1, 0)")
+            conn.commit()
+            print("Table 'alert_agent_state' created successfully!")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    add_alert_agent_state_table()
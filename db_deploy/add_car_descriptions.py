@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bac
 
 from app.db.database import SessionLocal
 from app.models import Car
+from app.core.catalog import bump_catalog_version
 
 def add_descriptions():
     """Add descriptions to cars"""
@@ -41,6 +42,7 @@ def add_descriptions():
                 car.description = f"A well-maintained {car.year} {car.make} {car.model}. This {car.condition} vehicle offers great value with {car.mileage:,} miles. Perfect for daily commuting and reliable transportation."
                 print(f"Updated {car.year} {key}: Added generic description")
         
+        bump_catalog_version(db)
         db.commit()
         print(f"\nSuccessfully updated {len(cars)} car descriptions")
         
@@ -0,0 +1,19 @@
+"""
+Migration script to add the full-text search index for car listings
+(FTS5 table + sync triggers on SQLite, GIN tsvector index on PostgreSQL)
+"""
+import sys
+import os
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+from app.db.database import engine
+from app.core.search import create_search_index
+
+if __name__ == "__main__":
+    print("Creating full-text search index for cars...")
+    if create_search_index(engine):
+        print("Full-text search index ready!")
+    else:
+        print("Full-text search index not created - search will use the ILIKE fallback.")
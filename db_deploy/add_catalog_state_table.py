@@ -0,0 +1,55 @@
+"""
+Migration script to add catalog_state table (catalog version counter)
+"""
+import sys
+import os
+import sqlite3
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+from app.core.config import settings
+
+def add_catalog_state_table():
+    """Add catalog_state table if it doesn't exist"""
+    db_path = settings.DATABASE_URL.replace("sqlite:///", "")
+    
+    if not os.path.exists(db_path):
+        print(f"Database file not found at {db_path}")
+        print("Run setup.py first to create the database.")
+        return
+    
+    print(f"Connecting to database: {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        # Check if table already exists
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='catalog_state'
+        """)
+        
+        if cursor.fetchone():
+            print("Table 'catalog_state' already exists. Skipping migration.")
+        else:
+            print("Creating 'catalog_state' table...")
+            cursor.execute("""
+                CREATE TABLE catalog_state (
+                    id INTEGER PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            cursor.execute("INSERT INTO catalog_state (id, version) VALUES (1, 0)")
+            conn.commit()
+            print("Table 'catalog_state' created successfully!")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    add_catalog_state_table()
@@ -0,0 +1,111 @@
+"""
+Migration script to add notifications table (alert matches materialized by the alert agent)
+A new table is filled with one full alert agent pass, so existing users see their
+current matches right away instead of after the agent's next full run.
+"""
+import sys
+import os
+import sqlite3
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+from app.core.config import settings
+
+
+def backfill_notifications():
+    """Store the matches of one full alert agent run"""
+    from app.db.database import SessionLocal
+    from app.api.v1.alerts import deliver_alert_matches, run_alert_agent
+
+    db = SessionLocal()
+    try:
+        result = run_alert_agent(db)
+        deliver_alert_matches(db, result["matches"])
+        print(f"Stored {result['matches_found']} alert matches as notifications.")
+    finally:
+        db.close()
+
+
+def ensure_new_listing_index(cursor):
+    """Report a new listing once per alert: unique (alert_id, car_id) for new_listing rows"""
+    cursor.execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='index' AND name='uq_notifications_new_listing'
+    """)
+    if cursor.fetchone():
+        return
+    # Keep the first notification of each new listing reported more than once
+    cursor.execute("""
+        DELETE FROM notifications
+        WHERE alert_type = 'new_listing' AND id NOT IN (
+            SELECT MIN(id) FROM notifications WHERE alert_type = 'new_listing' GROUP BY alert_id, car_id
+        )
+    """)
+    if cursor.rowcount:
+        print(f"Removed {cursor.rowcount} repeated new listing notifications.")
+    cursor.execute("""
+        CREATE UNIQUE INDEX uq_notifications_new_listing ON notifications (alert_id, car_id)
+        WHERE alert_type = 'new_listing'
+    """)
+    print("Index 'uq_notifications_new_listing' created.")
+
+
+def add_notifications_table():
+    """Add notifications table if it doesn't exist"""
+    db_path = settings.DATABASE_URL.replace("sqlite:///", "")
+    
+    if not os.path.exists(db_path):
+        print(f"Database file not found at {db_path}")
+        print("Run setup.py first to create the database.")
+        return
+    
+    print(f"Connecting to database: {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        # Check if table already exists
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='notifications'
+        """)
+        
+        if cursor.fetchone():
+            print("Table 'notifications' already exists. Skipping table creation.")
+            ensure_new_listing_index(cursor)
+            conn.commit()
+        else:
+            print("Creating 'notifications' table...")
+            cursor.execute("""
+                CREATE TABLE notifications (
+                    id INTEGER PRIMARY KEY,
+                    user_id INTEGER NOT NULL REFERENCES users(id),
+                    alert_id INTEGER NOT NULL REFERENCES alerts(id),
+                    car_id INTEGER NOT NULL REFERENCES cars(id),
+                    alert_type VARCHAR NOT NULL,
+                    message VARCHAR NOT NULL,
+                    price FLOAT NOT NULL,
+                    old_price FLOAT,
+                    is_read BOOLEAN NOT NULL DEFAULT 0,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    CONSTRAINT uq_notifications_alert_car_price UNIQUE (alert_id, car_id, price)
+                )
+            """)
+            cursor.execute("CREATE INDEX ix_notifications_id ON notifications (id)")
+            cursor.execute("CREATE INDEX ix_notifications_user_id ON notifications (user_id, id)")
+            cursor.execute("CREATE INDEX ix_notifications_user_read ON notifications (user_id, is_read)")
+            ensure_new_listing_index(cursor)
+            conn.commit()
+            print("Table 'notifications' created successfully!")
+            print("Backfilling from a full alert agent run...")
+            backfill_notifications()
+            
+    except Exception as e:
+        print(f"Error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    add_notifications_table()
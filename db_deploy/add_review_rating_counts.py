@@ -0,0 +1,82 @@
+"""
+Migration script to add per-star rating counts to car_review_stats
+"""
+import sys
+import os
+import sqlite3
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+from app.core.config import settings
+
+RATING_COUNT_COLUMNS = [f"rating_{stars}_count" for stars in range(1, 6)]
+
+def add_review_rating_counts():
+    """Add rating_1_count..rating_5_count to car_review_stats and recompute all aggregates from reviews"""
+    db_path = settings.DATABASE_URL.replace("sqlite:///", "")
+    
+    if not os.path.exists(db_path):
+        print(f"Database file not found at {db_path}")
+        print("Run setup.py first to create the database.")
+        return
+    
+    print(f"Connecting to database: {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='car_review_stats'
+        """)
+        if not cursor.fetchone():
+            print("Table 'car_review_stats' not found. Run add_review_stats_table.py first.")
+            return
+        
+        cursor.execute("PRAGMA table_info(car_review_stats)")
+        existing = {row[1] for row in cursor.fetchall()}
+        missing = [column for column in RATING_COUNT_COLUMNS if column not in existing]
+        if not missing:
+            print("Rating count columns already exist. Skipping migration.")
+            return
+        
+        for column in missing:
+            print(f"Adding column '{column}'...")
+            cursor.execute(f"ALTER TABLE car_review_stats ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0")
+        
+        # Recompute every reviewed car's aggregates so the histogram matches count and sum
+        # (versions move forward, so contexts cached against the old stats are rebuilt)
+        cursor.execute("""
+            INSERT INTO car_review_stats (
+                car_id, review_count, rating_sum,
+                rating_1_count, rating_2_count, rating_3_count, rating_4_count, rating_5_count,
+                version
+            )
+            SELECT car_id, COUNT(*), SUM(rating),
+                   SUM(rating = 1), SUM(rating = 2), SUM(rating = 3), SUM(rating = 4), SUM(rating = 5),
+                   1
+            FROM reviews
+            WHERE true  -- required by SQLite to parse ON CONFLICT after a SELECT
+            GROUP BY car_id
+            ON CONFLICT(car_id) DO UPDATE SET
+                review_count = excluded.review_count,
+                rating_sum = excluded.rating_sum,
+                rating_1_count = excluded.rating_1_count,
+                rating_2_count = excluded.rating_2_count,
+                rating_3_count = excluded.rating_3_count,
+                rating_4_count = excluded.rating_4_count,
+                rating_5_count = excluded.rating_5_count,
+                version = car_review_stats.version + 1
+        """)
+        conn.commit()
+        print(f"Rating count columns added successfully! ({cursor.rowcount} cars with reviews)")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    add_review_rating_counts()
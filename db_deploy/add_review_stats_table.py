@@ -0,0 +1,75 @@
+"""
+Migration script to add car_review_stats table (per-car review aggregates)
+"""
+import sys
+import os
+import sqlite3
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'backend'))
+
+from app.core.config import settings
+
+def add_review_stats_table():
+    """Add car_review_stats table if it doesn't exist, filled from existing reviews"""
+    db_path = settings.DATABASE_URL.replace("sqlite:///", "")
+    
+    if not os.path.exists(db_path):
+        print(f"Database file not found at {db_path}")
+        print("Run setup.py first to create the database.")
+        return
+    
+    print(f"Connecting to database: {db_path}")
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    
+    try:
+        # Check if table already exists
+        cursor.execute("""
+            SELECT name FROM sqlite_master 
+            WHERE type='table' AND name='car_review_stats'
+        """)
+        
+        if cursor.fetchone():
+            print("Table 'car_review_stats' already exists. Skipping migration.")
+        else:
+            print("Creating 'car_review_stats' table...")
+            cursor.execute("""
+                CREATE TABLE car_review_stats (
+                    car_id INTEGER PRIMARY KEY REFERENCES cars(id),
+                    review_count INTEGER NOT NULL DEFAULT 0,
+                    rating_sum INTEGER NOT NULL DEFAULT 0,
+                    rating_1_count INTEGER NOT NULL DEFAULT 0,
+                    rating_2_count INTEGER NOT NULL DEFAULT 0,
+                    rating_3_count INTEGER NOT NULL DEFAULT 0,
+                    rating_4_count INTEGER NOT NULL DEFAULT 0,
+                    rating_5_count INTEGER NOT NULL DEFAULT 0,
+                    version INTEGER NOT NULL DEFAULT 0,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Backfill aggregates for cars that already have reviews
+            cursor.execute("""
+                INSERT INTO car_review_stats (
+                    car_id, review_count, rating_sum,
+                    rating_1_count, rating_2_count, rating_3_count, rating_4_count, rating_5_count,
+                    version
+                )
+                SELECT car_id, COUNT(*), SUM(rating),
+                       SUM(rating = 1), SUM(rating = 2), SUM(rating = 3), SUM(rating = 4), SUM(rating = 5),
+                       1
+                FROM reviews
+                GROUP BY car_id
+            """)
+            conn.commit()
+            print(f"Table 'car_review_stats' created successfully! ({cursor.rowcount} cars with reviews)")
+            
+    except Exception as e:
+        print(f"Error: {e}")
+        conn.rollback()
+    finally:
+        conn.close()
+
+if __name__ == "__main__":
+    add_review_stats_table()
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bac
 
 from app.db.database import SessionLocal
 from app.models import Car
+from app.core.catalog import bump_catalog_version
 
 def assign_car_images():
     """Assign local images to cars based on make/model/year"""
@@ -110,6 +111,7 @@ def assign_car_images():
             updated_count += 1
             print(f"[OK] Assigned {selected_image} to {car.year} {car.make} {car.model} (ID: {car.id})")
         
+        bump_catalog_version(db)
         db.commit()
         print(f"\n[SUCCESS] Updated {updated_count} cars with local images")
         
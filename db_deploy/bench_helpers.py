@@ -0,0 +1,74 @@
+"""
+Helpers shared by the benchmark_*.py scripts
+
+seed_cars imports the app lazily, so call it only after the script has set its
+environment (DATABASE_URL etc.) and put backend on sys.path.
+"""
+import random
+import socket
+from datetime import datetime, timedelta
+
+MAKES = ["Toyota", "Honda", "Ford", "BMW", "Kia", "Tesla", "Hyundai", "Audi"]
+FUEL_TYPES = ["gasoline", "diesel", "electric", "hybrid"]
+
+
+def seed_cars(n_cars: int, vin_prefix: str, rng_seed: int, **columns):
+    """
+    Create the schema and bulk-insert n_cars available cars, each with a spec and a score
+
+    Args:
+        vin_prefix: Prefix of the generated VINs (keeps seeded databases tellable apart)
+        rng_seed: Seed for the random makes, models, years, prices and mileages
+        columns: Extra car columns set on every row, e.g. location or description
+    """
+    from sqlalchemy import insert
+    from app.db.database import engine, Base
+    from app.models import Car, CarSpec, CarScore  # Importing app.models registers every model with Base
+
+    Base.metadata.create_all(bind=engine)
+    rnd = random.Random(rng_seed)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Car), [
+            {
+                "make": rnd.choice(MAKES),
+                "model": f"Model {rnd.randint(1, 8)}",
+                "year": rnd.randint(2012, 2025),
+                "price": float(rnd.randint(8, 120) * 1000),
+                "mileage": rnd.randint(0, 150000),
+                "fuel_type": rnd.choice(FUEL_TYPES),
+                "transmission": "automatic",
+                "condition": "used",
+                "vin": f"{vin_prefix}{i:09d}",
+                "is_available": True,
+                "created_at": now - timedelta(minutes=i),
+                **columns,
+            }
+            for i in range(n_cars)
+        ])
+        conn.execute(insert(CarSpec), [
+            {"car_id": car_id, "horsepower": 200, "drivetrain": "AWD", "seating_capacity": 5}
+            for car_id in range(1, n_cars + 1)
+        ])
+        conn.execute(insert(CarScore), [
+            {"car_id": car_id, "overall_score": 8.0, "safety_score": 9.1, "reliability_score": 7.5}
+            for car_id in range(1, n_cars + 1)
+        ])
+
+
+def free_port() -> int:
+    """A local TCP port nothing is listening on"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def report(label: str, latencies: list, errors: int = 0, seconds: float = None):
+    """Print p50/p99 latency (seconds in, ms out), plus throughput when the run length is given"""
+    if not latencies:
+        print(f"{label:<22} no successful requests ({errors} errors)")
+        return
+    latencies = sorted(latencies)
+    throughput = f"{len(latencies) / seconds:8.1f} req/s   " if seconds else ""
+    print(f"{label:<22} {throughput}p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms   {errors} errors")
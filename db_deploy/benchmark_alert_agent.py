@@ -0,0 +1,524 @@
+"""
+Benchmark for the alert agent: set-based checks vs the original per-alert loops
+
+Seeds a throwaway SQLite database with a large inventory, price history and alert
+set, runs check_price_drop_alerts, check_favorited_cars_price_drops and
+check_new_listing_alerts, and compares them (time, SQL statements, results) with
+the original implementations, kept below as references. Then applies a batch of
+changes (new listings, price cuts and a few increases) and times the incremental
+agent, which only looks at changed cars, against a full run. Last, a user's notifications page read
+from the stored matches is timed against recomputing it per alert. Exits with
+status 1 if any check returns different matches, or if the incremental run doesn't
+report exactly the full run's matches for the new cars and the price_drop matches
+for the cut ones (nothing for repriced-up cars).
+
+Usage:
+    python benchmark_alert_agent.py [--cars 50000] [--alerts 100000] [--new-cars 20] [--repriced 200]
+"""
+import sys
+import os
+import argparse
+import gc
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Point the app at a throwaway database before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_alerts_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/alerts.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy import desc, event, insert
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal, engine, Base
+from app.models import Alert, Car, Notification, PriceHistory, User
+from app.api.v1.alerts import (
+    check_favorited_cars_price_drops,
+    check_new_listing_alerts,
+    check_price_drop_alerts,
+    deliver_alert_matches,
+    get_notifications,
+    previous_prices,
+    run_alert_agent,
+    run_incremental_alert_agent,
+)
+from app.core.alert_index import alert_indexes
+
+MAKES = [
+    "Toyota", "Honda", "Ford", "BMW", "Kia", "Mercedes-Benz", "Tesla", "Hyundai",
+    "Audi", "Chevrolet", "Nissan", "Mazda", "Subaru", "Volkswagen", "Lexus", "Jeep",
+    "Volvo", "Porsche", "Dodge", "GMC", "Acura", "Infiniti", "Genesis", "Mini",
+]
+MODELS = ["Sedan", "SUV", "Coupe", "Wagon"]
+FUEL_TYPES = ["gasoline", "diesel", "electric", "hybrid"]
+TRANSMISSIONS = ["automatic", "manual", "CVT"]
+
+
+def seed(n_cars: int, n_alerts: int):
+    """Create the schema and bulk-insert cars, price history and alerts"""
+    Base.metadata.create_all(bind=engine)
+
+    rnd = random.Random(7)
+    now = datetime.utcnow()
+    cars, history, priced_cars = [], [], []
+    for i in range(n_cars):
+        created_at = now - timedelta(minutes=rnd.randint(0, 365 * 24 * 60))
+        price = float(rnd.randint(8, 120) * 1000)
+        cars.append({
+            "make": rnd.choice(MAKES),
+            "model": rnd.choice(MODELS),
+            "year": rnd.randint(2012, 2025),
+            "price": price,
+            "mileage": rnd.randint(0, 150000),
+            "fuel_type": rnd.choice(FUEL_TYPES),
+            "transmission": rnd.choice(TRANSMISSIONS),
+            "condition": "used",
+            "vin": f"ALRT{i:09d}",
+            "is_available": rnd.random() < 0.9,
+            "created_at": created_at,
+        })
+        # Some cars have older, higher (or equal) prices on record
+        if rnd.random() < 0.3:
+            car_id = i + 1
+            priced_cars.append(car_id)
+            for _ in range(rnd.randint(1, 3)):
+                history.append({
+                    "car_id": car_id,
+                    "price": price + rnd.choice([0, 0, 500, 2000, 5000]),
+                    "recorded_at": created_at + (now - created_at) * rnd.random() * 0.9,
+                })
+
+    alerts = []
+    for i in range(n_alerts):
+        created_at = now - timedelta(minutes=rnd.randint(0, 3 * 24 * 60))
+        alert = {"user_id": 1, "is_active": rnd.random() < 0.95, "created_at": created_at}
+        if rnd.random() < 0.5:
+            alert.update({
+                "alert_type": "new_listing",
+                "make": rnd.choice(MAKES) if rnd.random() < 0.8 else None,
+                "model": rnd.choice(MODELS) if rnd.random() < 0.4 else None,
+                "max_price": float(rnd.randint(20, 80) * 1000) if rnd.random() < 0.5 else None,
+                "min_year": rnd.randint(2015, 2022) if rnd.random() < 0.3 else None,
+                "max_mileage": rnd.randint(20000, 100000) if rnd.random() < 0.3 else None,
+                "fuel_type": rnd.choice(FUEL_TYPES) if rnd.random() < 0.3 else None,
+            })
+        elif rnd.random() < 0.99:
+            alert.update({"alert_type": "price_drop", "car_id": rnd.choice(priced_cars)})
+        else:
+            alert.update({
+                "alert_type": "price_drop",
+                "make": rnd.choice(MAKES),
+                "model": rnd.choice(MODELS),
+                "max_price": float(rnd.randint(20, 80) * 1000),
+            })
+        alerts.append(alert)
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "alerts@example.com", "hashed_password": "x"}])
+        for start in range(0, len(cars), 5000):
+            conn.execute(insert(Car), cars[start:start + 5000])
+        for start in range(0, len(history), 5000):
+            conn.execute(insert(PriceHistory), history[start:start + 5000])
+        for start in range(0, len(alerts), 5000):
+            conn.execute(insert(Alert), [
+                {key: alert.get(key) for key in (
+                    "user_id", "alert_type", "car_id", "make", "model", "max_price",
+                    "min_year", "max_mileage", "fuel_type", "is_active", "created_at"
+                )}
+                for alert in alerts[start:start + 5000]
+            ])
+    return len(history)
+
+
+# ---------------------------------------------------------------------------
+# Reference implementations: the original per-alert loops
+# ---------------------------------------------------------------------------
+
+def legacy_check_favorited_cars_price_drops(db: Session):
+    """Original check_favorited_cars_price_drops"""
+    alerts = db.query(Alert).filter(
+        Alert.alert_type == "price_drop",
+        Alert.car_id.isnot(None),
+        Alert.is_active == True
+    ).all()
+    
+    matches = []
+    for alert in alerts:
+        car = db.query(Car).filter(Car.id == alert.car_id).first()
+        if not car:
+            continue
+        
+        price_record = db.query(PriceHistory).filter(
+            PriceHistory.car_id == car.id,
+            PriceHistory.recorded_at <= alert.created_at
+        ).order_by(desc(PriceHistory.recorded_at)).first()
+        
+        if price_record and car.price < price_record.price:
+            drop = price_record.price - car.price
+            drop_percent = (drop / price_record.price * 100) if price_record.price > 0 else 0
+            if drop_percent >= 1.0:
+                matches.append({
+                    "alert_id": alert.id,
+                    "user_id": alert.user_id,
+                    "car_id": car.id,
+                    "message": f"Price drop: {car.make} {car.model} dropped ${drop:,.0f} ({drop_percent:.1f}%)"
+                })
+    
+    return matches
+
+
+def legacy_check_price_drop_alerts(db: Session):
+    """Original check_price_drop_alerts"""
+    alerts = db.query(Alert).filter(
+        Alert.alert_type == "price_drop",
+        Alert.is_active == True
+    ).all()
+    
+    matches = []
+    for alert in alerts:
+        if alert.car_id:
+            car = db.query(Car).filter(Car.id == alert.car_id).first()
+            if not car:
+                continue
+            
+            price_record = db.query(PriceHistory).filter(
+                PriceHistory.car_id == car.id,
+                PriceHistory.recorded_at < alert.created_at
+            ).order_by(desc(PriceHistory.recorded_at)).first()
+            
+            if price_record and car.price < price_record.price:
+                drop = price_record.price - car.price
+                matches.append({
+                    "alert_id": alert.id,
+                    "user_id": alert.user_id,
+                    "car_id": car.id,
+                    "message": f"Price drop: {car.make} {car.model} dropped ${drop:,.0f}"
+                })
+        else:
+            query = db.query(Car).filter(Car.is_available == True)
+            if alert.make:
+                query = query.filter(Car.make == alert.make)
+            if alert.model:
+                query = query.filter(Car.model == alert.model)
+            if alert.max_price:
+                query = query.filter(Car.price <= alert.max_price)
+            
+            for car in query.all():
+                matches.append({
+                    "alert_id": alert.id,
+                    "user_id": alert.user_id,
+                    "car_id": car.id,
+                    "message": f"Match: {car.make} {car.model} - ${car.price:,.0f}"
+                })
+    
+    return matches
+
+
+def legacy_check_new_listing_alerts(db: Session):
+    """Original check_new_listing_alerts"""
+    # Get all active new_listing alerts
+    alerts = db.query(Alert).filter(
+        Alert.alert_type == "new_listing",
+        Alert.is_active == True
+    ).all()
+    
+    matches = []
+    
+    for alert in alerts:
+        query = db.query(Car).filter(Car.is_available == True)
+        
+        # Only check cars created after alert was created
+        if alert.created_at:
+            query = query.filter(Car.created_at >= alert.created_at)
+        
+        if alert.make:
+            query = query.filter(Car.make == alert.make)
+        if alert.model:
+            query = query.filter(Car.model == alert.model)
+        if alert.max_price:
+            query = query.filter(Car.price <= alert.max_price)
+        if alert.min_year:
+            query = query.filter(Car.year >= alert.min_year)
+        if alert.max_mileage:
+            query = query.filter(Car.mileage <= alert.max_mileage)
+        if alert.fuel_type:
+            query = query.filter(Car.fuel_type == alert.fuel_type)
+        
+        cars = query.all()
+        
+        for car in cars:
+            matches.append({
+                "alert_id": alert.id,
+                "user_id": alert.user_id,
+                "car_id": car.id,
+                "message": f"New listing alert: {car.make} {car.model} - ${car.price:,.0f}"
+            })
+    
+    return matches
+
+
+def legacy_get_price_drop_notifications(db: Session, user_id: int):
+    """Original GET /alerts/notifications: recomputed price drops for one user's alerts"""
+    alerts = db.query(Alert).filter(
+        Alert.user_id == user_id,
+        Alert.alert_type == "price_drop",
+        Alert.is_active == True
+    ).all()
+    
+    notifications = []
+    for alert in alerts:
+        if alert.car_id:
+            car = db.query(Car).filter(Car.id == alert.car_id).first()
+            if not car:
+                continue
+            
+            price_at_alert = db.query(PriceHistory).filter(
+                PriceHistory.car_id == car.id,
+                PriceHistory.recorded_at < alert.created_at
+            ).order_by(desc(PriceHistory.recorded_at)).first()
+            
+            if not price_at_alert:
+                recent_price = db.query(PriceHistory).filter(
+                    PriceHistory.car_id == car.id
+                ).order_by(desc(PriceHistory.recorded_at)).first()
+                if not recent_price:
+                    continue
+                baseline_price = recent_price.price
+            else:
+                baseline_price = price_at_alert.price
+            
+            if car.price < baseline_price:
+                notifications.append({"alert_id": alert.id, "car_id": car.id, "new_price": car.price})
+        else:
+            query = db.query(Car).filter(Car.is_available == True)
+            if alert.make:
+                query = query.filter(Car.make == alert.make)
+            if alert.model:
+                query = query.filter(Car.model == alert.model)
+            if alert.max_price:
+                query = query.filter(Car.price <= alert.max_price)
+            
+            for car in query.all():
+                price_at_alert = db.query(PriceHistory).filter(
+                    PriceHistory.car_id == car.id,
+                    PriceHistory.recorded_at < alert.created_at
+                ).order_by(desc(PriceHistory.recorded_at)).first()
+                
+                if price_at_alert and car.price < price_at_alert.price:
+                    notifications.append({"alert_id": alert.id, "car_id": car.id, "new_price": car.price})
+    
+    return {"notifications": notifications, "count": len(notifications)}
+
+
+def run(fn, db: Session):
+    """Run fn(db); return (matches, seconds, SQL statements executed)"""
+    statements = [0]
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements[0] += 1
+
+    # Like timeit: no garbage collection pauses (large ORM result sets otherwise
+    # make the timings depend on whatever earlier checks left on the heap)
+    gc.collect()
+    gc.disable()
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        started = time.perf_counter()
+        matches = fn(db)
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+        gc.enable()
+    return matches, elapsed, statements[0]
+
+
+def key(matches):
+    """Order-independent form of a match list"""
+    return sorted((m["alert_id"], m["car_id"], m["user_id"], m["message"]) for m in matches)
+
+
+def apply_changes(rnd: random.Random, n_new: int, n_repriced: int):
+    """
+    List new cars and change prices the way the API does (one in ten goes up)
+
+    Returns:
+        (new car IDs, IDs of cars now below their last recorded price)
+    """
+    db = SessionLocal()
+    try:
+        max_id = db.query(Car.id).order_by(desc(Car.id)).first()[0]
+        repriced = rnd.sample(range(1, max_id + 1), n_repriced)
+        # Seeded history doesn't always end at the listing price; the agent compares to the history
+        last_history_id = db.query(PriceHistory.id).order_by(desc(PriceHistory.id)).first()[0]
+        recorded = previous_prices(db, repriced, before_history_id=last_history_id)
+        new, cut = set(), set()
+        for car in db.query(Car).filter(Car.id.in_(repriced)):
+            factor = rnd.uniform(1.02, 1.2) if rnd.random() < 0.1 else rnd.uniform(0.8, 0.98)
+            car.price = float(round(car.price * factor))
+            if car.id in recorded and car.price < recorded[car.id]:
+                cut.add(car.id)
+            db.add(PriceHistory(car_id=car.id, price=car.price))
+        for i in range(n_new):
+            car = Car(
+                make=rnd.choice(MAKES), model=rnd.choice(MODELS), year=rnd.randint(2012, 2025),
+                price=float(rnd.randint(8, 120) * 1000), mileage=rnd.randint(0, 150000),
+                fuel_type=rnd.choice(FUEL_TYPES), transmission=rnd.choice(TRANSMISSIONS),
+                condition="used", vin=f"NEW{max_id + i:09d}", created_at=datetime.utcnow()
+            )
+            db.add(car)
+            db.flush()
+            db.add(PriceHistory(car_id=car.id, price=car.price))
+            new.add(car.id)
+        db.commit()
+        return new, cut
+    finally:
+        db.close()
+
+
+def benchmark_single_car_lookups(n_lookups: int = 2000):
+    """Time matching one changed car against the in-memory alert index"""
+    db = SessionLocal()
+    try:
+        index = alert_indexes.get(db)
+        cars = db.query(Car).filter(Car.id.in_(random.Random(5).sample(range(1, db.query(Car).count() + 1), n_lookups))).all()
+        timings, matched = [], 0
+        for car in cars:
+            started = time.perf_counter()
+            matched += len(index.match(car))
+            timings.append((time.perf_counter() - started) * 1e6)
+        timings.sort()
+        print(f"single-car alert lookup ({len(index):,} alerts indexed, {len(cars):,} cars)")
+        print(f"  p50 {timings[len(timings) // 2]:.0f} us   p99 {timings[int(len(timings) * 0.99)]:.0f} us   "
+              f"{matched / len(cars):.0f} matching alerts per car")
+    finally:
+        db.close()
+
+
+def benchmark_notifications(n_alerts: int = 200):
+    """Time a user's notifications page: recomputed per alert vs read from stored agent matches"""
+    db = SessionLocal()
+    try:
+        # Give a second user a realistic number of price_drop alerts
+        user = User(email="notify@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        alert_ids = [row[0] for row in db.query(Alert.id).filter(
+            Alert.alert_type == "price_drop", Alert.is_active == True
+        ).order_by(Alert.id)]
+        db.query(Alert).filter(Alert.id.in_(random.Random(3).sample(alert_ids, n_alerts))).update(
+            {Alert.user_id: user.id}, synchronize_session=False
+        )
+        db.commit()
+
+        result = run_alert_agent(db)
+        deliver_alert_matches(db, result["matches"])
+        stored = db.query(Notification).count()
+        deliver_alert_matches(db, result["matches"])
+        print(f"notifications ({result['matches_found']:,} agent matches, {stored:,} stored, "
+              f"{db.query(Notification).count() - stored} added by a repeated delivery)")
+
+        legacy, legacy_time, legacy_statements = run(lambda db: legacy_get_price_drop_notifications(db, user.id), db)
+        page, page_time, page_statements = run(
+            lambda db: get_notifications(skip=0, limit=20, unread_only=False, current_user=user, db=db), db
+        )
+        print(f"  recomputed: {legacy_time:8.3f}s  {legacy_statements:>7,} statements  {legacy['count']:>6,} price drops")
+        print(f"  stored:     {page_time:8.3f}s  {page_statements:>7,} statements  {page.total:>6,} notifications "
+              f"({page.unread_count:,} unread, {page.count} on the page)")
+    finally:
+        db.close()
+
+
+def benchmark_incremental(n_new: int, n_repriced: int) -> bool:
+    """Time incremental runs after a batch of changes; returns whether they matched the full run"""
+    rnd = random.Random(11)
+    db = SessionLocal()
+    try:
+        # First run has no high-water mark: full check, then marks are recorded
+        first, first_time, _ = run(run_incremental_alert_agent, db)
+        print(f"incremental agent ({n_new} new cars, {n_repriced} repriced per batch)")
+        print(f"  first run ({first['mode']}): {first_time:8.2f}s  {first['matches_found']:>8,} matches")
+
+        ok = True
+        for label in ("cold index", "warm index"):
+            new, cut = apply_changes(rnd, n_new, n_repriced)
+            db.expire_all()
+            result, inc_time, inc_statements = run(run_incremental_alert_agent, db)
+            full, full_time, full_statements = run(run_alert_agent, db)
+            # Cars already reported are only reported again for a price cut
+            expected = [
+                m for m in full["matches"]
+                if m["car_id"] in new or (m["car_id"] in cut and m["alert_type"] == "price_drop")
+            ]
+            same = key(result["matches"]) == key(expected)
+            ok = ok and same
+            print(f"  {label}: {inc_time:8.2f}s  {inc_statements:>3} statements  "
+                  f"{result['cars_checked']:>5,} cars  {result['matches_found']:>7,} matches")
+            print(f"    full run: {full_time:8.2f}s  {full_statements:>3} statements  "
+                  f"speedup {full_time / inc_time if inc_time else float('inf'):.1f}x, "
+                  f"results {'identical for new and cut cars' if same else 'DIFFER'}")
+        return ok
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the set-based alert agent against the per-alert loops")
+    parser.add_argument("--cars", type=int, default=50000, help="Number of cars to seed")
+    parser.add_argument("--alerts", type=int, default=100000, help="Number of alerts to seed")
+    parser.add_argument("--new-cars", type=int, default=20, help="Cars listed per incremental batch")
+    parser.add_argument("--repriced", type=int, default=200, help="Price cuts per incremental batch")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Alert Agent Benchmark")
+    print("=" * 60)
+    print(f"Seeding {args.cars:,} cars and {args.alerts:,} alerts into {_tmp_dir}...")
+    n_history = seed(args.cars, args.alerts)
+    print(f"  ({n_history:,} price history rows)\n")
+
+    checks = [
+        ("check_price_drop_alerts", check_price_drop_alerts, legacy_check_price_drop_alerts),
+        ("check_favorited_cars_price_drops", check_favorited_cars_price_drops, legacy_check_favorited_cars_price_drops),
+        ("check_new_listing_alerts", check_new_listing_alerts, legacy_check_new_listing_alerts),
+    ]
+
+    mismatches = 0
+    total_old = total_new = 0.0
+    for name, new_fn, old_fn in checks:
+        db = SessionLocal()
+        try:
+            old_matches, old_time, old_statements = run(old_fn, db)
+            db.expunge_all()
+            new_matches, new_time, new_statements = run(new_fn, db)
+        finally:
+            db.close()
+
+        total_old += old_time
+        total_new += new_time
+        same = key(old_matches) == key(new_matches)
+        mismatches += not same
+        print(f"{name}")
+        print(f"  per-alert: {old_time:8.2f}s  {old_statements:>7,} statements  {len(old_matches):>8,} matches")
+        print(f"  set-based: {new_time:8.2f}s  {new_statements:>7,} statements  {len(new_matches):>8,} matches")
+        print(f"  speedup {old_time / new_time if new_time else float('inf'):.1f}x, results {'identical' if same else 'DIFFER'}\n")
+
+    print(f"Full agent run: {total_old:.2f}s -> {total_new:.2f}s ({total_old / total_new if total_new else float('inf'):.1f}x)\n")
+
+    mismatches += not benchmark_incremental(args.new_cars, args.repriced)
+    print()
+    benchmark_single_car_lookups()
+    print()
+    benchmark_notifications()
+
+    if mismatches:
+        print(f"\n[FAIL] {mismatches} checks returned different matches")
+        sys.exit(1)
+    print("\n[OK] Set-based checks return identical matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Load test for the async read routes: requests/sec and latency at high concurrency
+
+Serves the app with uvicorn on a throwaway SQLite database and drives the hot read
+endpoints (car list, car detail, makes, fuel types, car reviews) from a separate
+process with many concurrent connections. The same mix is sent to the async routes
+(AsyncSession) and to the original sync implementations (Session via get_db, run in
+the threadpool), kept below as references and mounted under /legacy.
+
+Runs with the app's pool settings unless --pool-size/--max-overflow are given; with
+fewer connections than requests in flight the sync routes stall until DB_POOL_TIMEOUT.
+
+Usage:
+    python benchmark_async_routes.py [--cars 20000] [--concurrency 128] [--seconds 15]
+                                     [--pool-size N] [--max-overflow N]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import multiprocessing
+import random
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from bench_helpers import free_port, report
+
+# Configure the app before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_async_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+MAKES = ["Toyota", "Honda", "Ford", "BMW", "Kia", "Tesla", "Hyundai", "Audi", "Mazda", "Volvo"]
+FUEL_TYPES = ["gasoline", "diesel", "electric", "hybrid"]
+
+
+def seed(n_cars: int):
+    """Create the schema and bulk-insert cars with specs, scores and reviews"""
+    from sqlalchemy import insert
+    from app.db.database import engine, Base
+    from app.models import Car, CarSpec, CarScore, Review, User
+
+    Base.metadata.create_all(bind=engine)
+    rnd = random.Random(7)
+    now = datetime.utcnow()
+    cars = [
+        {
+            "make": rnd.choice(MAKES),
+            "model": f"Model {rnd.randint(1, 8)}",
+            "year": rnd.randint(2012, 2025),
+            "price": float(rnd.randint(8, 120) * 1000),
+            "mileage": rnd.randint(0, 150000),
+            "fuel_type": rnd.choice(FUEL_TYPES),
+            "transmission": "automatic",
+            "condition": "used",
+            "description": f"Listing {i}",
+            "vin": f"ASYNC{i:09d}",
+            "is_available": True,
+            "created_at": now - timedelta(minutes=rnd.randint(0, 500000)),
+        }
+        for i in range(n_cars)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "async@example.com", "hashed_password": "x"}])
+        for start in range(0, n_cars, 5000):
+            conn.execute(insert(Car), cars[start:start + 5000])
+            ids = range(start + 1, min(start + 5000, n_cars) + 1)
+            conn.execute(insert(CarSpec), [{"car_id": car_id, "horsepower": rnd.randint(100, 500)} for car_id in ids])
+            conn.execute(insert(CarScore), [{"car_id": car_id, "overall_score": rnd.uniform(5, 10)} for car_id in ids])
+        conn.execute(insert(Review), [
+            {
+                "car_id": rnd.randint(1, n_cars), "user_id": 1, "rating": rnd.randint(1, 5),
+                "title": "Review", "content": "A perfectly reasonable review of this car.",
+            }
+            for _ in range(n_cars)
+        ])
+
+
+# ---------------------------------------------------------------------------
+# Reference implementations: the original sync routes
+# ---------------------------------------------------------------------------
+
+def legacy_router():
+    from typing import List, Optional
+    from fastapi import APIRouter, Depends, HTTPException, Query, status
+    from sqlalchemy import desc, func
+    from sqlalchemy.orm import Session
+    from app.db.database import get_db
+    from app.models import Car, Review
+    from app.schemas.car import CarListResponse, CarDetailResponse
+    from app.schemas.review import ReviewListResponse
+
+    router = APIRouter()
+
+    @router.get("/cars/", response_model=CarListResponse)
+    def get_cars(
+        page: int = Query(1, ge=1),
+        page_size: int = Query(12, ge=1, le=100),
+        make: Optional[str] = Query(None),
+        db: Session = Depends(get_db)
+    ):
+        """Original get_cars (offset path, make filter, newest first)"""
+        query = db.query(Car).filter(Car.is_available == True)
+        if make:
+            query = query.filter(Car.make.ilike(f"%{make}%"))
+        total = query.count()
+        cars = query.order_by(desc(Car.created_at)).offset((page - 1) * page_size).limit(page_size).all()
+        return {
+            "cars": cars, "total": total, "page": page, "page_size": page_size,
+            "total_pages": (total + page_size - 1) // page_size,
+        }
+
+    @router.get("/cars/makes/list", response_model=List[str])
+    def get_makes(db: Session = Depends(get_db)):
+        """Original get_makes"""
+        return [make[0] for make in db.query(Car.make).distinct().order_by(Car.make).all()]
+
+    @router.get("/cars/fuel-types/list", response_model=List[str])
+    def get_fuel_types(db: Session = Depends(get_db)):
+        """Original get_fuel_types"""
+        return [ft[0] for ft in db.query(Car.fuel_type).distinct().order_by(Car.fuel_type).all()]
+
+    @router.get("/cars/{car_id}", response_model=CarDetailResponse)
+    def get_car_detail(car_id: int, db: Session = Depends(get_db)):
+        """Original get_car_detail"""
+        car = db.query(Car).filter(Car.id == car_id).first()
+        if not car:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
+        return car
+
+    @router.get("/reviews/car/{car_id}", response_model=ReviewListResponse)
+    def get_car_reviews(
+        car_id: int,
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, ge=1, le=100),
+        db: Session = Depends(get_db)
+    ):
+        """Original get_car_reviews"""
+        if not db.query(Car).filter(Car.id == car_id).first():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Car not found")
+        reviews_query = db.query(Review).filter(Review.car_id == car_id).order_by(desc(Review.created_at))
+        total = reviews_query.count()
+        reviews = reviews_query.offset(skip).limit(limit).all()
+        avg_rating = db.query(func.avg(Review.rating)).filter(Review.car_id == car_id).scalar()
+        return ReviewListResponse(reviews=reviews, total=total, average_rating=float(avg_rating) if avg_rating else None)
+
+    return router
+
+
+def serve(app, port: int):
+    """Run an ASGI app with uvicorn in a daemon thread and wait until it accepts requests"""
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def request_paths(prefix: str, n_cars: int, count: int) -> list:
+    """A fixed mix of hot read requests"""
+    rnd = random.Random(3)
+    paths = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            paths.append(f"{prefix}/cars/?page={rnd.randint(1, 20)}&make={rnd.choice(MAKES).lower()}")
+        elif kind == 1:
+            paths.append(f"{prefix}/cars/{rnd.randint(1, n_cars)}")
+        elif kind == 2:
+            paths.append(f"{prefix}/cars/makes/list")
+        elif kind == 3:
+            paths.append(f"{prefix}/cars/fuel-types/list")
+        else:
+            paths.append(f"{prefix}/reviews/car/{rnd.randint(1, n_cars)}")
+    return paths
+
+
+def load(base_url: str, paths: list, concurrency: int, seconds: float, results):
+    """Child process: keep `concurrency` requests in flight for `seconds`; report latencies"""
+    import httpx
+
+    async def run():
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + seconds
+        limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+            async def worker(offset: int):
+                nonlocal errors
+                i = offset
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        response = await client.get(paths[i % len(paths)])
+                        ok = response.status_code == 200
+                    except httpx.TransportError:
+                        ok = False
+                    if ok:
+                        latencies.append(time.perf_counter() - started)
+                    else:
+                        errors += 1
+                    i += concurrency
+            await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return latencies, errors
+
+    results.put(asyncio.run(run()))
+
+
+def measure(base_url: str, paths: list, concurrency: int, seconds: float) -> tuple:
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=load, args=(base_url, paths, concurrency, seconds, results))
+    process.start()
+    latencies, errors = results.get(timeout=seconds + 120)
+    process.join()
+    return sorted(latencies), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the async read routes against the original sync ones")
+    parser.add_argument("--cars", type=int, default=20000, help="Number of cars to seed")
+    parser.add_argument("--concurrency", type=int, default=128, help="Requests in flight")
+    parser.add_argument("--seconds", type=float, default=15.0, help="Duration of each run")
+    parser.add_argument("--pool-size", type=int, default=None, help="Override DB_POOL_SIZE")
+    parser.add_argument("--max-overflow", type=int, default=None, help="Override DB_MAX_OVERFLOW")
+    args = parser.parse_args()
+
+    # With fewer connections than requests in flight the sync routes can deadlock until
+    # DB_POOL_TIMEOUT: finished requests keep their connection until get_db's teardown gets
+    # a threadpool worker, while every worker waits for a connection
+    if args.pool_size is not None:
+        os.environ["DB_POOL_SIZE"] = str(args.pool_size)
+    if args.max_overflow is not None:
+        os.environ["DB_MAX_OVERFLOW"] = str(args.max_overflow)
+
+    print("=" * 60)
+    print("Async Read Routes Load Test")
+    print("=" * 60)
+    print(f"Seeding {args.cars:,} cars into {_tmp_dir}...")
+    seed(args.cars)
+
+    from app.core.config import settings
+    from app.main import app
+    app.include_router(legacy_router(), prefix="/legacy")
+    port = free_port()
+    serve(app, port)
+    base_url = f"http://127.0.0.1:{port}"
+    print(f"{args.concurrency} concurrent requests, {args.seconds:.0f}s per run "
+          f"(car list, detail, makes, fuel types, reviews)")
+    print(f"Connection pool: {settings.DB_POOL_SIZE} + {settings.DB_MAX_OVERFLOW} overflow\n")
+
+    runs = {}
+    for label, prefix in (("sync (threadpool)", "/legacy"), ("async (AsyncSession)", "/api/v1")):
+        paths = request_paths(prefix, args.cars, 1000)
+        measure(base_url, paths, args.concurrency, 2)  # warm up connections and caches
+        latencies, errors = measure(base_url, paths, args.concurrency, args.seconds)
+        report(label, latencies, errors, args.seconds)
+        runs[label] = latencies
+
+    before, after = runs.values()
+    if before and after:
+        print(f"\nThroughput {len(after) / len(before):.2f}x, "
+              f"p99 {before[int(len(before) * 0.99)] * 1000:.0f} ms -> {after[int(len(after) * 0.99)] * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Time-to-first-token benchmark for the AI chat endpoints (blocking vs streaming)
+
+Starts a local fake OpenAI-compatible LLM server that emits tokens at a fixed
+rate, points the app at it (OPENAI_BASE_URL), serves the app with uvicorn on a
+throwaway SQLite database, and measures POST /api/v1/ai/chat/{car_id} with and
+without ?stream=true. Nothing is sent to OpenAI.
+
+Usage:
+    python benchmark_chat_streaming.py [--requests 10] [--tokens 120] [--first-token-ms 400] [--token-ms 25]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import threading
+import time
+
+from bench_helpers import free_port, report
+
+# Configure the app before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_chat_bench_")
+_llm_port = free_port()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["OPENAI_API_KEY"] = "fake-key"
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{_llm_port}/v1"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+
+
+def create_fake_llm(n_tokens: int, first_token_ms: float, token_ms: float) -> FastAPI:
+    """OpenAI-compatible /v1/chat/completions that generates n_tokens at a fixed pace"""
+    llm = FastAPI()
+    tokens = [f"token{i} " for i in range(n_tokens)]
+
+    def chunk(delta: dict, finish_reason=None) -> str:
+        body = {
+            "id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": 0,
+            "model": "gpt-3.5-turbo",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(body)}\n\n"
+
+    @llm.post("/v1/chat/completions")
+    async def completions(request: Request):
+        payload = await request.json()
+
+        if payload.get("stream"):
+            async def generate():
+                await asyncio.sleep(first_token_ms / 1000)
+                yield chunk({"role": "assistant", "content": tokens[0]})
+                for token in tokens[1:]:
+                    await asyncio.sleep(token_ms / 1000)
+                    yield chunk({"content": token})
+                yield chunk({}, finish_reason="stop")
+                yield "data: [DONE]\n\n"
+            return StreamingResponse(generate(), media_type="text/event-stream")
+
+        await asyncio.sleep((first_token_ms + token_ms * (n_tokens - 1)) / 1000)
+        return {
+            "id": "chatcmpl-fake", "object": "chat.completion", "created": 0,
+            "model": "gpt-3.5-turbo",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 100, "completion_tokens": n_tokens, "total_tokens": 100 + n_tokens},
+        }
+
+    return llm
+
+
+def serve(app, port: int) -> uvicorn.Server:
+    """Run an ASGI app with uvicorn in a daemon thread and wait until it accepts requests"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def seed_car() -> int:
+    """Create the schema and one car to chat about"""
+    from app.db.database import SessionLocal, engine, Base
+    from app.models import Car  # Importing app.models registers every table
+
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        car = Car(
+            make="Toyota", model="Camry", year=2022, price=27000.0, mileage=15000,
+            fuel_type="hybrid", transmission="automatic", condition="used",
+            description="Well maintained, one owner", vin="BENCHCHAT0000001"
+        )
+        db.add(car)
+        db.commit()
+        return car.id
+    finally:
+        db.close()
+
+
+def measure(url: str, stream: bool) -> tuple:
+    """Return (time to first token, total time) in seconds for one chat request"""
+    body = {"message": "Is this a good family car?", "conversation_history": []}
+    started = time.perf_counter()
+    first = None
+    with httpx.Client(timeout=120) as client:
+        with client.stream("POST", url, params={"stream": "true"} if stream else None, json=body) as response:
+            response.raise_for_status()
+            if stream:
+                for line in response.iter_lines():
+                    if line.startswith("data:") and first is None:
+                        first = time.perf_counter() - started
+            else:
+                response.read()
+                first = time.perf_counter() - started
+    return first, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat time-to-first-token, blocking vs streaming")
+    parser.add_argument("--requests", type=int, default=10, help="Requests per mode")
+    parser.add_argument("--tokens", type=int, default=120, help="Tokens the fake LLM generates per reply")
+    parser.add_argument("--first-token-ms", type=float, default=400, help="Fake LLM latency before the first token")
+    parser.add_argument("--token-ms", type=float, default=25, help="Fake LLM delay between tokens")
+    args = parser.parse_args()
+
+    serve(create_fake_llm(args.tokens, args.first_token_ms, args.token_ms), _llm_port)
+    car_id = seed_car()
+
+    from app.main import app
+    app_port = free_port()
+    serve(app, app_port)
+    url = f"http://127.0.0.1:{app_port}/api/v1/ai/chat/{car_id}"
+
+    print("=" * 60)
+    print("Chat Time-to-First-Token Benchmark")
+    print("=" * 60)
+    print(f"Fake LLM: {args.tokens} tokens, first token after {args.first_token_ms:.0f} ms, "
+          f"then {args.token_ms:.0f} ms/token")
+
+    measure(url, stream=False)  # warm up connections and the car context query
+    blocking = [measure(url, stream=False) for _ in range(args.requests)]
+    streaming = [measure(url, stream=True) for _ in range(args.requests)]
+
+    print()
+    for label, samples in (("blocking", blocking), ("streaming", streaming)):
+        report(f"{label} TTFT", [s[0] for s in samples])
+        report(f"{label} total", [s[1] for s in samples])
+    speedup = statistics.median(s[0] for s in blocking) / statistics.median(s[0] for s in streaming)
+    print(f"\nStreaming delivers the first token {speedup:.1f}x sooner")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Concurrency benchmark for the SQLite engine settings: read throughput while writers commit
+
+Seeds a throwaway SQLite database, then runs the same mixed workload twice, on
+copies of it: reader threads serving listing pages (filtered page + count) while
+writer threads commit price changes the way the admin API does (standing in for
+the API, the alert agent and background review summaries all writing). First with the
+engine the app used to create (create_engine defaults, rollback journal), then
+with build_engine (pool settings, WAL, synchronous=NORMAL, cache/mmap size and
+busy timeout from Settings). Reports reads/s, read latency, commits/s and
+"database is locked" errors for each.
+
+Usage:
+    python benchmark_db_concurrency.py [--cars 20000] [--readers 4] [--writers 2] [--seconds 10]
+"""
+import sys
+import os
+import argparse
+import random
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+# Point the app at a throwaway database before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_concurrency_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/app.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from app.db.database import Base, build_engine
+from app.models import Car, PriceHistory
+
+MAKES = ["Toyota", "Honda", "Ford", "BMW", "Kia", "Tesla", "Hyundai", "Audi", "Mazda", "Volvo"]
+FUEL_TYPES = ["gasoline", "diesel", "electric", "hybrid"]
+
+
+def seed(path: str, n_cars: int):
+    """Create the schema and bulk-insert cars (rollback journal, as a fresh database has)"""
+    seed_engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=seed_engine)
+    rnd = random.Random(7)
+    now = datetime.utcnow()
+    cars = [
+        {
+            "make": rnd.choice(MAKES),
+            "model": f"Model {rnd.randint(1, 8)}",
+            "year": rnd.randint(2012, 2025),
+            "price": float(rnd.randint(8, 120) * 1000),
+            "mileage": rnd.randint(0, 150000),
+            "fuel_type": rnd.choice(FUEL_TYPES),
+            "transmission": "automatic",
+            "condition": "used",
+            "vin": f"CONC{i:09d}",
+            "is_available": True,
+            "created_at": now - timedelta(minutes=rnd.randint(0, 500000)),
+        }
+        for i in range(n_cars)
+    ]
+    with seed_engine.begin() as conn:
+        for start in range(0, len(cars), 5000):
+            conn.execute(insert(Car), cars[start:start + 5000])
+    seed_engine.dispose()
+
+
+def run_workload(engine, n_cars: int, n_readers: int, n_writers: int, seconds: float) -> dict:
+    """Run readers and writers against the engine for the given time; return counters"""
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    stop = threading.Event()
+    lock = threading.Lock()
+    stats = {"reads": 0, "read_latencies": [], "commits": 0, "read_errors": 0, "write_errors": 0}
+
+    def reader(seed_value: int):
+        rnd = random.Random(seed_value)
+        while not stop.is_set():
+            db = Session()
+            started = time.perf_counter()
+            try:
+                query = db.query(Car).filter(Car.is_available == True, Car.make == rnd.choice(MAKES))
+                query.count()
+                query.order_by(Car.price).offset(rnd.randint(0, 50) * 20).limit(20).all()
+                elapsed = time.perf_counter() - started
+                with lock:
+                    stats["reads"] += 1
+                    stats["read_latencies"].append(elapsed)
+            except OperationalError:
+                with lock:
+                    stats["read_errors"] += 1
+            finally:
+                db.close()
+
+    def writer(seed_value: int):
+        rnd = random.Random(seed_value)
+        while not stop.is_set():
+            db = Session()
+            try:
+                # A small batch per transaction, like a price update plus its history row
+                for car in db.query(Car).filter(Car.id.in_(rnd.sample(range(1, n_cars + 1), 5))):
+                    car.price = float(round(car.price * rnd.uniform(0.95, 1.05)))
+                    db.add(PriceHistory(car_id=car.id, price=car.price))
+                db.commit()
+                with lock:
+                    stats["commits"] += 1
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    stats["write_errors"] += 1
+            finally:
+                db.close()
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(n_readers)]
+    threads += [threading.Thread(target=writer, args=(100 + i,)) for i in range(n_writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+    return stats
+
+
+def report(label: str, stats: dict, seconds: float):
+    latencies = sorted(stats["read_latencies"]) or [0.0]
+    print(f"{label}")
+    print(f"  reads:   {stats['reads'] / seconds:8.1f}/s   p50 {latencies[len(latencies) // 2] * 1000:7.1f} ms   "
+          f"p99 {latencies[int(len(latencies) * 0.99)] * 1000:7.1f} ms   {stats['read_errors']} locked errors")
+    print(f"  commits: {stats['commits'] / seconds:8.1f}/s   {stats['write_errors']} locked errors\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite read throughput during writes, default vs tuned engine")
+    parser.add_argument("--cars", type=int, default=20000, help="Number of cars to seed")
+    parser.add_argument("--readers", type=int, default=4, help="Reader threads")
+    parser.add_argument("--writers", type=int, default=2, help="Writer threads")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Duration of each run")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("SQLite Concurrency Benchmark")
+    print("=" * 60)
+    seed_path = os.path.join(_tmp_dir, "seed.db")
+    print(f"Seeding {args.cars:,} cars into {_tmp_dir}...")
+    seed(seed_path, args.cars)
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per run\n")
+
+    results = {}
+    for label, make_engine in (
+        ("default engine (rollback journal)", lambda url: create_engine(url, connect_args={"check_same_thread": False})),
+        ("build_engine (WAL + pragmas)", build_engine),
+    ):
+        path = os.path.join(_tmp_dir, f"run_{len(results)}.db")
+        shutil.copy(seed_path, path)
+        engine = make_engine(f"sqlite:///{path}")
+        with engine.connect() as conn:
+            mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+        stats = run_workload(engine, args.cars, args.readers, args.writers, args.seconds)
+        report(f"{label} - journal_mode={mode}", stats, args.seconds)
+        results[label] = stats
+
+    before, after = results.values()
+    if before["reads"]:
+        print(f"Read throughput during writes: {after['reads'] / before['reads']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark for the streaming inventory export vs paging through the listings API
+
+Seeds a throwaway SQLite database, then pulls the whole inventory three ways,
+in-process (httpx ASGI transport, no network): paging GET /api/v1/cars/ at
+page_size=100 (what partners did), GET /api/v1/cars/export as NDJSON, and the same
+gzip-compressed. Reports time and bytes on the wire. Then measures the export
+generator's peak Python memory (tracemalloc) at two inventory sizes, to show it
+doesn't grow with the number of cars.
+
+Usage:
+    python benchmark_export.py [--cars 50000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import tempfile
+import time
+import tracemalloc
+
+# Configure the app before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_export_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy import insert
+from app.core.export import stream_export
+from app.core.security import create_access_token
+from app.db.database import SessionLocal, async_engine, engine
+from app.models import Car, User
+from bench_helpers import seed_cars
+
+
+
+def seed(n_cars: int):
+    """Create the schema, an admin user and bulk-insert cars with specs and scores"""
+    seed_cars(
+        n_cars, "EXPT", 6,
+        location="Denver, CO",
+        description="Well-maintained, one owner, clean history. " * 3,
+        image_urls=["images/2023-Toyota-Camry.webp"],
+    )
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "admin@example.com", "hashed_password": "x", "is_admin": True}])
+
+
+def export_peak_memory(limit_cars: int) -> float:
+    """Peak traced MB while consuming the export generator over the first limit_cars cars"""
+    db = SessionLocal()
+    db.query(Car).filter(Car.id > limit_cars).update({Car.is_available: False}, synchronize_session=False)
+    db.commit()
+    tracemalloc.start()
+    for _ in stream_export(SessionLocal, "ndjson", compress=True):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    db.query(Car).update({Car.is_available: True}, synchronize_session=False)
+    db.commit()
+    db.close()
+    return peak / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the streaming inventory export against paging")
+    parser.add_argument("--cars", type=int, default=50000, help="Number of cars to seed")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Inventory Export Benchmark")
+    print("=" * 60)
+    print(f"Seeding {args.cars:,} cars into {_tmp_dir}...")
+    seed(args.cars)
+
+    import httpx
+    from app.main import app
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': 'admin@example.com'})}"}
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            started = time.perf_counter()
+            wire, page, cars = 0, 1, 0
+            while True:
+                response = await client.get(f"/api/v1/cars/?page={page}&page_size=100")
+                wire += len(response.content)
+                data = response.json()
+                cars += len(data["cars"])
+                if page >= data["total_pages"]:
+                    break
+                page += 1
+            print(f"\n{'paging (page_size=100)':<24} {time.perf_counter() - started:7.2f}s  "
+                  f"{wire / 1e6:8.1f} MB  {page:>5} requests  {cars:,} cars")
+
+            for label, encoding in (("export NDJSON", "identity"), ("export NDJSON + gzip", "gzip")):
+                started = time.perf_counter()
+                wire = 0
+                async with client.stream("GET", "/api/v1/cars/export",
+                                         headers=dict(headers, **{"Accept-Encoding": encoding})) as response:
+                    assert response.status_code == 200, response.status_code
+                    async for chunk in response.aiter_raw():
+                        wire += len(chunk)
+                print(f"{label:<24} {time.perf_counter() - started:7.2f}s  {wire / 1e6:8.1f} MB  {1:>5} request")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+    print("\nExport generator peak memory (tracemalloc):")
+    for n in (args.cars // 10, args.cars):
+        print(f"  {n:>8,} cars: {export_peak_memory(n):6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark for bulk car ingestion: seed_data.py-style row-by-row ORM loading vs ingest_cars
+
+Generates synthetic cars (NDJSON, with specs and scores) and loads them into throwaway
+SQLite databases (full schema, full-text search triggers included) two ways: the
+seed_data.py loop (look up the VIN, add the car, flush, look up and add specs/scores,
+one object at a time) and app.core.ingest.ingest_cars (batched multi-row inserts).
+Then re-ingests the same file with changed prices to time the VIN upsert path.
+Reports rows/s and the projected time for 1M listings.
+
+Usage:
+    python benchmark_ingest.py [--cars 100000] [--baseline-cars 5000] [--batch-size 5000]
+"""
+import sys
+import os
+import argparse
+import io
+import json
+import random
+import tempfile
+import time
+
+# Configure the app before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_ingest_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy.orm import sessionmaker
+from app.core.catalog import bump_catalog_version
+from app.core.ingest import DEFAULT_BATCH_SIZE, ingest_cars
+from app.core.search import create_search_index
+from app.db.database import Base, build_engine
+from app.models import *  # Import all models
+from app.models import Car, CarSpec, CarScore, PriceHistory
+
+MAKES = ["Toyota", "Honda", "Ford", "BMW", "Kia", "Tesla", "Hyundai", "Audi"]
+
+
+def synthetic_cars(n_cars: int, seed: int = 3, price_factor: float = 1.0) -> str:
+    """NDJSON text of n_cars cars with specs and scores"""
+    rnd = random.Random(seed)
+    lines = []
+    for i in range(n_cars):
+        make = rnd.choice(MAKES)
+        lines.append(json.dumps({
+            "make": make,
+            "model": f"Model {rnd.randint(1, 8)}",
+            "year": rnd.randint(2012, 2025),
+            "price": round(rnd.randint(8, 120) * 1000 * price_factor, 2),
+            "mileage": rnd.randint(0, 150000),
+            "fuel_type": rnd.choice(["gasoline", "diesel", "electric", "hybrid"]),
+            "transmission": "automatic",
+            "condition": "used",
+            "location": "Austin, TX",
+            "description": f"Clean {make} with service records, listing {i}",
+            "image_urls": ["images/2023-Toyota-Camry.webp"],
+            "vin": f"BENCH{i:012d}",
+            "specs": {"horsepower": rnd.randint(120, 500), "seating_capacity": 5, "drivetrain": "FWD"},
+            "scores": {"overall_score": round(rnd.uniform(6, 10), 1), "safety_score": 8.0},
+        }))
+    return "\n".join(lines) + "\n"
+
+
+def fresh_session(name: str):
+    """Session factory on a new throwaway database with the full schema"""
+    bench_engine = build_engine(f"sqlite:///{_tmp_dir}/{name}.db")
+    Base.metadata.create_all(bind=bench_engine)
+    create_search_index(bench_engine)
+    return sessionmaker(bind=bench_engine)
+
+
+def seed_data_style(db, text: str) -> int:
+    """The seed_data.py loop: one car, spec and score object at a time"""
+    for line in text.splitlines():
+        car_data = json.loads(line)
+        specs_data = car_data.pop("specs", {})
+        scores_data = car_data.pop("scores", {})
+        db.query(Car).filter(Car.vin == car_data["vin"]).first()
+        car = Car(**car_data)
+        db.add(car)
+        db.flush()
+        db.add(PriceHistory(car_id=car.id, price=car.price))
+        if not db.query(CarSpec).filter(CarSpec.car_id == car.id).first():
+            db.add(CarSpec(car_id=car.id, **specs_data))
+        if not db.query(CarScore).filter(CarScore.car_id == car.id).first():
+            db.add(CarScore(car_id=car.id, **scores_data))
+    bump_catalog_version(db)
+    db.commit()
+    return len(text.splitlines())
+
+
+def report(label: str, rows: int, seconds: float):
+    rate = rows / seconds
+    print(f"{label:<34} {rows:>8,} rows {seconds:8.2f}s {rate:>10,.0f} rows/s   1M rows: {1_000_000 / rate / 60:6.1f} min")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk car ingestion against row-by-row ORM loading")
+    parser.add_argument("--cars", type=int, default=100000, help="Cars loaded with ingest_cars")
+    parser.add_argument("--baseline-cars", type=int, default=5000, help="Cars loaded the seed_data.py way")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Cars per ingest transaction")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Bulk Ingestion Benchmark")
+    print("=" * 60)
+    print(f"Databases in {_tmp_dir}\n")
+
+    Session = fresh_session("row_by_row")
+    db = Session()
+    text = synthetic_cars(args.baseline_cars)
+    started = time.perf_counter()
+    rows = seed_data_style(db, text)
+    report("seed_data.py style (ORM, per row)", rows, time.perf_counter() - started)
+    db.close()
+
+    Session = fresh_session("bulk")
+    db = Session()
+    text = synthetic_cars(args.cars)
+    result = ingest_cars(db, io.StringIO(text), "ndjson", args.batch_size, max_changed_ids=0)
+    report("ingest_cars (new listings)", result.inserted, result.seconds)
+
+    repriced = synthetic_cars(args.cars, price_factor=0.95)
+    result = ingest_cars(db, io.StringIO(repriced), "ndjson", args.batch_size, max_changed_ids=0)
+    report("ingest_cars (VIN upsert, repriced)", result.updated, result.seconds)
+
+    counts = {model.__tablename__: db.query(model).count() for model in (Car, CarSpec, CarScore, PriceHistory)}
+    db.close()
+    print(f"\nRows after both runs: {counts}")
+    if counts["cars"] != args.cars or counts["price_history"] != 2 * args.cars or result.failed:
+        print("FAILED: unexpected row counts")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
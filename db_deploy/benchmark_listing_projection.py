@@ -0,0 +1,92 @@
+"""
+Benchmark for the listing card projection (GET /api/v1/cars/?view=card) vs the full listing
+
+Seeds a throwaway SQLite database with cars carrying realistic descriptions, image
+lists, specs and scores, then times listing pages in-process (httpx ASGI transport,
+no network, response cache off) two ways: the full CarResponse listing and the card
+view the listings page renders from (only the card's columns are selected, no ORM
+objects are built). Reports ms per request and bytes per page, offset and cursor.
+
+Usage:
+    python benchmark_listing_projection.py [--cars 20000] [--requests 50] [--page-size 100]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+
+# Configure the app before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_projection_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app.db.database import async_engine
+from bench_helpers import seed_cars
+
+
+
+def seed(n_cars: int):
+    """Create the schema and bulk-insert cars carrying full listing content"""
+    seed_cars(
+        n_cars, "PROJ", 25,
+        location="Seattle, WA",
+        description="Well-maintained, one owner, full service history, new tires and brakes. " * 8,
+        image_urls=[f"images/listing-{n}.webp" for n in range(6)],
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the card listing projection against the full listing")
+    parser.add_argument("--cars", type=int, default=20000, help="Number of cars to seed")
+    parser.add_argument("--requests", type=int, default=50, help="Timed requests per variant")
+    parser.add_argument("--page-size", type=int, default=100, help="Listing page size")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Listing Projection Benchmark")
+    print("=" * 60)
+    print(f"Seeding {args.cars:,} cars into {_tmp_dir}...")
+    seed(args.cars)
+
+    import httpx
+    from app.main import app
+
+    variants = [
+        (f"full    {pagination}", f"/api/v1/cars/?page_size={args.page_size}&pagination={pagination}")
+        for pagination in ("offset", "cursor")
+    ] + [
+        (f"card    {pagination}", f"/api/v1/cars/?page_size={args.page_size}&pagination={pagination}&view=card")
+        for pagination in ("offset", "cursor")
+    ]
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            print(f"\n{'variant':<16} {'median ms':>10} {'p95 ms':>8} {'bytes/page':>12}")
+            for label, url in variants:
+                response = await client.get(url)  # Warm-up
+                assert response.status_code == 200, (url, response.status_code, response.text)
+                timings = []
+                for _ in range(args.requests):
+                    started = time.perf_counter()
+                    response = await client.get(url)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                print(f"{label:<16} {statistics.median(timings):>10.1f} {p95:>8.1f} {len(response.content):>12,}")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Micro-benchmark: CPU spent on logging per listing request, eager f-strings vs lazy arguments
+
+Replays the log calls get_cars makes on one offset-paginated request (and the auth
+dependency's, for a signed-in request) through the app's configured loggers, in the
+old form (f-strings, formatted before the level check) and the current one (%-style
+arguments, formatted only if the record is emitted). Reports CPU microseconds per
+request at the default LOG_LEVEL and what that comes to at a given request rate,
+next to the CPU time of the listing endpoint itself. Also checks that, with the
+modules' levels enabled, both forms produce the same log lines.
+
+Usage:
+    python benchmark_logging.py [--iterations 200000] [--rps 1000] [--requests 1000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import io
+import logging
+import random
+import tempfile
+import time
+
+# Configure the app before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_logging_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app.core.config import settings
+from app.core.logging_config import configure_logging
+from app.db.database import async_engine
+from bench_helpers import seed_cars
+
+cars_logger = logging.getLogger("app.api.v1.cars")
+auth_logger = logging.getLogger("app.api.v1.auth")
+
+# Values of a typical request: page 3, no filters, 12 of 4,800 cars
+PAGE, PAGE_SIZE, MAKE, SEARCH, SORT_BY = 3, 12, None, None, "created_at"
+SORT_KEY, ORDER, TOTAL, OFFSET, RETURNED = "created_at", "desc", 4800, 24, list(range(12))
+EMAIL, USER_ID = "driver@example.com", 42
+
+
+def legacy_log_calls():
+    """The log calls of one signed-in get_cars request, as they were (f-strings)"""
+    auth_logger.debug(f"[DEBUG] get_current_user: Validating token")
+    auth_logger.debug(f"[DEBUG] get_current_user: Token valid, email: {EMAIL}")
+    auth_logger.debug(f"[DEBUG] get_current_user: User authenticated (ID: {USER_ID})")
+    cars_logger.info(f"[DEBUG] get_cars: Request received - page={PAGE}, page_size={PAGE_SIZE}, make={MAKE}, search={SEARCH}, sort_by={SORT_BY}")
+    cars_logger.debug(f"[DEBUG] get_cars: Base query created")
+    cars_logger.debug(f"[DEBUG] get_cars: Sorting by {SORT_KEY} ({ORDER})")
+    cars_logger.debug(f"[DEBUG] get_cars: Total cars matching filters: {TOTAL}")
+    cars_logger.debug(f"[DEBUG] get_cars: Pagination - offset={OFFSET}, limit={PAGE_SIZE}")
+    cars_logger.info(f"[DEBUG] get_cars: Returning {len(RETURNED)} cars (page {PAGE} of {(TOTAL + PAGE_SIZE - 1) // PAGE_SIZE})")
+
+
+def lazy_log_calls():
+    """The same calls as the routes make them now (arguments formatted only if emitted)"""
+    auth_logger.debug("[DEBUG] get_current_user: Validating token")
+    auth_logger.debug("[DEBUG] get_current_user: Token valid, email: %s", EMAIL)
+    auth_logger.debug("[DEBUG] get_current_user: User authenticated (ID: %s)", USER_ID)
+    cars_logger.info("[DEBUG] get_cars: Request received - page=%s, page_size=%s, make=%s, search=%s, sort_by=%s",
+                     PAGE, PAGE_SIZE, MAKE, SEARCH, SORT_BY)
+    cars_logger.debug("[DEBUG] get_cars: Base query created")
+    cars_logger.debug("[DEBUG] get_cars: Sorting by %s (%s)", SORT_KEY, ORDER)
+    cars_logger.debug("[DEBUG] get_cars: Total cars matching filters: %s", TOTAL)
+    cars_logger.debug("[DEBUG] get_cars: Pagination - offset=%s, limit=%s", OFFSET, PAGE_SIZE)
+    cars_logger.info("[DEBUG] get_cars: Returning %s cars (page %s of %s)",
+                     len(RETURNED), PAGE, (TOTAL + PAGE_SIZE - 1) // PAGE_SIZE)
+
+
+def cpu_per_call(fn, iterations: int) -> float:
+    """CPU seconds per call (best of 3)"""
+    best = float("inf")
+    for _ in range(3):
+        started = time.process_time()
+        for _ in range(iterations):
+            fn()
+        best = min(best, (time.process_time() - started) / iterations)
+    return best
+
+
+def captured_lines(fn) -> list:
+    """Messages fn logs with every app module at DEBUG"""
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(name)s %(message)s"))
+    configure_logging("DEBUG", "")
+    for name in (cars_logger.name, auth_logger.name):
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    app_logger = logging.getLogger("app")
+    console_handlers, app_logger.handlers = app_logger.handlers, [handler]
+    try:
+        fn()
+    finally:
+        app_logger.handlers = console_handlers
+    return stream.getvalue().splitlines()
+
+
+def seed(n_cars: int):
+    """Create the schema and bulk-insert cars with specs and scores"""
+    seed_cars(n_cars, "LOG", 1)
+
+
+def listing_cpu_per_request(n_requests: int) -> float:
+    """CPU seconds per in-process GET /api/v1/cars/ request"""
+    import httpx
+    from app.main import app
+
+    rnd = random.Random(1)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for _ in range(50):
+                await client.get("/api/v1/cars/")
+            started = time.process_time()
+            for _ in range(n_requests):
+                response = await client.get(f"/api/v1/cars/?page={rnd.randint(1, 20)}")
+                assert response.status_code == 200, response.text
+            elapsed = time.process_time() - started
+        await async_engine.dispose()
+        return elapsed / n_requests
+
+    return asyncio.run(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-request logging CPU, f-strings vs lazy arguments")
+    parser.add_argument("--iterations", type=int, default=200000, help="Replays of the log calls per measurement")
+    parser.add_argument("--rps", type=int, default=1000, help="Request rate to project the savings at")
+    parser.add_argument("--requests", type=int, default=1000, help="Listing requests for the endpoint CPU baseline")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Listing Request Logging Benchmark")
+    print("=" * 60)
+
+    legacy_lines, lazy_lines = captured_lines(legacy_log_calls), captured_lines(lazy_log_calls)
+    same = legacy_lines == lazy_lines
+    print(f"Log lines with modules at DEBUG: {len(lazy_lines)}, identical to the f-string version: {same}")
+
+    configure_logging(settings.LOG_LEVEL, settings.LOG_LEVELS)
+    print(f"LOG_LEVEL={settings.LOG_LEVEL} LOG_LEVELS={settings.LOG_LEVELS or '(none)'}\n")
+    legacy = cpu_per_call(legacy_log_calls, args.iterations)
+    lazy = cpu_per_call(lazy_log_calls, args.iterations)
+    saved = legacy - lazy
+    print(f"f-strings (before)   {legacy * 1e6:6.2f} us CPU/request")
+    print(f"lazy (now)           {lazy * 1e6:6.2f} us CPU/request")
+    print(f"Saved                {saved * 1e6:6.2f} us/request = {saved * args.rps * 1000:.1f} ms CPU/s at {args.rps:,} req/s")
+
+    seed(5000)
+    endpoint = listing_cpu_per_request(args.requests)
+    print(f"\nListing endpoint (in-process): {endpoint * 1e6:,.0f} us CPU/request; "
+          f"logging saving = {saved / endpoint * 100:.2f}% of it")
+    if not same:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
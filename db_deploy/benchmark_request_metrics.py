@@ -0,0 +1,115 @@
+"""
+Overhead benchmark for the request metrics middleware and SQL timing hooks
+
+Seeds a throwaway SQLite database and serves car list and car detail requests
+in-process (httpx ASGI transport, no network) with metrics off, at the default
+sample rate and with every request instrumented. Reports the mean time per
+request for each, so the cost of leaving METRICS_ENABLED on is visible.
+
+Usage:
+    python benchmark_request_metrics.py [--cars 5000] [--requests 2000] [--rounds 3]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+# Configure the app before anything reads settings; the middleware is added per run below
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_metrics_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy import event
+from app.core.config import settings
+from app.core import request_metrics
+from app.db.database import async_engine, engine
+from bench_helpers import seed_cars
+
+
+
+def seed(n_cars: int):
+    """Create the schema and bulk-insert cars with specs and scores"""
+    seed_cars(n_cars, "METR", 5)
+
+
+def remove_query_hooks():
+    for bind in (engine, async_engine.sync_engine):
+        if event.contains(bind, "before_cursor_execute", request_metrics._before_cursor_execute):
+            event.remove(bind, "before_cursor_execute", request_metrics._before_cursor_execute)
+            event.remove(bind, "after_cursor_execute", request_metrics._after_cursor_execute)
+
+
+async def run(asgi_app, paths: list) -> float:
+    """Serve the requests one after another; return seconds per request"""
+    import httpx
+
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for path in paths[:50]:  # warm up
+            await client.get(path)
+        started = time.perf_counter()
+        for path in paths:
+            response = await client.get(path)
+            assert response.status_code == 200, response.text
+        return (time.perf_counter() - started) / len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure request metrics middleware overhead")
+    parser.add_argument("--cars", type=int, default=5000, help="Number of cars to seed")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per run")
+    parser.add_argument("--rounds", type=int, default=3, help="Runs per variant (best is reported)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Request Metrics Overhead Benchmark")
+    print("=" * 60)
+    print(f"Seeding {args.cars:,} cars into {_tmp_dir}...")
+    seed(args.cars)
+
+    from app.main import app
+
+    rnd = random.Random(9)
+    paths = [
+        f"/api/v1/cars/{rnd.randint(1, args.cars)}" if i % 2 else f"/api/v1/cars/?page={rnd.randint(1, 20)}"
+        for i in range(args.requests)
+    ]
+    variants = (
+        ("metrics off", None),
+        (f"sample rate {settings.METRICS_SAMPLE_RATE:g} (default)", settings.METRICS_SAMPLE_RATE),
+        ("sample rate 1", 1.0),
+    )
+    print(f"{args.requests} sequential requests (car detail and list pages), best of {args.rounds}\n")
+
+    loop = asyncio.new_event_loop()
+    results = {label: [] for label, _ in variants}
+    try:
+        for _ in range(args.rounds):
+            for label, sample_rate in variants:
+                if sample_rate is None:
+                    remove_query_hooks()
+                    asgi_app = app
+                else:
+                    request_metrics.install_query_hooks(engine, async_engine.sync_engine)
+                    asgi_app = request_metrics.RequestMetricsMiddleware(app, sample_rate=sample_rate)
+                results[label].append(loop.run_until_complete(run(asgi_app, paths)))
+        loop.run_until_complete(async_engine.dispose())
+    finally:
+        loop.close()
+
+    baseline = min(results["metrics off"])
+    for label, _ in variants:
+        best = min(results[label])
+        print(f"{label:<28} {best * 1e6:8.0f} us/request   {(best - baseline) / baseline * 100:+5.1f}%")
+
+
+if __name__ == "__main__":
+    main()
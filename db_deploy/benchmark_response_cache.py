@@ -0,0 +1,104 @@
+"""
+Benchmark for the catalog response cache: uncached vs cached body vs 304 revalidation
+
+Seeds a throwaway SQLite database and serves the makes list, car detail and listing
+pages in-process (httpx ASGI transport, no network) three ways: with the response
+cache off (every request queries and serializes), repeated requests answered from
+the cache, and revalidations with If-None-Match answered 304. Reports time and SQL
+statements per request for each.
+
+Usage:
+    python benchmark_response_cache.py [--cars 20000] [--requests 1000]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+
+# Configure the app before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_response_cache_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/bench.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+os.environ["METRICS_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app.core.config import settings
+from app.core.catalog import bump_catalog_version
+from app.core.response_cache import response_cache
+from app.db.database import SessionLocal, async_engine
+from app.db.query_counter import QueryCounter
+from bench_helpers import MAKES, seed_cars
+
+
+def seed(n_cars: int):
+    """Create the schema, bulk-insert cars with specs and scores, and start the catalog version"""
+    seed_cars(n_cars, "RESP", 4)
+    db = SessionLocal()
+    bump_catalog_version(db)
+    db.commit()
+    db.close()
+
+
+async def measure(client, paths: list, mode: str) -> tuple:
+    """Seconds and SQL statements per request; mode is off, cached or revalidate"""
+    settings.RESPONSE_CACHE_ENABLED = mode != "off"
+    response_cache.clear()
+    etags = {}
+    for path in set(paths):  # fill the cache / collect ETags
+        etags[path] = (await client.get(path)).headers.get("etag")
+
+    with QueryCounter() as queries:
+        started = time.perf_counter()
+        for path in paths:
+            headers = {"If-None-Match": etags[path]} if mode == "revalidate" else {}
+            response = await client.get(path, headers=headers)
+            assert response.status_code == (304 if mode == "revalidate" else 200), response.status_code
+        elapsed = time.perf_counter() - started
+    return elapsed / len(paths), queries.count / len(paths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the catalog response cache and ETag revalidation")
+    parser.add_argument("--cars", type=int, default=20000, help="Number of cars to seed")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint and mode")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Catalog Response Cache Benchmark")
+    print("=" * 60)
+    print(f"Seeding {args.cars:,} cars into {_tmp_dir}...")
+    seed(args.cars)
+
+    import httpx
+    from app.main import app
+
+    rnd = random.Random(8)
+    hot_cars = [rnd.randint(1, args.cars) for _ in range(50)]
+    endpoints = {
+        "makes list": ["/api/v1/cars/makes/list"] * args.requests,
+        "car detail": [f"/api/v1/cars/{rnd.choice(hot_cars)}" for _ in range(args.requests)],
+        "listing page": [f"/api/v1/cars/?page={rnd.randint(1, 5)}&make={rnd.choice(MAKES).lower()}"
+                         for _ in range(args.requests)],
+    }
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for label, paths in endpoints.items():
+                print(f"\n{label}")
+                for mode in ("off", "cached", "revalidate"):
+                    seconds, statements = await measure(client, paths, mode)
+                    print(f"  {mode:<12} {seconds * 1000:8.2f} ms/request   {statements:5.2f} statements/request")
+        await async_engine.dispose()
+
+    asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+N+1 regression check: SQL statements per request must not grow with the result size
+
+Seeds a throwaway SQLite database, then calls the car list, car detail, car reviews, batch
+review stats and favorites endpoints through the API with small and large results (page
+sizes, users with one favorite vs many, cars with one review vs many, stats for one car vs
+a full page) and counts the SQL statements each
+request runs with QueryCounter. Exits with status 1 if any endpoint's count differs
+between the small and large case, i.e. some relationship is loaded once per row.
+
+Usage:
+    python check_query_counts.py [--cars 200] [--favorites 40] [--reviews 40]
+"""
+import sys
+import os
+import argparse
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+# Point the app at a throwaway database before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_query_counts_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/counts.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+os.environ["EMBEDDING_CACHE_ENABLED"] = "false"
+# Count the queries a request really runs (not a cached body)
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy import insert
+from app.db.database import engine, Base
+from app.db.query_counter import QueryCounter
+from app.models import *  # Import all models
+from app.models import Car, CarSpec, CarScore, Favorite, Review, User
+from app.core.security import create_access_token
+
+MAKES = ["Toyota", "Honda", "Ford", "BMW", "Kia", "Tesla", "Hyundai", "Audi"]
+FUEL_TYPES = ["gasoline", "diesel", "electric", "hybrid"]
+
+
+def seed(n_cars: int, n_favorites: int, n_reviews: int):
+    """Cars with specs and scores; a user with one favorite and one with many; reviews on two cars"""
+    Base.metadata.create_all(bind=engine)
+    rnd = random.Random(11)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"email": "one@example.com", "hashed_password": "x"},
+            {"email": "many@example.com", "hashed_password": "x"},
+        ])
+        conn.execute(insert(Car), [
+            {
+                "make": rnd.choice(MAKES),
+                "model": f"Model {rnd.randint(1, 8)}",
+                "year": rnd.randint(2012, 2025),
+                "price": float(rnd.randint(8, 120) * 1000),
+                "mileage": rnd.randint(0, 150000),
+                "fuel_type": rnd.choice(FUEL_TYPES),
+                "transmission": "automatic",
+                "condition": "used",
+                "vin": f"COUNT{i:09d}",
+                "is_available": True,
+                "created_at": now - timedelta(minutes=i),
+            }
+            for i in range(n_cars)
+        ])
+        conn.execute(insert(CarSpec), [{"car_id": car_id, "horsepower": 200} for car_id in range(1, n_cars + 1)])
+        conn.execute(insert(CarScore), [{"car_id": car_id, "overall_score": 8.0} for car_id in range(1, n_cars + 1)])
+        conn.execute(insert(Favorite), [{"user_id": 1, "car_id": 1}] + [
+            {"user_id": 2, "car_id": car_id} for car_id in range(1, min(n_favorites, n_cars) + 1)
+        ])
+        conn.execute(insert(Review), [
+            {"car_id": 1, "user_id": 1, "rating": 4, "title": "Review", "content": "A perfectly reasonable review."}
+        ] + [
+            {"car_id": 2, "user_id": 1 + i % 2, "rating": rnd.randint(1, 5), "title": "Review",
+             "content": "A perfectly reasonable review."}
+            for i in range(n_reviews)
+        ])
+
+
+def count_statements(client, path: str, headers: dict = None) -> tuple:
+    """Statements run by one GET request, and the number of items it returned"""
+    with QueryCounter() as queries:
+        response = client.get(path, headers=headers or {})
+    if response.status_code != 200:
+        raise RuntimeError(f"GET {path} returned {response.status_code}: {response.text[:200]}")
+    body = response.json()
+    if isinstance(body, list):
+        items = len(body)
+    else:
+        items = len(body.get("cars") or body.get("reviews") or body.get("stats") or [body])
+    return queries.count, items, queries.statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check that SQL statements per request don't grow with result size")
+    parser.add_argument("--cars", type=int, default=200, help="Number of cars to seed")
+    parser.add_argument("--favorites", type=int, default=40, help="Favorites of the large-case user")
+    parser.add_argument("--reviews", type=int, default=40, help="Reviews on the large-case car")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Query Count Check")
+    print("=" * 60)
+    print(f"Seeding {args.cars} cars, {args.favorites} favorites, {args.reviews} reviews into {_tmp_dir}...")
+    seed(args.cars, args.favorites, args.reviews)
+
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    one_user = {"Authorization": f"Bearer {create_access_token({'sub': 'one@example.com'})}"}
+    many_user = {"Authorization": f"Bearer {create_access_token({'sub': 'many@example.com'})}"}
+    page = min(args.cars, 100)
+    checks = [
+        ("car list", ("/api/v1/cars/?page_size=1", None), (f"/api/v1/cars/?page_size={page}", None)),
+        ("car list (cursor)", ("/api/v1/cars/?page_size=1&pagination=cursor", None),
+         (f"/api/v1/cars/?page_size={page}&pagination=cursor", None)),
+        ("car detail", ("/api/v1/cars/1", None), (f"/api/v1/cars/{args.cars}", None)),
+        ("car reviews", ("/api/v1/reviews/car/1", None), (f"/api/v1/reviews/car/2?limit={min(args.reviews, 100)}", None)),
+        ("review stats", ("/api/v1/reviews/stats?car_ids=1", None),
+         ("/api/v1/reviews/stats?" + "&".join(f"car_ids={car_id}" for car_id in range(1, page + 1)), None)),
+        ("favorites", ("/api/v1/favorites/", one_user), ("/api/v1/favorites/", many_user)),
+    ]
+
+    failures = 0
+    with TestClient(app) as client:
+        for label, small, large in checks:
+            # Warm-up request so one-off work (catalog version, search index check) isn't counted
+            client.get(small[0], headers=small[1] or {})
+            small_count, small_items, _ = count_statements(client, *small)
+            large_count, large_items, statements = count_statements(client, *large)
+            ok = small_count == large_count
+            print(f"{'OK  ' if ok else 'FAIL'} {label:<20} {small_items:>4} items: {small_count:>2} statements   "
+                  f"{large_items:>4} items: {large_count:>2} statements")
+            if not ok:
+                failures += 1
+                for statement in statements:
+                    print(f"       {' '.join(statement.split())[:150]}")
+
+    print()
+    if failures:
+        print(f"FAILED: {failures} endpoint(s) run more statements for larger results")
+        sys.exit(1)
+    print("OK: statements per request are constant")
+
+
+if __name__ == "__main__":
+    main()
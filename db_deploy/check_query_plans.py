@@ -0,0 +1,293 @@
+"""
+Query-plan regression check for car listing filters and the new-listing alert agent
+
+Seeds a throwaway SQLite database with a large inventory, runs get_cars for every
+supported filter/sort/pagination combination plus check_new_listing_alerts,
+captures the SQL they emit, and runs EXPLAIN QUERY PLAN on each statement.
+Exits with status 1 if any statement falls back to a full scan of cars or alerts,
+or filters cars but reads them through an index constrained only by is_available
+(which ~90% of the seeded cars match, so it is a scan in all but name) without a
+LIMIT the index order can stop at. The make/model filters are substring matches no
+index can serve; their statements are reported as warnings instead.
+
+Usage:
+    python check_query_plans.py [--cars 50000] [--alerts 200]
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import random
+import re
+import tempfile
+from datetime import datetime, timedelta
+
+# Point the app at a throwaway database before anything reads settings
+_tmp_dir = tempfile.mkdtemp(prefix="cargenie_plans_")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/plans.db"
+os.environ["SYNC_DB_FROM_RENDER"] = "false"
+# Every call must reach the database (no 304s or cached bodies)
+os.environ["RESPONSE_CACHE_ENABLED"] = "false"
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from sqlalchemy import event, insert, text
+from starlette.requests import Request
+from starlette.responses import Response
+from app.db.database import AsyncSessionLocal, SessionLocal, async_engine, engine, Base
+from app.models import *  # Import all models
+from app.models import Car, Alert, User
+from app.core.search import create_search_index
+from app.api.v1.cars import get_cars
+from app.api.v1.alerts import check_new_listing_alerts
+
+# Tables that must never be read with a full scan
+CHECKED_TABLES = ("cars", "alerts")
+
+# Car columns get_cars filters on, and those it can only match as substrings (ILIKE '%term%')
+FILTER_COLUMNS = ("make", "model", "year", "price", "fuel_type", "transmission", "condition")
+SUBSTRING_COLUMNS = {"make", "model"}
+
+_INDEX_SEARCH = re.compile(r"^SEARCH (?:TABLE )?(\w+)(?: AS \w+)? USING (?:COVERING )?INDEX \S+ \((.*)\)$")
+
+MAKES = ["Toyota", "Honda", "Ford", "BMW", "Kia", "Mercedes-Benz", "Tesla", "Hyundai"]
+MODELS = ["Camry", "Civic", "F-150", "3 Series", "EV6", "C-Class", "Model 3", "Tucson"]
+FUEL_TYPES = ["gasoline", "diesel", "electric", "hybrid"]
+TRANSMISSIONS = ["automatic", "manual", "CVT"]
+CONDITIONS = ["new", "used", "certified-pre-owned"]
+
+# Filter combinations get_cars is expected to serve from an index
+FILTER_SETS = [
+    {},
+    {"fuel_type": "electric"},
+    {"transmission": "manual"},
+    {"condition": "used"},
+    {"min_price": 20000, "max_price": 40000},
+    {"max_price": 30000},
+    {"min_year": 2020, "max_year": 2023},
+    {"make": "toyota"},
+    {"make": "ford", "model": "f-150"},
+    {"search": "camry"},
+    {"fuel_type": "hybrid", "min_price": 15000, "max_price": 35000},
+]
+SORTS = ["created_at", "price", "year", "mileage"]
+
+
+def seed(n_cars: int, n_alerts: int):
+    """Create the schema and bulk-insert a random inventory and alert set"""
+    Base.metadata.create_all(bind=engine)
+    create_search_index(engine)
+
+    rnd = random.Random(42)
+    now = datetime.utcnow()
+    cars = []
+    for i in range(n_cars):
+        idx = rnd.randrange(len(MAKES))
+        cars.append({
+            "make": MAKES[idx],
+            "model": MODELS[idx],
+            "year": rnd.randint(2012, 2025),
+            "price": float(rnd.randint(8, 120) * 1000),
+            "mileage": rnd.randint(0, 150000),
+            "fuel_type": rnd.choice(FUEL_TYPES),
+            "transmission": rnd.choice(TRANSMISSIONS),
+            "condition": rnd.choice(CONDITIONS),
+            "description": f"{MAKES[idx]} {MODELS[idx]} listing {i}",
+            "vin": f"PLAN{i:09d}",
+            "is_available": rnd.random() < 0.9,
+            "created_at": now - timedelta(minutes=rnd.randint(0, 500000)),
+        })
+
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{"email": "plans@example.com", "hashed_password": "x"}])
+        for start in range(0, len(cars), 5000):
+            conn.execute(insert(Car), cars[start:start + 5000])
+
+        alerts = []
+        for i in range(n_alerts):
+            idx = rnd.randrange(len(MAKES))
+            alerts.append({
+                "user_id": 1,
+                "alert_type": rnd.choice(["new_listing", "price_drop"]),
+                "make": MAKES[idx] if rnd.random() < 0.7 else None,
+                "model": MODELS[idx] if rnd.random() < 0.3 else None,
+                "max_price": float(rnd.randint(20, 80) * 1000) if rnd.random() < 0.5 else None,
+                "min_year": rnd.randint(2015, 2022) if rnd.random() < 0.3 else None,
+                "max_mileage": rnd.randint(20000, 100000) if rnd.random() < 0.3 else None,
+                "fuel_type": rnd.choice(FUEL_TYPES) if rnd.random() < 0.3 else None,
+                "is_active": True,
+                "created_at": now - timedelta(days=rnd.randint(0, 30)),
+            })
+        conn.execute(insert(Alert), alerts)
+
+
+def capture_statements(fn):
+    """Run fn() and return the (statement, parameters) pairs it executed"""
+    captured = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    # Async routes run on the async engine's connections, sync code on the sync engine's
+    for bind in (engine, async_engine.sync_engine):
+        event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        fn()
+    finally:
+        for bind in (engine, async_engine.sync_engine):
+            event.remove(bind, "before_cursor_execute", before_cursor_execute)
+    return captured
+
+
+def explain(statement, parameters):
+    """Return the EXPLAIN QUERY PLAN detail lines for a statement"""
+    raw = engine.raw_connection()
+    try:
+        cursor = raw.cursor()
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return [row[3] for row in cursor.fetchall()]
+    finally:
+        raw.close()
+
+
+def is_full_scan(detail: str) -> bool:
+    """A plan step that reads every row of a checked table"""
+    words = detail.split()
+    if len(words) < 2 or words[0] != "SCAN":
+        return False
+    table = words[2] if words[1] == "TABLE" else words[1]
+    return table in CHECKED_TABLES
+
+
+def reads_all_available(detail: str) -> bool:
+    """A plan step that searches cars through an index constrained only by is_available"""
+    match = _INDEX_SEARCH.match(detail)
+    if not match or match.group(1) != "cars":
+        return False
+    return all(term.startswith("is_available=") for term in match.group(2).split(" AND "))
+
+
+def where_filters(statement: str) -> set:
+    """get_cars filter columns the statement's WHERE clause tests"""
+    parts = re.split(r"\bWHERE\b", statement, maxsplit=1)
+    if len(parts) < 2:
+        return set()
+    clause = re.split(r"\b(?:GROUP BY|ORDER BY|LIMIT)\b", parts[1])[0]
+    return {column for column in FILTER_COLUMNS if re.search(rf"\bcars\.{column}\b", clause)}
+
+
+def unindexed_filters(statement: str, plan) -> set:
+    """
+    Filter columns the statement tests while reading every available car, or an empty set
+    An index-ordered read with a LIMIT (no temp B-tree sort) stops early and is fine.
+    """
+    if not any(reads_all_available(detail) for detail in plan):
+        return set()
+    bounded = re.search(r"\bLIMIT\b", statement) and not any("TEMP B-TREE FOR ORDER BY" in d for d in plan)
+    return set() if bounded else where_filters(statement)
+
+
+def get_cars_call(loop, filters, sort_by, sort_order, pagination, view=None, include_facets=False):
+    """Call the (async) get_cars route function directly with every query param spelled out"""
+    params = {
+        "request": Request({"type": "http", "method": "GET", "path": "/api/v1/cars/", "headers": [], "query_string": b""}),
+        "page": 3, "page_size": 12, "make": None, "model": None,
+        "min_year": None, "max_year": None, "min_price": None, "max_price": None,
+        "fuel_type": None, "transmission": None, "condition": None, "search": None,
+        "sort_by": sort_by, "sort_order": sort_order, "pagination": pagination,
+        "cursor": None, "include_facets": include_facets, "fields": None, "view": view,
+    }
+    params.update(filters)
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            result = await get_cars(db=db, **params)
+            if isinstance(result, Response):  # Projections (view=card) come back serialized
+                result = json.loads(result.body)
+            if pagination == "cursor" and result["next_cursor"]:
+                # Second page exercises the keyset predicate
+                await get_cars(db=db, **dict(params, cursor=result["next_cursor"]))
+    return lambda: loop.run_until_complete(run())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check listing query plans for full table scans")
+    parser.add_argument("--cars", type=int, default=50000, help="Number of cars to seed")
+    parser.add_argument("--alerts", type=int, default=200, help="Number of alerts to seed")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Listing Query Plan Check")
+    print("=" * 60)
+    print(f"Seeding {args.cars:,} cars and {args.alerts:,} alerts into {_tmp_dir}...")
+    seed(args.cars, args.alerts)
+
+    cases = []
+    loop = asyncio.new_event_loop()
+    db = SessionLocal()
+    try:
+        for filters in FILTER_SETS:
+            for sort_by in SORTS:
+                for sort_order in ("asc", "desc"):
+                    for pagination in ("offset", "cursor"):
+                        label = f"get_cars {filters or '{}'} sort={sort_by} {sort_order} {pagination}"
+                        cases.append((label, get_cars_call(loop, filters, sort_by, sort_order, pagination)))
+        for filters in FILTER_SETS:
+            for pagination in ("offset", "cursor"):
+                label = f"get_cars {filters or '{}'} view=card {pagination}"
+                cases.append((label, get_cars_call(loop, filters, "created_at", "desc", pagination, view="card")))
+        for filters in FILTER_SETS:
+            label = f"get_cars {filters or '{}'} include_facets offset"
+            cases.append((label, get_cars_call(loop, filters, "created_at", "desc", "offset", include_facets=True)))
+        cases.append(("get_cars search=camry sort=relevance cursor",
+                      get_cars_call(loop, {"search": "camry"}, "relevance", "asc", "cursor")))
+        cases.append(("check_new_listing_alerts", lambda: check_new_listing_alerts(db)))
+
+        failures = []
+        substring_reads = []
+        temp_sorts = 0
+        seen = set()
+        for label, run in cases:
+            for statement, parameters in capture_statements(run):
+                key = (statement, tuple(parameters) if isinstance(parameters, (list, tuple)) else str(parameters))
+                if key in seen:
+                    continue
+                seen.add(key)
+                plan = explain(statement, parameters)
+                unindexed = unindexed_filters(statement, plan)
+                if any(is_full_scan(detail) for detail in plan) or unindexed - SUBSTRING_COLUMNS:
+                    failures.append((label, statement, plan))
+                elif unindexed:
+                    substring_reads.append(label)
+                if any("USE TEMP B-TREE FOR ORDER BY" in detail for detail in plan):
+                    temp_sorts += 1
+    finally:
+        db.close()
+        loop.run_until_complete(async_engine.dispose())
+        loop.close()
+
+    print(f"Checked {len(seen)} distinct statements from {len(cases)} calls")
+    print(f"Statements sorting with a temp B-tree: {temp_sorts}")
+    if substring_reads:
+        print(f"\n[WARN] {len(substring_reads)} statements read every available car for a make/model "
+              f"substring filter (no index can serve ILIKE '%term%'):")
+        for label in sorted(set(substring_reads)):
+            print(f"    {label}")
+
+    if failures:
+        print(f"\n[FAIL] {len(failures)} statements fall back to a full scan (or read every available car):")
+        for label, statement, plan in failures:
+            print(f"\n--- {label}")
+            print(" ".join(statement.split()))
+            for detail in plan:
+                print(f"    {detail}")
+        sys.exit(1)
+
+    print("\n[OK] No full scans of cars or alerts")
+
+
+if __name__ == "__main__":
+    main()
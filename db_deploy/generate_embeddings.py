@@ -1,9 +1,22 @@
 """
 Script to generate embeddings for all cars in the database
 Run this after setting up ChromaDB and OpenAI API key
+
+Cars are embedded in batches (many inputs per embeddings request) by a bounded
+pool of workers, with retry/backoff per batch, and written to ChromaDB with one
+upsert per batch. Completed car IDs are appended to a checkpoint file so an
+interrupted run resumes where it stopped.
+
+Usage:
+    python generate_embeddings.py [--batch-size 100] [--concurrency 4] [--restart]
+    python generate_embeddings.py --fake --fake-latency-ms 200   # offline benchmark
 """
 import sys
 import os
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Add backend to path (go up one level from db_deploy to project root, then into backend)
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
@@ -11,92 +24,154 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal, engine
 from app.models import Car
-from app.core.embeddings import EmbeddingsService
-from app.core.vectordb import VectorDB
+from app.core.embeddings import EmbeddingsService, build_car_text
+from app.core.vectordb import VectorDB, car_metadata
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def generate_all_embeddings():
+DEFAULT_CHECKPOINT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.embeddings_checkpoint')
+
+
+def load_checkpoint(path):
+    """Read the set of car IDs already embedded by a previous (interrupted) run"""
+    if not os.path.exists(path):
+        return set()
+    done = set()
+    with open(path) as f:
+        for line in f:
+            done.update(int(car_id) for car_id in line.strip().split(",") if car_id)
+    return done
+
+
+def append_checkpoint(path, car_ids):
+    """Record a completed batch (append-only, one line per batch)"""
+    with open(path, "a") as f:
+        f.write(",".join(str(car_id) for car_id in car_ids) + "\n")
+
+
+def embed_with_retry(embeddings_service, texts, max_retries, backoff_seconds):
+    """Embed one batch, retrying with exponential backoff and jitter"""
+    for attempt in range(max_retries + 1):
+        embeddings = embeddings_service.generate_embeddings(texts)
+        if embeddings is not None:
+            return embeddings
+        if attempt < max_retries:
+            delay = backoff_seconds * (2 ** attempt) * (1 + random.random())
+            logger.warning(f"  ⚠️  Batch failed, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+    return None
+
+
+def generate_all_embeddings(
+    batch_size=100,
+    concurrency=4,
+    max_retries=5,
+    backoff_seconds=1.0,
+    checkpoint_path=DEFAULT_CHECKPOINT,
+    restart=False,
+    provider=None,
+    fake_latency_ms=0.0,
+    limit=None
+):
     """Generate and store embeddings for all cars"""
     db: Session = SessionLocal()
-    
+
     try:
         # Initialize services
-        embeddings_service = EmbeddingsService()
+        embeddings_service = EmbeddingsService(provider=provider, fake_latency_ms=fake_latency_ms)
         vectordb = VectorDB()
-        
-        if not embeddings_service.client:
+
+        if not embeddings_service.embeddings_client:
             logger.error("❌ OpenAI API key not set. Please set OPENAI_API_KEY in .env file")
             return
-        
-        # Get all cars
-        cars = db.query(Car).filter(Car.is_available == True).all()
-        total_cars = len(cars)
-        
+
+        if restart and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+        done_ids = load_checkpoint(checkpoint_path)
+
+        # Get all cars (texts and metadata are built here so workers never touch the session)
+        query = db.query(Car).filter(Car.is_available == True).order_by(Car.id)
+        if limit:
+            query = query.limit(limit)
+        pending = [
+            (
+                car.id,
+                build_car_text(car.make, car.model, car.year, car.description, car.fuel_type, car.transmission),
+                car_metadata(car)
+            )
+            for car in query.all()
+            if car.id not in done_ids
+        ]
+        total_cars = len(pending)
+        batches = [pending[i:i + batch_size] for i in range(0, total_cars, batch_size)]
+
         logger.info(f"============================================================")
         logger.info(f"Generating Embeddings for {total_cars} Cars")
+        logger.info(f"   - {len(done_ids)} already done (checkpoint), {len(batches)} batches of up to {batch_size}")
+        logger.info(f"   - Concurrency: {concurrency}")
         logger.info(f"============================================================")
-        
+
         success_count = 0
         fail_count = 0
-        
-        for i, car in enumerate(cars, 1):
-            logger.info(f"[{i}/{total_cars}] Processing: {car.year} {car.make} {car.model} (ID: {car.id})")
-            
-            try:
-                # Generate embedding
-                embedding = embeddings_service.generate_car_embedding(
-                    make=car.make,
-                    model=car.model,
-                    year=car.year,
-                    description=car.description,
-                    fuel_type=car.fuel_type,
-                    transmission=car.transmission
-                )
-                
-                if not embedding:
-                    logger.warning(f"  ⚠️  Failed to generate embedding")
-                    fail_count += 1
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            futures = {
+                pool.submit(embed_with_retry, embeddings_service, [text for _, text, _ in batch], max_retries, backoff_seconds): batch
+                for batch in batches
+            }
+
+            # Writes happen on this thread, one upsert per batch, as embeddings arrive
+            for i, future in enumerate(as_completed(futures), 1):
+                batch = futures[future]
+                car_ids = [car_id for car_id, _, _ in batch]
+
+                try:
+                    embeddings = future.result()
+                except Exception as e:
+                    logger.error(f"  ❌ Error: {e}")
+                    embeddings = None
+
+                if embeddings is None:
+                    logger.warning(f"[{i}/{len(batches)}] ⚠️  Failed to generate embeddings for cars {car_ids[0]}-{car_ids[-1]}")
+                    fail_count += len(batch)
                     continue
-                
-                # Prepare metadata
-                metadata = {
-                    "make": car.make,
-                    "model": car.model,
-                    "year": car.year,
-                    "price": car.price,
-                    "fuel_type": car.fuel_type,
-                    "transmission": car.transmission,
-                    "description": car.description or ""
-                }
-                
-                # Store in vector DB
-                success = vectordb.add_car_embedding(
-                    car_id=car.id,
-                    embedding=embedding,
-                    metadata=metadata
+
+                success = vectordb.upsert_many(
+                    car_ids,
+                    embeddings,
+                    [metadata for _, _, metadata in batch]
                 )
-                
+
                 if success:
-                    logger.info(f"  ✅ Embedding generated and stored")
-                    success_count += 1
+                    append_checkpoint(checkpoint_path, car_ids)
+                    success_count += len(batch)
+                    logger.info(f"[{i}/{len(batches)}] ✅ Stored {len(batch)} embeddings")
                 else:
-                    logger.warning(f"  ⚠️  Failed to store embedding")
-                    fail_count += 1
-                    
-            except Exception as e:
-                logger.error(f"  ❌ Error: {e}")
-                fail_count += 1
-        
+                    logger.warning(f"[{i}/{len(batches)}] ⚠️  Failed to store embeddings")
+                    fail_count += len(batch)
+
+        elapsed = time.perf_counter() - started
+
+        # A clean run leaves nothing to resume
+        if fail_count == 0 and os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
         logger.info(f"============================================================")
         logger.info(f"✅ Embedding Generation Complete!")
         logger.info(f"   - Success: {success_count}")
         logger.info(f"   - Failed: {fail_count}")
+        logger.info(f"   - Time: {elapsed:.1f}s ({success_count / elapsed if elapsed else 0:.1f} cars/s)")
         logger.info(f"   - Total embeddings in DB: {vectordb.get_collection_count()}")
+        if embeddings_service.cache:
+            cache_stats = embeddings_service.cache.stats()
+            logger.info(f"   - Embedding cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+        if fail_count:
+            logger.info(f"   - Re-run to retry failed cars (progress saved to {checkpoint_path})")
         logger.info(f"============================================================")
-        
+
     except Exception as e:
         logger.error(f"❌ Fatal error: {e}")
         raise
@@ -104,4 +179,24 @@ def generate_all_embeddings():
         db.close()
 
 if __name__ == "__main__":
-    generate_all_embeddings()
+    parser = argparse.ArgumentParser(description="Generate embeddings for all cars")
+    parser.add_argument("--batch-size", type=int, default=100, help="Cars per embeddings request / ChromaDB upsert")
+    parser.add_argument("--concurrency", type=int, default=4, help="Embeddings requests in flight")
+    parser.add_argument("--max-retries", type=int, default=5, help="Retries per batch")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="Checkpoint file for resuming")
+    parser.add_argument("--restart", action="store_true", help="Ignore any existing checkpoint")
+    parser.add_argument("--limit", type=int, default=None, help="Only embed the first N cars")
+    parser.add_argument("--fake", action="store_true", help="Use the offline fake embeddings provider")
+    parser.add_argument("--fake-latency-ms", type=float, default=0.0, help="Simulated latency per fake request")
+    args = parser.parse_args()
+
+    generate_all_embeddings(
+        batch_size=args.batch_size,
+        concurrency=args.concurrency,
+        max_retries=args.max_retries,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+        provider="fake" if args.fake else None,
+        fake_latency_ms=args.fake_latency_ms,
+        limit=args.limit
+    )
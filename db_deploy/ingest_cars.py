@@ -0,0 +1,77 @@
+"""
+Bulk-load cars from an NDJSON or CSV file (or stdin) into the database
+
+Same code path as POST /api/v1/cars/bulk: records are validated, matched on VIN
+(existing listings are updated, the rest inserted) and written in batched
+transactions with specs, scores and initial price history. Prints progress and
+throughput. Alert holders are notified by the scheduled alert agent's next run;
+run generate_embeddings.py afterwards so new cars show up in AI search.
+
+NDJSON records look like the entries of SAMPLE_CARS in seed_data.py; CSV columns
+are the car fields plus specs.<field> and scores.<field>.
+
+Usage:
+    python ingest_cars.py cars.ndjson [--batch-size 5000]
+    python ingest_cars.py cars.csv
+    python ingest_cars.py - --format csv < cars.csv
+"""
+import sys
+import os
+import argparse
+
+# Add backend to path (go up one level from db_deploy to project root, then into backend)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'backend'))
+
+from app.db.database import SessionLocal
+from app.core.ingest import DEFAULT_BATCH_SIZE, INGEST_FORMATS, ingest_cars
+
+# Progress is printed each time this many more records have been read
+PROGRESS_EVERY = 100000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load cars from NDJSON or CSV")
+    parser.add_argument("path", help="Input file, or - for stdin")
+    parser.add_argument("--format", choices=INGEST_FORMATS, help="Input format (default: from the file extension)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Cars written per transaction")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "ndjson")
+    print("=" * 60)
+    print(f"Ingesting {args.path} ({fmt}, batches of {args.batch_size:,})")
+    print("=" * 60)
+
+    next_report = [PROGRESS_EVERY]
+
+    def report(result):
+        if result.received >= next_report[0]:
+            next_report[0] += PROGRESS_EVERY
+            written = result.inserted + result.updated
+            print(f"  {result.received:>10,} read   {written:>10,} written   "
+                  f"{written / result.seconds:>9,.0f} rows/s")
+
+    db = SessionLocal()
+    try:
+        if args.path == "-":
+            result = ingest_cars(db, sys.stdin, fmt, args.batch_size, max_changed_ids=0, on_batch=report)
+        else:
+            with open(args.path, encoding="utf-8", newline="") as f:
+                result = ingest_cars(db, f, fmt, args.batch_size, max_changed_ids=0, on_batch=report)
+    finally:
+        db.close()
+
+    summary = result.summary()
+    print()
+    print(f"Received: {summary['received']:,}")
+    print(f"Inserted: {summary['inserted']:,}")
+    print(f"Updated:  {summary['updated']:,}")
+    print(f"Failed:   {summary['failed']:,}")
+    for error in summary["errors"]:
+        print(f"  - {error}")
+    print(f"Time:     {summary['seconds']:.1f}s ({summary['rows_per_second']:,.0f} rows/s)")
+    if summary["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bac
 from app.db.database import SessionLocal
 from app.models import User, Car, CarSpec, CarScore
 from app.core.security import get_password_hash
+from app.core.catalog import bump_catalog_version
 
 # Sample car data
 SAMPLE_CARS = [
@@ -460,6 +461,7 @@ def seed_cars(db):
         if car.vin not in keep_vins:
             print(f"Removing car not in list: {car.year} {car.make} {car.model} (VIN: {car.vin})")
             db.delete(car)
+    bump_catalog_version(db)
     db.commit()
     
     for car_data in cars_to_seed:
@@ -510,6 +512,7 @@ def seed_cars(db):
                 car_score = CarScore(car_id=car.id, **scores_data)
                 db.add(car_score)
     
+    bump_catalog_version(db)
     db.commit()
     final_count = db.query(Car).count()
     print(f"Total cars in database: {final_count} (should be 10)")
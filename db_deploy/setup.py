@@ -9,12 +9,16 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bac
 
 from app.db.database import engine, Base
 from app.models import *  # Import all models
+from app.core.search import create_search_index
 
 def init_db():
     """Initialize database tables"""
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
     print("Database tables created successfully!")
+    
+    print("Creating full-text search index...")
+    create_search_index(engine)
 
 if __name__ == "__main__":
     init_db()
@@ -10,6 +10,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bac
 
 from app.db.database import SessionLocal
 from app.models import Car
+from app.core.catalog import bump_catalog_version
 
 def sync_cars_to_images():
     """Keep only cars that match available images"""
@@ -89,6 +90,7 @@ def sync_cars_to_images():
                 db.add(new_car)
                 print(f"[CREATE] Added {target['year']} {target['make']} {target['model']}")
         
+        bump_catalog_version(db)
         db.commit()
         print(f"\n[SUCCESS] Database synced with images!")
         print(f"Total cars now: {db.query(Car).count()}")
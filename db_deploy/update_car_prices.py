@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'bac
 
 from app.db.database import SessionLocal
 from app.models import Car
+from app.core.catalog import bump_catalog_version
 
 def update_car_prices():
     """Update car prices for used cars based on engine condition"""
@@ -76,6 +77,7 @@ def update_car_prices():
                     updated_count += 1
                     print(f"[OK] {car.year} {car.make} {car.model} (Engine: {engine_condition}): ${old_price:,.0f} -> ${used_price:,.0f}")
         
+        bump_catalog_version(db)
         db.commit()
         print(f"\n[SUCCESS] Updated {updated_count} car prices based on engine condition")
         
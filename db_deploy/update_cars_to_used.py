@@ -11,6 +11,7 @@ sys.path.insert(0, backend_path)
 from sqlalchemy.orm import Session
 from app.db.database import SessionLocal, engine
 from app.models.car import Car
+from app.core.catalog import bump_catalog_version
 import random
 from datetime import datetime
 
@@ -59,6 +60,7 @@ def update_cars_to_used():
             
             print(f"Updated {car.year} {car.make} {car.model}: {car.mileage:,} miles, {car.condition}, engine: {car.engine_condition}")
         
+        bump_catalog_version(db)
         db.commit()
         print(f"\nSuccessfully updated {len(cars)} cars to used with realistic mileage")
         
@@ -561,7 +561,7 @@ async function loadSimilarCars(carId) {
     }
     
     try {
-        const url = `${API_BASE_URL}/api/v1/ai/cars/${carId}/similar?n_results=3`;
+        const url = `${API_BASE_URL}/api/v1/ai/cars/${carId}/similar?n_results=3&expand=cars`;
         const response = await fetch(url);
         
         if (!response.ok) {
@@ -580,11 +580,8 @@ async function loadSimilarCars(carId) {
             return;
         }
         
-        // Fetch full car details for similar cars
-        const carPromises = similarCars.map(sc => 
-            fetch(`${API_BASE_URL}/api/v1/cars/${sc.car_id}`).then(r => r.json())
-        );
-        const cars = await Promise.all(carPromises);
+        // Car details come with the results (expand=cars)
+        const cars = similarCars.map(sc => sc.car);
         
         // Build HTML
         let html = `
@@ -654,7 +651,7 @@ async function loadCarRecommendations(carId) {
         // First, try to get similar cars using the AI endpoint (non-blocking)
         let similarCars = [];
         try {
-            const similarUrl = `${API_BASE_URL}/api/v1/ai/cars/${carId}/similar?n_results=3`;
+            const similarUrl = `${API_BASE_URL}/api/v1/ai/cars/${carId}/similar?n_results=3&expand=cars`;
             console.log('[DEBUG] loadCarRecommendations: Fetching similar cars from', similarUrl);
             const similarResponse = await fetch(similarUrl);
             
@@ -672,27 +669,10 @@ async function loadCarRecommendations(carId) {
         // If we have similar cars, try to display them
         if (similarCars.length > 0) {
             try {
-                // Filter out invalid car IDs before fetching
-                const validSimilarCars = similarCars.filter(sc => sc.car_id && sc.car_id > 0 && sc.car_id !== carId);
-                console.log('[DEBUG] loadCarRecommendations: Filtered to', validSimilarCars.length, 'valid similar cars (excluding current car and invalid IDs)');
-                
-                // Fetch full car details for similar cars
-                const carPromises = validSimilarCars.map(sc => 
-                    fetch(`${API_BASE_URL}/api/v1/cars/${sc.car_id}`).then(r => {
-                        if (!r.ok) {
-                            if (r.status === 404) {
-                                console.warn(`[DEBUG] loadCarRecommendations: Car ${sc.car_id} not found (404) - skipping`);
-                            }
-                            return null; // Return null instead of throwing
-                        }
-                        return r.json();
-                    }).catch(err => {
-                        console.warn(`[DEBUG] loadCarRecommendations: Error fetching car ${sc.car_id}:`, err);
-                        return null;
-                    })
-                );
-                const cars = (await Promise.all(carPromises)).filter(car => car !== null); // Filter out nulls
-                console.log('[DEBUG] loadCarRecommendations: Fetched', cars.length, 'car details');
+                // Car details come with the results (expand=cars); skip the current car and any without details
+                const validSimilarCars = similarCars.filter(sc => sc.car && sc.car_id !== carId);
+                console.log('[DEBUG] loadCarRecommendations: Filtered to', validSimilarCars.length, 'valid similar cars (excluding current car and missing details)');
+                const cars = validSimilarCars.map(sc => sc.car);
                 
                 // Display as recommendations - ensure exactly 3 cars
                 if (cars.length >= 3 && typeof displayRecommendations === 'function') {
@@ -301,7 +301,8 @@ async function loadCars(page = 1) {
         // Build query parameters
         const params = new URLSearchParams({
             page: page.toString(),
-            page_size: '12'
+            page_size: '12',
+            view: 'card'  // Only the fields a card shows
         });
         
         // Add filters
@@ -360,7 +361,7 @@ async function loadCars(page = 1) {
                 id: data.cars[0].id,
                 make: data.cars[0].make,
                 model: data.cars[0].model,
-                image_urls: data.cars[0].image_urls
+                image_url: data.cars[0].image_url
             });
         }
         
@@ -381,6 +382,9 @@ async function loadCars(page = 1) {
                 carsGrid.appendChild(createCarCard(car));
             });
             console.log('[DEBUG] loadCars: All car cards created');
+            
+            // Review summaries for the whole page in one request
+            loadReviewSummaries(data.cars.map(car => car.id));
         }
         
         // Display pagination
@@ -424,9 +428,10 @@ function createCarCard(car) {
     
     // Handle image URL - encode spaces if it's a local path
     // Use first available local image as default instead of Unsplash
-    let imageUrl = car.image_urls && car.image_urls.length > 0 
-        ? car.image_urls[0] 
-        : 'images/2023-Toyota-Camry.webp';  // Default local image
+    // (card view sends only the first image as image_url, full cars the image_urls list)
+    let imageUrl = car.image_url 
+        || (car.image_urls && car.image_urls.length > 0 ? car.image_urls[0] : null)
+        || 'images/2023-Toyota-Camry.webp';  // Default local image
     
     // Encode spaces in local image paths
     if (imageUrl.startsWith('images/')) {
@@ -435,7 +440,7 @@ function createCarCard(car) {
     
     console.log('[DEBUG] createCarCard: Image URL for car', car.id, ':', imageUrl);
     
-    const score = car.scores ? car.scores.overall_score : null;
+    const score = car.overall_score !== undefined ? car.overall_score : (car.scores ? car.scores.overall_score : null);
     const scoreDisplay = score ? `<div class="car-score">⭐ ${score.toFixed(1)}</div>` : '';
     
     card.innerHTML = `
@@ -503,8 +508,7 @@ function createCarCard(car) {
     buttonsContainer.appendChild(compareBtn);
     carInfo.appendChild(buttonsContainer);
     
-    // Load review summary
-    loadReviewSummary(car.id);
+    // Review summary is filled in by loadReviewSummaries once the page's cards exist
     
     return card;
 }
@@ -610,42 +614,51 @@ function clearFilters() {
 window.clearFilters = clearFilters;
 
 /**
- * Load review summary for a car (for listings page)
+ * Render a car's review summary into its card
+ */
+function renderReviewSummary(carId, total, avgRating) {
+    const reviewSummaryEl = document.getElementById(`reviewSummary-${carId}`);
+    if (!reviewSummaryEl) {
+        return;
+    }
+    
+    if (total === null) {
+        reviewSummaryEl.innerHTML = '<span>💬 No reviews</span>';
+    } else if (total === 0) {
+        reviewSummaryEl.innerHTML = '<span>💬 No reviews yet</span>';
+    } else if (avgRating !== null && avgRating !== undefined) {
+        const stars = '⭐'.repeat(Math.round(avgRating));
+        reviewSummaryEl.innerHTML = `<span>💬 ${total} review${total !== 1 ? 's' : ''} • ${stars} ${avgRating.toFixed(1)}/5</span>`;
+    } else {
+        reviewSummaryEl.innerHTML = `<span>💬 ${total} review${total !== 1 ? 's' : ''}</span>`;
+    }
+}
+
+/**
+ * Load review summaries for all cars on the listings page with one request
  */
-async function loadReviewSummary(carId) {
+async function loadReviewSummaries(carIds) {
+    if (!carIds.length) {
+        return;
+    }
+    
     try {
-        const url = `${API_BASE_URL}/api/v1/reviews/car/${carId}`;
+        const params = new URLSearchParams();
+        carIds.forEach(carId => params.append('car_ids', carId));
+        const url = `${API_BASE_URL}/api/v1/reviews/stats?${params}`;
         const response = await fetch(url);
         
         if (response.ok) {
             const data = await response.json();
-            const reviewSummaryEl = document.getElementById(`reviewSummary-${carId}`);
-            
-            if (reviewSummaryEl) {
-                const total = data.total || 0;
-                const avgRating = data.average_rating;
-                
-                if (total === 0) {
-                    reviewSummaryEl.innerHTML = '<span>💬 No reviews yet</span>';
-                } else if (avgRating !== null && avgRating !== undefined) {
-                    const stars = '⭐'.repeat(Math.round(avgRating));
-                    reviewSummaryEl.innerHTML = `<span>💬 ${total} review${total !== 1 ? 's' : ''} • ${stars} ${avgRating.toFixed(1)}/5</span>`;
-                } else {
-                    reviewSummaryEl.innerHTML = `<span>💬 ${total} review${total !== 1 ? 's' : ''}</span>`;
-                }
-            }
+            data.stats.forEach(stats => {
+                renderReviewSummary(stats.car_id, stats.review_count || 0, stats.average_rating);
+            });
         } else {
-            const reviewSummaryEl = document.getElementById(`reviewSummary-${carId}`);
-            if (reviewSummaryEl) {
-                reviewSummaryEl.innerHTML = '<span>💬 No reviews</span>';
-            }
+            carIds.forEach(carId => renderReviewSummary(carId, null));
         }
     } catch (error) {
-        console.error('[DEBUG] loadReviewSummary: Error loading reviews for car', carId, error);
-        const reviewSummaryEl = document.getElementById(`reviewSummary-${carId}`);
-        if (reviewSummaryEl) {
-            reviewSummaryEl.innerHTML = '<span>💬 No reviews</span>';
-        }
+        console.error('[DEBUG] loadReviewSummaries: Error loading review stats for cars', carIds, error);
+        carIds.forEach(carId => renderReviewSummary(carId, null));
     }
 }
 